@@ -0,0 +1,45 @@
+"""
+조건부 GET 응답 - ETag/If-None-Match로 바뀌지 않은 데이터는 304로 응답
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+
+def compute_etag(payload: Dict[str, Any]) -> str:
+    """응답 본문의 약한 ETag (매 응답마다 바뀌는 timestamp는 제외)"""
+    content = {key: value for key, value in payload.items() if key != "timestamp"}
+    encoded = json.dumps(content, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return f'W/"{hashlib.blake2b(encoded, digest_size=12).hexdigest()}"'
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # 약한 비교: W/ 접두사는 무시
+    target = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == target:
+            return True
+    return False
+
+
+def conditional_json(request: Request, payload: Dict[str, Any]) -> Response:
+    """클라이언트가 같은 ETag를 갖고 있으면 304, 아니면 ETag를 붙인 JSON 응답"""
+    payload = jsonable_encoder(payload)
+    etag = compute_etag(payload)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(payload, headers=headers)
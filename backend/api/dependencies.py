@@ -2,8 +2,12 @@
 API 의존성 주입
 """
 
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, status
 from config.database import memory_db
+from config.settings import settings
+from services.admission_control import AdmissionRejected, admission_controller
 from utils.logger import logger
 
 
@@ -25,4 +29,44 @@ async def validate_session(session_id: str, db = Depends(get_database)):
             status_code=status.HTTP_404_NOT_FOUND,
             detail="세션을 찾을 수 없습니다."
         )
-    return session 
\ No newline at end of file
+    return session 
+
+
+async def _admission_key(request: Request) -> Optional[str]:
+    """요청 빈도 제한 단위 (세션 ID)
+
+    세션이 없는 요청(새 사용자의 첫 업로드)은 None을 반환하여 빈도 제한 없이
+    동시 실행/대기열 제한만 받게 합니다. 모든 요청이 프론트엔드 서버 한 곳에서 오므로
+    클라이언트 주소로 묶으면 새 사용자 전체가 하나의 버킷을 나눠 쓰게 됩니다.
+    """
+    session_id = request.path_params.get("session_id")
+    if not session_id and request.headers.get("content-type", "").startswith("multipart/form-data"):
+        # 폼은 FastAPI가 이미 파싱해 두었으므로 다시 읽지 않음
+        session_id = (await request.form()).get("session_id")
+    return str(session_id) if session_id else None
+
+
+def admission_control(endpoint: str):
+    """비싼 엔드포인트의 수용 제어 의존성 (429/503 + Retry-After)"""
+    
+    async def dependency(request: Request):
+        if not settings.admission_enabled:
+            yield
+            return
+        
+        try:
+            started = await admission_controller.admit(endpoint, await _admission_key(request))
+        except AdmissionRejected as e:
+            logger.warning(f"요청 거절 ({endpoint}): {e.status_code} {e.detail}")
+            raise HTTPException(
+                status_code=e.status_code,
+                detail=e.detail,
+                headers={"Retry-After": str(e.retry_after)}
+            )
+        
+        try:
+            yield
+        finally:
+            admission_controller.release(endpoint, started)
+    
+    return dependency
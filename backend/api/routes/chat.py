@@ -2,11 +2,13 @@
 채팅 API
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from datetime import datetime
+from typing import Optional
 
-from api.dependencies import get_database, get_logger
-from config.database import MemoryDatabase
+from api.conditional import conditional_json
+from api.dependencies import admission_control, get_database, get_logger
+from config.database import SessionStore
 from services.chat_service import get_chat_service
 from models.request_models import ChatRequest
 
@@ -14,11 +16,11 @@ from models.request_models import ChatRequest
 router = APIRouter(prefix="/chat", tags=["chat"])
 
 
-@router.post("/{session_id}")
+@router.post("/{session_id}", dependencies=[Depends(admission_control("chat"))])
 async def send_message(
     session_id: str,
     request: ChatRequest,
-    db: MemoryDatabase = Depends(get_database),
+    db: SessionStore = Depends(get_database),
     logger = Depends(get_logger)
 ):
     """채팅 메시지 전송"""
@@ -52,7 +54,7 @@ async def send_message(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=result["error"]
             )
-        
+    
     except HTTPException:
         raise
     except Exception as e:
@@ -66,13 +68,18 @@ async def send_message(
 @router.get("/{session_id}/history")
 async def get_chat_history(
     session_id: str,
-    limit: int = 50,
-    db: MemoryDatabase = Depends(get_database),
+    request: Request,
+    limit: int = Query(50, ge=1, le=500),
+    after: Optional[int] = Query(None, ge=0, description="이 메시지 ID 이후의 메시지만 조회"),
+    since: Optional[int] = Query(None, ge=0, description="after와 같음 (증분 동기화용, 이전 응답의 next_after)"),
+    db: SessionStore = Depends(get_database),
     logger = Depends(get_logger)
 ):
-    """채팅 히스토리 조회"""
+    """채팅 히스토리 조회 (after/since 커서로 페이지 단위 조회, ETag 지원)"""
     
-    logger.info(f"채팅 히스토리 조회: session_id={session_id}, limit={limit}")
+    if after is None:
+        after = since
+    logger.info(f"채팅 히스토리 조회: session_id={session_id}, limit={limit}, after={after}")
     
     # 세션 유효성 검사
     session = db.get_session(session_id)
@@ -84,10 +91,10 @@ async def get_chat_history(
     
     try:
         chat_service = get_chat_service()
-        result = chat_service.get_chat_history(session_id, limit)
-        
-        return result
+        result = chat_service.get_chat_history(session_id, limit, after)
         
+        return conditional_json(request, result)
+    
     except Exception as e:
         logger.error(f"채팅 히스토리 조회 실패: {str(e)}")
         raise HTTPException(
@@ -99,7 +106,7 @@ async def get_chat_history(
 @router.delete("/{session_id}/history")
 async def clear_chat_history(
     session_id: str,
-    db: MemoryDatabase = Depends(get_database),
+    db: SessionStore = Depends(get_database),
     logger = Depends(get_logger)
 ):
     """채팅 히스토리 초기화"""
@@ -119,7 +126,7 @@ async def clear_chat_history(
         result = chat_service.clear_chat_history(session_id)
         
         return result
-        
+    
     except Exception as e:
         logger.error(f"채팅 히스토리 초기화 실패: {str(e)}")
         raise HTTPException(
@@ -131,7 +138,7 @@ async def clear_chat_history(
 @router.get("/{session_id}/suggestions")
 async def get_suggested_questions(
     session_id: str,
-    db: MemoryDatabase = Depends(get_database),
+    db: SessionStore = Depends(get_database),
     logger = Depends(get_logger)
 ):
     """추천 질문 조회"""
@@ -151,7 +158,7 @@ async def get_suggested_questions(
         result = chat_service.get_suggested_questions(session_id)
         
         return result
-        
+    
     except Exception as e:
         logger.error(f"추천 질문 조회 실패: {str(e)}")
         raise HTTPException(
@@ -163,7 +170,7 @@ async def get_suggested_questions(
 @router.get("/{session_id}/statistics")
 async def get_chat_statistics(
     session_id: str,
-    db: MemoryDatabase = Depends(get_database),
+    db: SessionStore = Depends(get_database),
     logger = Depends(get_logger)
 ):
     """채팅 통계 조회"""
@@ -183,7 +190,7 @@ async def get_chat_statistics(
         result = chat_service.get_chat_statistics(session_id)
         
         return result
-        
+    
     except Exception as e:
         logger.error(f"채팅 통계 조회 실패: {str(e)}")
         raise HTTPException(
@@ -195,7 +202,7 @@ async def get_chat_statistics(
 @router.get("/{session_id}/status")
 async def get_chat_status(
     session_id: str,
-    db: MemoryDatabase = Depends(get_database),
+    db: SessionStore = Depends(get_database),
     logger = Depends(get_logger)
 ):
     """채팅 상태 확인"""
@@ -208,32 +215,8 @@ async def get_chat_status(
             detail="세션을 찾을 수 없습니다."
         )
     
-    # 상태 정보 구성
-    has_product_info = session.get("product_info") is not None
-    chat_history = session.get("chat_history", [])
-    total_messages = len(chat_history)
-    last_chat_at = session.get("last_chat_at", "")
-    
-    if has_product_info:
-        if total_messages > 0:
-            status = "active"
-            message = "채팅이 활성 상태입니다."
-        else:
-            status = "ready"
-            message = "채팅을 시작할 수 있습니다."
-    else:
-        status = "waiting"
-        message = "제품 분석을 먼저 완료해 주세요."
-    
     return {
         "success": True,
-        "data": {
-            "status": status,
-            "message": message,
-            "has_product_info": has_product_info,
-            "total_messages": total_messages,
-            "last_chat_at": last_chat_at,
-            "session_id": session_id
-        },
+        "data": get_chat_service().build_chat_status(session_id, session),
         "timestamp": datetime.now().isoformat()
     } 
\ No newline at end of file
@@ -2,14 +2,18 @@
 설정 관련 API 라우터
 """
 
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 from api.dependencies import get_database, get_logger
 from config.api_keys import api_keys
 from services.simple_product_search_service import simple_product_search_service
+from services.product_catalog_service import product_catalog
+from utils.circuit_breaker import get_all_circuit_breakers
 
 router = APIRouter(prefix="/config", tags=["설정"])
 
@@ -22,6 +26,15 @@ class APIKeyRequest(BaseModel):
     google_cx: Optional[str] = None
 
 
+class CatalogEntryRequest(BaseModel):
+    """카탈로그 항목 요청 모델"""
+    brand: str
+    category: str = ""
+    model: str
+    title: str = ""
+    aliases: List[str] = []
+
+
 class APIKeyResponse(BaseModel):
     """API 키 설정 응답 모델"""
     success: bool
@@ -133,11 +146,14 @@ async def test_naver_api(
             async with session.get(url, headers=headers, params=params) as response:
                 if response.status == 200:
                     data = await response.json()
+                    # 키가 정상 작동하면 차단된 서킷을 바로 닫음
+                    simple_product_search_service.naver_breaker.reset()
                     return {
                         "success": True,
                         "message": "네이버 API 키가 정상적으로 작동합니다.",
                         "status_code": response.status,
-                        "test_results": len(data.get("items", []))
+                        "test_results": len(data.get("items", [])),
+                        "circuit_breaker": simple_product_search_service.naver_breaker.snapshot()
                     }
                 else:
                     error_content = await response.text()
@@ -145,7 +161,8 @@ async def test_naver_api(
                         "success": False,
                         "error": f"네이버 API 테스트 실패: {response.status}",
                         "error_details": error_content,
-                        "status_code": response.status
+                        "status_code": response.status,
+                        "circuit_breaker": simple_product_search_service.naver_breaker.snapshot()
                     }
                     
     except Exception as e:
@@ -153,4 +170,87 @@ async def test_naver_api(
         return {
             "success": False,
             "error": f"테스트 중 오류 발생: {str(e)}"
-        } 
\ No newline at end of file
+        }
+
+
+@router.get("/circuit-breakers", response_model=Dict[str, Any])
+async def get_circuit_breakers(
+    logger = Depends(get_logger)
+):
+    """외부 API 서킷 브레이커 상태 조회"""
+    
+    breakers = get_all_circuit_breakers()
+    
+    return {
+        "success": True,
+        "data": {
+            "breakers": {name: breaker.snapshot() for name, breaker in breakers.items()}
+        },
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@router.post("/circuit-breakers/{name}/reset", response_model=Dict[str, Any])
+async def reset_circuit_breaker(
+    name: str,
+    logger = Depends(get_logger)
+):
+    """외부 API 서킷 브레이커 초기화"""
+    
+    breaker = get_all_circuit_breakers().get(name)
+    if breaker is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"서킷 브레이커를 찾을 수 없습니다: {name}"
+        )
+    
+    breaker.reset()
+    logger.info(f"서킷 브레이커 초기화: {name}")
+    
+    return {
+        "success": True,
+        "data": breaker.snapshot(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@router.get("/catalog", response_model=Dict[str, Any])
+async def get_catalog_stats(
+    model: Optional[str] = None,
+    logger = Depends(get_logger)
+):
+    """로컬 제품 카탈로그 통계 조회 (model 지정 시 접두사 검색)"""
+    
+    data: Dict[str, Any] = {"stats": product_catalog.get_stats()}
+    if model:
+        data["matches"] = [product_catalog.to_dict(entry) for entry in product_catalog.prefix_lookup(model)]
+    
+    return {
+        "success": True,
+        "data": data,
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@router.post("/catalog/import", response_model=Dict[str, Any])
+async def import_catalog_entries(
+    entries: List[CatalogEntryRequest],
+    logger = Depends(get_logger)
+):
+    """로컬 제품 카탈로그 일괄 가져오기"""
+    
+    # 대량 가져오기가 이벤트 루프를 막지 않도록 스레드에서 실행
+    imported = await asyncio.to_thread(
+        product_catalog.import_entries, [entry.model_dump() for entry in entries]
+    )
+    logger.info(f"카탈로그 가져오기: {imported}/{len(entries)}개 항목")
+    
+    return {
+        "success": True,
+        "data": {
+            "imported": imported,
+            "skipped": len(entries) - imported,
+            "stats": product_catalog.get_stats()
+        },
+        "timestamp": datetime.now().isoformat()
+    }
@@ -4,8 +4,14 @@
 
 from fastapi import APIRouter, Depends
 from datetime import datetime
+import os
 from api.dependencies import get_database, get_logger
-from config.database import MemoryDatabase
+from config.database import SessionStore
+from config.settings import settings
+from services.session_sweeper import session_sweeper
+from services.job_queue import job_queue
+from services.admission_control import admission_controller
+from utils.process_memory import read_memory_usage
 
 
 router = APIRouter(prefix="/health", tags=["health"])
@@ -13,7 +19,7 @@ router = APIRouter(prefix="/health", tags=["health"])
 
 @router.get("/")
 async def health_check(
-    db: MemoryDatabase = Depends(get_database),
+    db: SessionStore = Depends(get_database),
     logger = Depends(get_logger)
 ):
     """시스템 상태 확인"""
@@ -28,7 +34,16 @@ async def health_check(
             "timestamp": datetime.now().isoformat(),
             "services": {
                 "memory_db": "running",
-                "session_count": db.get_session_count()
+                "session_store": settings.session_store,
+                "session_count": db.get_session_count(),
+                "session_memory": db.get_memory_stats(),
+                "session_sweeper": session_sweeper.get_stats(),
+                "job_queue": job_queue.get_metrics(),
+                "admission": admission_controller.get_metrics()
+            },
+            "process": {
+                "pid": os.getpid(),
+                "memory": read_memory_usage()
             }
         },
         "timestamp": datetime.now().isoformat()
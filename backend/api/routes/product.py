@@ -2,23 +2,46 @@
 제품 인식 API
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Request, status
+from fastapi.responses import StreamingResponse
 from datetime import datetime
+from typing import Optional
+import json
 
-from api.dependencies import get_database, get_logger, validate_session
-from config.database import MemoryDatabase
+from api.conditional import conditional_json
+from api.dependencies import admission_control, get_database, get_logger, validate_session
+from config.database import SessionStore
+from config.settings import settings
 from services.product_service import get_product_service
+from services.job_queue import job_queue, JobQueueFullError, JobState
+from services.analysis_events import analysis_events
 from models.request_models import ProductAnalysisResponse
 
 
 router = APIRouter(prefix="/product", tags=["product"])
 
 
-@router.post("/analyze/{session_id}")
+async def _submit_analysis_job(kind: str, session_id: str, logger):
+    """분석 작업 추가 (대기열이 가득 차면 503)"""
+    try:
+        job, created = await job_queue.submit(kind, session_id)
+    except JobQueueFullError:
+        logger.warning(f"분석 작업 대기열 가득 참: session_id={session_id}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="분석 요청이 많아 잠시 후 다시 시도해 주세요.",
+            headers={"Retry-After": "10"}
+        )
+    
+    if created:
+        analysis_events.publish(session_id, "queued", "분석 대기 중입니다.", job_id=job.job_id)
+    return job, created
+
+
+@router.post("/analyze/{session_id}", dependencies=[Depends(admission_control("analyze"))])
 async def analyze_product(
     session_id: str,
-    background_tasks: BackgroundTasks,
-    db: MemoryDatabase = Depends(get_database),
+    db: SessionStore = Depends(get_database),
     logger = Depends(get_logger)
 ):
     """제품 이미지 분석"""
@@ -41,15 +64,8 @@ async def analyze_product(
         )
     
     try:
-        # 제품 인식 서비스 호출
-        product_service = get_product_service()
-        
-        # 백그라운드에서 분석 수행 (비동기)
-        async def analyze_in_background():
-            result = await product_service.analyze_product(session_id)
-            logger.info(f"백그라운드 분석 완료: {result.get('success', False)}")
-        
-        background_tasks.add_task(analyze_in_background)
+        # 작업 큐에 분석 작업 추가 (같은 세션의 분석이 진행 중이면 그 작업을 반환)
+        job, created = await _submit_analysis_job("analyze", session_id, logger)
         
         # 즉시 응답 반환 (분석 진행 중 상태)
         return {
@@ -57,12 +73,17 @@ async def analyze_product(
             "data": {
                 "status": "analyzing",
                 "session_id": session_id,
+                "job_id": job.job_id,
+                "job_state": job.state,
+                "deduplicated": not created,
                 "message": "제품 분석이 시작되었습니다. 잠시 후 결과를 확인해 주세요.",
                 "estimated_time": "30-60초"
             },
             "timestamp": datetime.now().isoformat()
         }
-        
+    
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"제품 분석 요청 처리 실패: {str(e)}")
         raise HTTPException(
@@ -71,15 +92,36 @@ async def analyze_product(
         )
 
 
+def _analysis_active(job) -> bool:
+    return job is not None and job.state in (JobState.QUEUED.value, JobState.RUNNING.value)
+
+
+def _analysis_finished(session_id: str) -> bool:
+    """대기/실행 중인 분석 작업이 없는지
+
+    재분석 요청 직후에는 작업이 실행되기 전까지 이전 product_info가 세션에 남아 있으므로
+    product_info보다 작업 상태를 먼저 봅니다.
+    """
+    if get_database().get_session(session_id) is None:
+        return True
+    return not _analysis_active(job_queue.latest_for_session(session_id, group="analysis"))
+
+
 @router.get("/analyze/{session_id}/result")
 async def get_analysis_result(
     session_id: str,
-    db: MemoryDatabase = Depends(get_database),
+    request: Request,
+    wait: float = Query(0, ge=0, description="분석이 끝날 때까지 최대 대기할 시간(초)"),
+    db: SessionStore = Depends(get_database),
     logger = Depends(get_logger)
 ):
-    """제품 분석 결과 조회"""
+    """제품 분석 결과 조회
+    
+    wait를 주면 분석이 끝나거나 시간이 지날 때까지 응답을 보류합니다 (long-poll).
+    완료된 결과는 ETag를 붙여 보내고, If-None-Match가 같으면 304로 응답합니다.
+    """
     
-    logger.info(f"분석 결과 조회: session_id={session_id}")
+    logger.info(f"분석 결과 조회: session_id={session_id}, wait={wait}")
     
     # 세션 유효성 검사
     session = db.get_session(session_id)
@@ -91,13 +133,41 @@ async def get_analysis_result(
     
     try:
         product_service = get_product_service()
-        result = product_service.get_analysis_result(session_id)
         
-        if result["success"]:
-            return result
+        if wait > 0:
+            await analysis_events.wait_finished(
+                session_id,
+                timeout=min(wait, settings.result_long_poll_max_seconds),
+                is_done=lambda: _analysis_finished(session_id)
+            )
+        
+        job = job_queue.latest_for_session(session_id, group="analysis")
+        # 분석/재분석 작업이 끝나기 전에는 세션에 남은 이전 결과를 보내지 않음
+        result = None if _analysis_active(job) else product_service.get_analysis_result(session_id)
+        
+        if result is not None and result["success"]:
+            return conditional_json(request, result)
         else:
             # 분석이 아직 완료되지 않은 경우
-            if "분석된 제품 정보가 없습니다" in result.get("error", ""):
+            if result is None or "분석된 제품 정보가 없습니다" in result.get("error", ""):
+                if job is None:
+                    return {
+                        "success": True,
+                        "data": {
+                            "status": "not_started",
+                            "message": "제품 분석이 아직 요청되지 않았습니다."
+                        },
+                        "timestamp": datetime.now().isoformat()
+                    }
+                if job.state == JobState.FAILED.value:
+                    return {
+                        "success": True,
+                        "data": {
+                            "status": "failed",
+                            "message": job.error or "제품 분석에 실패했습니다."
+                        },
+                        "timestamp": datetime.now().isoformat()
+                    }
                 return {
                     "success": True,
                     "data": {
@@ -111,7 +181,7 @@ async def get_analysis_result(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=result["error"]
                 )
-        
+    
     except HTTPException:
         raise
     except Exception as e:
@@ -122,11 +192,89 @@ async def get_analysis_result(
         )
 
 
-@router.post("/analyze/{session_id}/retry")
+def _final_event_from_state(session_id: str) -> Optional[dict]:
+    """이벤트 기록이 없을 때(다른 워커에서 분석, 재시작 등) 세션/작업 상태로 완료 이벤트 생성"""
+    job = job_queue.latest_for_session(session_id, group="analysis")
+    if job is not None and job.state in (JobState.QUEUED.value, JobState.RUNNING.value):
+        return None
+    
+    session = get_database().get_session(session_id)
+    if session is None:
+        return analysis_events.make_event(session_id, "failed", "세션을 찾을 수 없습니다.")
+    
+    product_info = session.get("product_info")
+    if product_info is not None:
+        return analysis_events.make_event(
+            session_id, "completed", "제품 분석이 완료되었습니다.",
+            is_appliance=product_info.get("category") != "가전제품_아님"
+        )
+    if job is not None and job.state == JobState.FAILED.value:
+        return analysis_events.make_event(session_id, "failed", job.error or "제품 분석에 실패했습니다.")
+    return None
+
+
+def _format_sse(event: dict) -> str:
+    return f"id: {event['seq']}\nevent: {event['stage']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+@router.get("/analyze/{session_id}/events")
+async def stream_analysis_events(
+    session_id: str,
+    request: Request,
+    last_event_id: Optional[str] = Header(None),
+    db: SessionStore = Depends(get_database),
+    logger = Depends(get_logger)
+):
+    """제품 분석 진행 이벤트 스트림 (Server-Sent Events)
+    
+    단계(queued, decode, ocr, search, vision, guide)가 바뀔 때마다 이벤트를 보내고
+    completed/failed 이벤트를 보낸 뒤 연결을 닫습니다.
+    """
+    
+    # 세션 유효성 검사
+    session = db.get_session(session_id)
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="세션을 찾을 수 없습니다."
+        )
+    
+    after = int(last_event_id) if last_event_id and last_event_id.isdigit() else 0
+    logger.info(f"분석 이벤트 구독: session_id={session_id}, after={after}")
+    
+    async def event_stream():
+        # 이 프로세스에 진행 기록이 없으면 이미 끝난 분석인지 먼저 확인
+        if not analysis_events.get_events(session_id):
+            final_event = _final_event_from_state(session_id)
+            if final_event is not None:
+                yield _format_sse(final_event)
+                return
+        
+        async for event in analysis_events.subscribe(session_id, after=after):
+            if event is not None:
+                yield _format_sse(event)
+                continue
+            
+            # 이벤트 없이 시간이 지나면 연결 유지 신호를 보내고 완료 여부 확인
+            if await request.is_disconnected():
+                return
+            yield ": keepalive\n\n"
+            final_event = _final_event_from_state(session_id)
+            if final_event is not None:
+                yield _format_sse(final_event)
+                return
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/analyze/{session_id}/retry", dependencies=[Depends(admission_control("analyze"))])
 async def reanalyze_product(
     session_id: str,
-    background_tasks: BackgroundTasks,
-    db: MemoryDatabase = Depends(get_database),
+    db: SessionStore = Depends(get_database),
     logger = Depends(get_logger)
 ):
     """제품 재분석"""
@@ -142,26 +290,25 @@ async def reanalyze_product(
         )
     
     try:
-        product_service = get_product_service()
-        
-        # 백그라운드에서 재분석 수행
-        async def reanalyze_in_background():
-            result = await product_service.reanalyze_product(session_id)
-            logger.info(f"백그라운드 재분석 완료: {result.get('success', False)}")
-        
-        background_tasks.add_task(reanalyze_in_background)
+        # 진행 중인 분석이 있으면 새로 시작하지 않고 그 작업을 반환
+        job, created = await _submit_analysis_job("reanalyze", session_id, logger)
         
         return {
             "success": True,
             "data": {
                 "status": "reanalyzing",
                 "session_id": session_id,
+                "job_id": job.job_id,
+                "job_state": job.state,
+                "deduplicated": not created,
                 "message": "제품 재분석이 시작되었습니다.",
                 "estimated_time": "30-60초"
             },
             "timestamp": datetime.now().isoformat()
         }
-        
+    
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"제품 재분석 요청 처리 실패: {str(e)}")
         raise HTTPException(
@@ -183,7 +330,7 @@ async def get_supported_categories(
         result = product_service.get_supported_categories()
         
         return result
-        
+    
     except Exception as e:
         logger.error(f"제품 카테고리 조회 실패: {str(e)}")
         raise HTTPException(
@@ -195,7 +342,7 @@ async def get_supported_categories(
 @router.get("/status/{session_id}")
 async def get_product_status(
     session_id: str,
-    db: MemoryDatabase = Depends(get_database),
+    db: SessionStore = Depends(get_database),
     logger = Depends(get_logger)
 ):
     """제품 분석 상태 확인"""
@@ -217,16 +364,28 @@ async def get_product_status(
     product_info = session.get("product_info")
     is_non_appliance = product_info is not None and product_info.get("category") == "가전제품_아님"
     
-    if has_product_info:
+    # 세션의 최근 분석 작업 상태
+    job = job_queue.latest_for_session(session_id, group="analysis")
+    job_state = job.state if job is not None else None
+    
+    if job_state == JobState.QUEUED.value:
+        status = "queued"
+        message = "제품 분석을 기다리고 있습니다."
+    elif job_state == JobState.RUNNING.value:
+        status = "analyzing"
+        message = "제품 분석이 진행 중입니다."
+    elif has_product_info:
+        status = "completed"
         if is_non_appliance:
-            status = "completed"
             message = "가전제품이 아닌 이미지로 판별되었습니다."
         else:
-            status = "completed"
             message = "제품 분석이 완료되었습니다."
+    elif job_state == JobState.FAILED.value:
+        status = "failed"
+        message = job.error or "제품 분석에 실패했습니다."
     elif has_image:
-        status = "analyzing"
-        message = "제품 분석이 진행 중입니다."
+        status = "ready"
+        message = "분석할 이미지가 준비되었습니다."
     else:
         status = "waiting"
         message = "이미지 업로드를 기다리고 있습니다."
@@ -239,7 +398,29 @@ async def get_product_status(
             "has_image": has_image,
             "has_product_info": has_product_info,
             "has_usage_guide": has_usage_guide,
+            "job": job.to_dict() if job is not None else None,
             "session_id": session_id
         },
         "timestamp": datetime.now().isoformat()
+    }
+
+
+@router.get("/jobs/{job_id}")
+async def get_job_status(
+    job_id: str,
+    logger = Depends(get_logger)
+):
+    """분석 작업 상태 조회"""
+    
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="작업을 찾을 수 없습니다."
+        )
+    
+    return {
+        "success": True,
+        "data": job.to_dict(),
+        "timestamp": datetime.now().isoformat()
     } 
\ No newline at end of file
@@ -2,22 +2,30 @@
 세션 관리 API
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from datetime import datetime
+from typing import Optional
 import uuid
 
+from api.conditional import conditional_json
 from api.dependencies import get_database, get_logger, validate_session
-from config.database import MemoryDatabase
+from config.database import SessionStore
 from models.request_models import SessionCreateRequest
+from services.chat_history_store import chat_history_store
+from services.chat_service import get_chat_service
+from services.product_service import get_product_service
 
 
 router = APIRouter(prefix="/session", tags=["session"])
 
+# 세션 화면 조회에서 고를 수 있는 항목
+VIEW_SECTIONS = ("status", "product", "history", "suggestions")
+
 
 @router.post("/create")
 async def create_session(
     request: SessionCreateRequest = None,
-    db: MemoryDatabase = Depends(get_database),
+    db: SessionStore = Depends(get_database),
     logger = Depends(get_logger)
 ):
     """새 세션 생성"""
@@ -38,7 +46,7 @@ async def create_session(
             },
             "timestamp": datetime.now().isoformat()
         }
-        
+    
     except Exception as e:
         logger.error(f"세션 생성 실패: {str(e)}")
         raise HTTPException(
@@ -50,7 +58,8 @@ async def create_session(
 @router.get("/{session_id}")
 async def get_session(
     session_id: str,
-    db: MemoryDatabase = Depends(get_database),
+    request: Request,
+    db: SessionStore = Depends(get_database),
     logger = Depends(get_logger)
 ):
     """세션 정보 조회"""
@@ -63,7 +72,7 @@ async def get_session(
         )
     
     # 민감한 정보 제외하고 반환
-    return {
+    return conditional_json(request, {
         "success": True,
         "data": {
             "session_id": session["session_id"],
@@ -71,16 +80,76 @@ async def get_session(
             "expires_at": session["expires_at"].isoformat(),
             "has_product_info": session["product_info"] is not None,
             "has_uploaded_image": "uploaded_image" in session,
-            "chat_message_count": len(session["chat_history"])
+            "chat_message_count": chat_history_store.count(session_id)
         },
         "timestamp": datetime.now().isoformat()
-    }
+    })
+
+
+@router.get("/{session_id}/view")
+async def get_session_view(
+    session_id: str,
+    request: Request,
+    include: str = Query(",".join(VIEW_SECTIONS), description="쉼표로 구분한 항목: status, product, history, suggestions"),
+    history_limit: int = Query(50, ge=1, le=500),
+    since: Optional[int] = Query(None, ge=0, description="이 메시지 ID 이후의 채팅만 포함"),
+    db: SessionStore = Depends(get_database),
+    logger = Depends(get_logger)
+):
+    """화면 하나에 필요한 세션 데이터를 한 번에 조회 (세션 조회 1회, ETag 지원)"""
+    
+    sections = [section.strip() for section in include.split(",") if section.strip()]
+    unknown = [section for section in sections if section not in VIEW_SECTIONS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"지원하지 않는 항목입니다: {', '.join(unknown)}"
+        )
+    
+    session = db.get_session(session_id)
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="세션을 찾을 수 없습니다."
+        )
+    
+    try:
+        chat_service = get_chat_service()
+        view = {"session_id": session_id}
+        
+        if "status" in sections:
+            view["status"] = chat_service.build_chat_status(session_id, session)
+        if "product" in sections:
+            view["product"] = get_product_service().build_analysis_data(session)
+        if "history" in sections:
+            view["history"] = chat_service.build_history_page(session_id, history_limit, since)
+        if "suggestions" in sections:
+            product_info = session.get("product_info") or {}
+            suggestions = chat_service.suggest_questions(product_info)
+            view["suggestions"] = {
+                "suggestions": suggestions,
+                "product_category": product_info.get("category", "가전제품"),
+                "total_count": len(suggestions)
+            }
+        
+        return conditional_json(request, {
+            "success": True,
+            "data": view,
+            "timestamp": datetime.now().isoformat()
+        })
+    
+    except Exception as e:
+        logger.error(f"세션 화면 조회 실패: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="세션 정보 조회 중 오류가 발생했습니다."
+        )
 
 
 @router.delete("/{session_id}")
 async def delete_session(
     session_id: str,
-    db: MemoryDatabase = Depends(get_database),
+    db: SessionStore = Depends(get_database),
     logger = Depends(get_logger)
 ):
     """세션 삭제"""
@@ -100,8 +169,9 @@ async def delete_session(
         for file_path in temp_files:
             cleanup_temp_file(file_path)
         
-        # 세션 삭제
+        # 세션 및 채팅 히스토리 삭제
         db.delete_session(session_id)
+        chat_history_store.drop(session_id)
         
         logger.info(f"세션 삭제 완료: {session_id}")
         
@@ -112,7 +182,7 @@ async def delete_session(
             },
             "timestamp": datetime.now().isoformat()
         }
-        
+    
     except Exception as e:
         logger.error(f"세션 삭제 실패: {str(e)}")
         raise HTTPException(
@@ -123,13 +193,15 @@ async def delete_session(
 
 @router.post("/cleanup")
 async def cleanup_expired_sessions(
-    db: MemoryDatabase = Depends(get_database),
+    db: SessionStore = Depends(get_database),
     logger = Depends(get_logger)
 ):
-    """만료된 세션 정리"""
+    """만료된 세션 정리 (임시 파일 포함)"""
     
     try:
-        cleaned_count = db.cleanup_expired_sessions()
+        from services.session_sweeper import session_sweeper
+        reclaimed = await session_sweeper.sweep_once()
+        cleaned_count = reclaimed["sessions"]
         
         logger.info(f"만료된 세션 정리 완료: {cleaned_count}개")
         
@@ -137,11 +209,13 @@ async def cleanup_expired_sessions(
             "success": True,
             "data": {
                 "cleaned_sessions": cleaned_count,
+                "reclaimed_files": reclaimed["files"],
+                "reclaimed_bytes": reclaimed["bytes"],
                 "message": f"{cleaned_count}개의 만료된 세션이 정리되었습니다."
             },
             "timestamp": datetime.now().isoformat()
         }
-        
+    
     except Exception as e:
         logger.error(f"세션 정리 실패: {str(e)}")
         raise HTTPException(
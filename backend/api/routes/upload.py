@@ -2,31 +2,39 @@
 이미지 업로드 API
 """
 
+import asyncio
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status, Form
 from datetime import datetime
 import uuid
 from typing import Optional
 
-from api.dependencies import get_database, get_logger
-from config.database import MemoryDatabase
+from api.dependencies import admission_control, get_database, get_logger
+from config.database import SessionStore
 from utils.file_utils import (
     validate_image_file, save_uploaded_file, 
     validate_and_process_image, cleanup_temp_file
 )
+from services.job_queue import JobQueueFullError, job_queue
 from services.product_recognition_service import product_recognition_service
+from config.settings import settings
+from utils.image_hash import compute_dhash, near_duplicate_index, format_hash
 
 
 router = APIRouter(prefix="/upload", tags=["upload"])
 
 
-@router.post("/image")
+@router.post("/image", dependencies=[Depends(admission_control("upload"))])
 async def upload_image(
     file: UploadFile = File(...),
     session_id: Optional[str] = Form(None),
-    db: MemoryDatabase = Depends(get_database),
+    db: SessionStore = Depends(get_database),
     logger = Depends(get_logger)
 ):
-    """이미지 파일 업로드"""
+    """이미지 파일 업로드
+    
+    파일을 저장하고 검증하면 바로 응답하며, 제품 인식은 작업 큐에서 이어서 실행합니다.
+    인식 결과는 /upload/status/{session_id}로 확인합니다.
+    """
     
     logger.info(f"이미지 업로드 요청: {file.filename}")
     
@@ -57,7 +65,7 @@ async def upload_image(
         file_path, filename = await save_uploaded_file(file, session_id)
         
         # 이미지 검증 및 정보 추출
-        is_valid_image, image_info = validate_and_process_image(file_path)
+        is_valid_image, image_info = await asyncio.to_thread(validate_and_process_image, file_path)
         if not is_valid_image:
             cleanup_temp_file(file_path)
             raise HTTPException(
@@ -65,28 +73,47 @@ async def upload_image(
                 detail="유효하지 않은 이미지 파일입니다."
             )
         
-        # 제품 인식 수행
-        logger.info("제품 인식 시작...")
-        recognition_result = await product_recognition_service.classify_product_category(file_path)
+        # 지각 해시로 최근에 분석한 사진의 재촬영인지 확인
+        image_hash = None
+        duplicate = None
+        if settings.image_dedup_enabled:
+            try:
+                image_hash = await asyncio.to_thread(compute_dhash, file_path)
+                duplicate = near_duplicate_index.find(image_hash)
+            except Exception as e:
+                logger.warning(f"이미지 해시 계산 실패: {e}")
+        
+        if duplicate is not None and duplicate[0].get("recognition") is not None:
+            # 재촬영 사진이면 이전 인식 결과 재사용
+            entry, distance = duplicate
+            logger.info(f"재촬영 이미지 검출 (해밍 거리 {distance}), 이전 인식 결과 재사용")
+            recognition_result = {
+                **entry["recognition"],
+                "reused_from_duplicate": True,
+                "duplicate_distance": distance
+            }
+        else:
+            # 제품 인식은 응답 후 작업 큐에서 실행
+            recognition_result = None
         
         # 세션에 파일 정보 및 인식 결과 저장
         session_update_data = {
-            "temp_files": [file_path],
+            # 이전 업로드 파일도 세션 만료 시 함께 정리되도록 추가
+            "temp_files": [*(session_data.get("temp_files") or []), file_path],
             "uploaded_image": {
                 "filename": filename,
                 "original_name": file.filename,
                 "file_path": file_path,
                 "image_info": image_info,
+                "image_hash": format_hash(image_hash) if image_hash is not None else None,
                 "uploaded_at": datetime.now().isoformat()
             },
-            "product_recognition": recognition_result
+            "product_recognition": recognition_result,
+            "recognized_image": file_path if recognition_result is not None else None
         }
         
         db.update_session(session_id, session_update_data)
         
-        logger.info(f"이미지 업로드 및 제품 인식 완료: {filename}")
-        logger.info(f"인식 결과: {recognition_result}")
-        
         # 응답 데이터 구성
         response_data = {
             "session_id": session_id,
@@ -95,13 +122,20 @@ async def upload_image(
             "product_recognition": recognition_result
         }
         
-        # 인식 성공 여부에 따른 메시지 설정
-        if recognition_result.get("success", False):
-            response_data["message"] = f"이미지 업로드 및 제품 인식 완료: {recognition_result['brand']} {recognition_result['category']}"
-        elif recognition_result.get("category") == "가전제품_아님":
-            response_data["message"] = recognition_result.get('message', '가전제품이 아닙니다.')
+        if recognition_result is not None:
+            response_data["recognition"] = {"status": "done", "job_id": None}
+            response_data["message"] = "이미지 업로드 완료. 이전에 인식한 제품입니다."
         else:
-            response_data["message"] = f"이미지 업로드 완료. {recognition_result.get('message', '제품 인식에 실패했습니다.')}"
+            try:
+                job, _ = await job_queue.submit("recognize", session_id)
+                response_data["recognition"] = {"status": job.state, "job_id": job.job_id}
+            except JobQueueFullError:
+                # 대기열이 가득 차면 분석을 시작할 때 인식
+                logger.warning(f"작업 대기열이 가득 차 제품 인식을 분석 시작 시로 미룸: session_id={session_id}")
+                response_data["recognition"] = {"status": "pending", "job_id": None}
+            response_data["message"] = "이미지 업로드 완료. 제품을 인식하고 있습니다."
+        
+        logger.info(f"이미지 업로드 완료: {filename} (인식 {response_data['recognition']['status']})")
         
         return {
             "success": True,
@@ -123,7 +157,7 @@ async def upload_image(
 @router.get("/status/{session_id}")
 async def get_upload_status(
     session_id: str,
-    db: MemoryDatabase = Depends(get_database),
+    db: SessionStore = Depends(get_database),
     logger = Depends(get_logger)
 ):
     """업로드 상태 조회"""
@@ -146,13 +180,18 @@ async def get_upload_status(
             "timestamp": datetime.now().isoformat()
         }
     
+    recognition = await asyncio.to_thread(
+        product_recognition_service.build_recognition_status, session_id, session
+    )
+    
     return {
         "success": True,
         "data": {
             "status": "uploaded",
             "filename": uploaded_image["filename"],
             "uploaded_at": uploaded_image["uploaded_at"],
-            "image_info": uploaded_image["image_info"]
+            "image_info": uploaded_image["image_info"],
+            **recognition
         },
         "timestamp": datetime.now().isoformat()
     } 
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+세션 저장소 성능 측정 스크립트
+
+사용법 (backend 디렉토리에서):
+    python benchmark_session_store.py
+    python benchmark_session_store.py --sessions 2000 --stores memory sqlite
+    python benchmark_session_store.py --threads 1 4 16 32  # 메모리 저장소 잠금 경합 측정
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List
+
+# 인코딩 설정
+os.environ['PYTHONIOENCODING'] = 'utf-8'
+sys.stdout.reconfigure(encoding='utf-8')
+
+from config.database import SessionStore, MemoryDatabase, SQLiteSessionStore
+
+
+def _measure(name: str, count: int, operation: Callable[[int], None]) -> float:
+    """operation을 count번 실행하고 초당 처리 수 반환"""
+    start = time.perf_counter()
+    for index in range(count):
+        operation(index)
+    elapsed = time.perf_counter() - start
+    ops = count / elapsed if elapsed > 0 else float("inf")
+    print(f"  {name:<16} {ops:>12,.0f} ops/sec  ({elapsed * 1000:.1f} ms)")
+    return ops
+
+
+def benchmark_store(label: str, store: SessionStore, session_count: int) -> Dict[str, float]:
+    """세션 생성/조회/부분 업데이트/삭제 처리량 측정"""
+    print(f"[{label}]")
+    session_ids: List[str] = [str(uuid.uuid4()) for _ in range(session_count)]
+    product_info = {"brand": "coway", "category": "공기청정기", "model": "AP-1512H", "confidence": 0.9}
+
+    results = {
+        "create": _measure("create_session", session_count, lambda i: store.create_session(session_ids[i])),
+        "get": _measure("get_session", session_count * 3, lambda i: store.get_session(session_ids[i % session_count])),
+        "update": _measure(
+            "update_session",
+            session_count,
+            lambda i: store.update_session(session_ids[i], {"product_info": product_info, "usage_guide": "가이드 " * 200})
+        ),
+        "count": _measure("get_session_count", 1000, lambda i: store.get_session_count()),
+        "delete": _measure("delete_session", session_count, lambda i: store.delete_session(session_ids[i]))
+    }
+    print()
+    return results
+
+
+def benchmark_contention(label: str, store: SessionStore, thread_count: int, ops_per_thread: int) -> float:
+    """여러 스레드가 채팅 요청 패턴(조회 3회 + 업데이트 1회)을 동시에 실행할 때 처리량 측정"""
+    session_ids = [str(uuid.uuid4()) for _ in range(max(thread_count * 4, 64))]
+    for session_id in session_ids:
+        store.create_session(session_id)
+
+    barrier = threading.Barrier(thread_count + 1)
+
+    def worker(offset: int):
+        barrier.wait()
+        for index in range(ops_per_thread):
+            session_id = session_ids[(offset + index) % len(session_ids)]
+            for _ in range(3):
+                store.get_session(session_id)
+            store.update_session(session_id, {"last_chat_at": index})
+            store.get_session_count()
+
+    threads = [threading.Thread(target=worker, args=(i * 7,)) for i in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    requests = thread_count * ops_per_thread
+    rps = requests / elapsed if elapsed > 0 else float("inf")
+    print(f"  {label:<24} threads={thread_count:<3} {rps:>12,.0f} req/sec  ({elapsed * 1000:.1f} ms)")
+    return rps
+
+
+def main():
+    parser = argparse.ArgumentParser(description="세션 저장소 성능 측정")
+    parser.add_argument("--sessions", type=int, default=1000, help="측정에 사용할 세션 수")
+    parser.add_argument("--stores", nargs="+", default=["memory", "sqlite"], choices=["memory", "sqlite"])
+    parser.add_argument("--threads", nargs="+", type=int, help="잠금 경합 측정에 사용할 스레드 수 목록")
+    parser.add_argument("--ops", type=int, default=5000, help="경합 측정 시 스레드당 요청 수")
+    args = parser.parse_args()
+
+    if args.threads:
+        print("[memory 잠금 경합]")
+        for thread_count in args.threads:
+            benchmark_contention("memory", MemoryDatabase(), thread_count, args.ops)
+        print()
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for store_type in args.stores:
+            if store_type == "memory":
+                store: SessionStore = MemoryDatabase()
+            else:
+                store = SQLiteSessionStore(os.path.join(tmp_dir, "sessions.sqlite3"))
+            benchmark_store(store_type, store, args.sessions)
+
+
+if __name__ == "__main__":
+    main()
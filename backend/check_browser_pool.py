@@ -0,0 +1,197 @@
+"""
+브라우저 풀 동작 확인 스크립트 (로컬 정적 HTTP 서버 사용)
+
+외부 사이트 없이 로컬 HTTP 서버를 띄우고 BrowserPool의 재사용, 동시 대여 제한,
+드라이버 교체, 대여자 취소 시(드라이버 생성 중 취소 포함) 드라이버 폐기를 확인합니다.
+기본은 urllib로 페이지를 받는 가짜 드라이버를 사용하고, --chrome을 주면 실제 헤드리스 Chrome을 사용합니다.
+
+사용법 (backend 디렉토리에서):
+    python check_browser_pool.py
+    python check_browser_pool.py --chrome
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, List
+
+# 인코딩 설정
+os.environ['PYTHONIOENCODING'] = 'utf-8'
+sys.stdout.reconfigure(encoding='utf-8')
+
+from services.browser_pool import BrowserPool
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """/slow는 1초 뒤에 응답하는 정적 페이지 서버"""
+
+    def do_GET(self):
+        if self.path.startswith("/slow"):
+            time.sleep(1.0)
+        body = f"<html><body><div class='product'>{self.path}</div></body></html>".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeDriver:
+    """WebDriver 대용 (동시에 두 스레드가 사용하면 위반으로 기록)"""
+
+    violations: List[str] = []
+    quit_count = 0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.page_source = ""
+        self.closed = False
+
+    def _enter(self, name: str):
+        if not self._lock.acquire(blocking=False):
+            FakeDriver.violations.append(f"동시 사용: {name}")
+            self._lock.acquire()
+        if self.closed:
+            FakeDriver.violations.append(f"종료된 드라이버 사용: {name}")
+
+    def get(self, url: str):
+        self._enter("get")
+        try:
+            if not url.startswith("about:"):
+                with urllib.request.urlopen(url, timeout=10) as response:
+                    self.page_source = response.read().decode("utf-8")
+        finally:
+            self._lock.release()
+
+    def delete_all_cookies(self):
+        self._enter("delete_all_cookies")
+        self._lock.release()
+
+    def quit(self):
+        self._enter("quit")
+        self.closed = True
+        FakeDriver.quit_count += 1
+        self._lock.release()
+
+
+def _load(driver: Any, url: str) -> str:
+    driver.get(url)
+    return driver.page_source
+
+
+def _check(label: str, ok: bool):
+    print(f"  {'✅' if ok else '❌'} {label}")
+    if not ok:
+        _check.failed = True
+
+
+async def run_checks(base_url: str, driver_factory: Callable[[], Any]):
+    # 1. 순차 대여는 드라이버 하나를 재사용
+    pool = BrowserPool(size=2, max_pages=3, driver_factory=driver_factory)
+    for index in range(3):
+        async with pool.checkout() as lease:
+            page = await pool.run(lease, _load, f"{base_url}/page/{index}")
+            assert f"/page/{index}" in page
+    stats = pool.get_stats()
+    _check(f"순차 대여 재사용 (생성 {stats['created']}, 재사용 {stats['reused']})",
+           stats["created"] == 1 and stats["reused"] == 2)
+    _check(f"max_pages 도달 시 교체 (교체 {stats['recycled']})", stats["recycled"] == 1)
+
+    # 2. 동시 대여는 size개로 제한
+    peak = 0
+
+    async def fetch(index: int):
+        nonlocal peak
+        async with pool.checkout() as lease:
+            peak = max(peak, pool.get_stats()["in_use"])
+            await pool.run(lease, _load, f"{base_url}/concurrent/{index}")
+
+    await asyncio.gather(*(fetch(index) for index in range(6)))
+    _check(f"동시 대여 제한 (최대 {peak}개 사용, 풀 크기 {pool.size})", peak <= pool.size)
+
+    # 3. 대여자가 취소되면 스레드 작업이 끝난 뒤 드라이버 폐기
+    discarded = pool.get_stats()["discarded"]
+
+    async def slow():
+        async with pool.checkout() as lease:
+            await pool.run(lease, _load, f"{base_url}/slow")
+
+    task = asyncio.create_task(slow())
+    await asyncio.sleep(0.2)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    _check("취소 직후 대여 자리는 아직 반환되지 않음", pool.get_stats()["in_use"] == 1)
+    await asyncio.sleep(1.5)
+    stats = pool.get_stats()
+    _check(f"스레드 작업 종료 후 드라이버 폐기 (폐기 {stats['discarded'] - discarded})",
+           stats["discarded"] == discarded + 1 and stats["in_use"] == 0)
+
+    await pool.close()
+    _check("종료 후 유휴 드라이버 없음", pool.get_stats()["idle"] == 0)
+
+    # 4. 드라이버 생성 중 대여자가 취소되면 생성이 끝난 뒤 새 드라이버 종료
+    def slow_factory() -> Any:
+        time.sleep(0.5)
+        return driver_factory()
+
+    pool = BrowserPool(size=1, driver_factory=slow_factory)
+
+    async def checkout_only():
+        async with pool.checkout():
+            pass
+
+    task = asyncio.create_task(checkout_only())
+    await asyncio.sleep(0.1)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    _check("생성 중 취소 직후 대여 자리는 아직 반환되지 않음", pool.get_stats()["in_use"] == 1)
+    await asyncio.sleep(1.0)
+    stats = pool.get_stats()
+    _check(f"생성 완료 후 새 드라이버 종료 (생성 {stats['created']}, 폐기 {stats['discarded']})",
+           stats["created"] == 1 and stats["discarded"] == 1 and stats["in_use"] == 0 and stats["idle"] == 0)
+    await pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="브라우저 풀 동작 확인 (로컬 HTTP 서버)")
+    parser.add_argument("--chrome", action="store_true", help="실제 헤드리스 Chrome 사용")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"로컬 HTTP 서버: {base_url}")
+
+    if args.chrome:
+        chrome_pool = BrowserPool()
+        driver_factory = chrome_pool._create_chrome_driver
+    else:
+        driver_factory = FakeDriver
+
+    _check.failed = False
+    try:
+        asyncio.run(run_checks(base_url, driver_factory))
+    finally:
+        server.shutdown()
+
+    if not args.chrome:
+        _check(f"드라이버 동시 사용 없음 {FakeDriver.violations or ''}", not FakeDriver.violations)
+    sys.exit(1 if _check.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
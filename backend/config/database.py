@@ -1,80 +1,663 @@
 """
-메모리 기반 데이터베이스 설정
+세션 저장소 설정 (메모리 / SQLite)
 """
 
-from typing import Dict, Any, Optional
+from abc import ABC, abstractmethod
+from collections import deque
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 from datetime import datetime, timedelta
+from pathlib import Path
+import heapq
+import os
+import pickle
+import sqlite3
+import sys
 import threading
+import time
 from config.settings import settings
+from utils.logger import logger
 
 
-class MemoryDatabase:
-    """메모리 기반 데이터베이스"""
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """객체가 차지하는 메모리 크기 어림값 (bytes)
     
-    def __init__(self):
-        self._sessions: Dict[str, Dict[str, Any]] = {}
+    dict/list/tuple/set은 안쪽 항목까지 더하고, numpy 배열은 nbytes를 사용합니다.
+    """
+    if _depth > 8:
+        return sys.getsizeof(value)
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes + 112
+    
+    size = sys.getsizeof(value)
+    if isinstance(value, (dict, MappingProxyType)):
+        size += sum(
+            estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+            for k, v in value.items()
+        )
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _depth + 1) for item in value)
+    return size
+
+
+def _copy_field(value: Any) -> Any:
+    """세션에 저장할 필드 값의 얕은 복사본 (dict/list/set만 새로 만들어 호출자 객체와 분리)"""
+    if isinstance(value, (dict, list, set)):
+        return value.copy()
+    return value
+
+
+class SessionStore(ABC):
+    """세션 저장소 인터페이스"""
+    
+    @abstractmethod
+    def create_session(self, session_id: str) -> Dict[str, Any]:
+        """세션 생성"""
+    
+    @abstractmethod
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """세션 조회 (만료된 세션은 None)"""
+    
+    @abstractmethod
+    def update_session(self, session_id: str, data: Dict[str, Any]) -> bool:
+        """세션 부분 업데이트 (전달한 필드만 변경)"""
+    
+    @abstractmethod
+    def delete_session(self, session_id: str) -> bool:
+        """세션 삭제"""
+    
+    @abstractmethod
+    def cleanup_expired_sessions(self) -> int:
+        """만료된 세션 정리"""
+    
+    @abstractmethod
+    def pop_expired(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """만료된 세션을 만료 시각 순으로 최대 limit개 삭제하고 반환
+        
+        반환 항목에는 적어도 session_id와 temp_files가 들어 있어
+        호출자가 세션의 임시 파일을 정리할 수 있습니다.
+        """
+    
+    @abstractmethod
+    def next_expiry(self) -> Optional[float]:
+        """가장 먼저 만료될 세션의 만료 시각 (timestamp, 없으면 None)"""
+    
+    @abstractmethod
+    def get_session_count(self) -> int:
+        """활성 세션 수 조회"""
+    
+    def get_memory_stats(self) -> Dict[str, Any]:
+        """메모리 사용량 통계 (지원하는 저장소만)"""
+        return {}
+    
+    @staticmethod
+    def _new_session_data(session_id: str) -> Dict[str, Any]:
+        """새 세션 기본 데이터"""
+        now = datetime.now()
+        return {
+            "session_id": session_id,
+            "created_at": now,
+            "expires_at": now + timedelta(hours=settings.session_expire_hours),
+            "product_info": None,
+            "temp_files": []
+        }
+
+
+class MemoryDatabase(SessionStore):
+    """메모리 기반 데이터베이스 (단일 프로세스 전용)
+    
+    - 쓰기는 하나의 잠금으로 직렬화합니다 (GIL 아래에서는 잠금을 세션별로 나눠도
+      처리량이 늘지 않음: benchmark_session_store.py --threads 참고).
+    - 세션은 읽기 전용 스냅샷(MappingProxyType)으로 저장하고, 업데이트는 복사 후 교체(copy-on-write)합니다.
+      따라서 조회는 잠금 없이 스냅샷 참조만 읽습니다.
+      스냅샷은 최상위만 읽기 전용이므로, 조회한 세션의 중첩 값(product_info, image_info,
+      temp_files 등)은 수정하지 말고 update_session으로 통째로 바꿔야 합니다.
+      업데이트는 바뀐 최상위 필드만 얕게 복사해 저장하므로 호출자가 넘긴 dict/list 자체를 나중에
+      고쳐도 세션에 반영되지 않습니다 (그 안쪽 객체는 공유되므로 역시 수정 금지).
+    - 세션 수는 생성/삭제 시 갱신하여 O(1)로 조회합니다.
+    - 만료 시각 최소 힙으로 만료 세션을 세션당 O(log n)에 찾아 정리합니다.
+      만료 시각이 바뀌거나 삭제된 세션의 힙 항목은 꺼낼 때 건너뜁니다.
+    - 세션 크기를 필드별로 어림잡아 합산하고, 전체가 memory_budget_bytes를 넘으면
+      가장 오래 접근하지 않은 세션을 디스크로 내보냈다가 다시 조회할 때 복원합니다.
+    - 재시작 전 스냅샷을 연결하면(attach_snapshot) 세션을 처음 조회할 때 하나씩 복원합니다.
+    """
+    
+    def __init__(
+        self,
+        memory_budget_bytes: Optional[int] = None,
+        spill_dir: Optional[str] = None
+    ):
+        self._sessions: Dict[str, Mapping[str, Any]] = {}
         self._lock = threading.Lock()
+        self._count_lock = threading.Lock()
+        self._count = 0
+        
+        # (만료 timestamp, 세션 ID) 최소 힙
+        self._expiry_lock = threading.Lock()
+        self._expiry_heap: List[Tuple[float, str]] = []
+        # 조회 중 만료가 확인되어 삭제된 세션 (임시 파일 정리 대기)
+        self._expired_on_read: deque = deque()
+        
+        # 크기 계산과 메모리 예산
+        if memory_budget_bytes is None:
+            memory_budget_bytes = settings.session_memory_budget_mb * 1024 * 1024
+        self.memory_budget_bytes = memory_budget_bytes
+        self._spill_dir = Path(spill_dir or settings.session_spill_dir)
+        self._field_sizes: Dict[str, Dict[str, int]] = {}
+        self._total_bytes = 0
+        self._last_access: Dict[str, float] = {}
+        # 디스크로 내보낸 세션: 세션 ID -> (만료 timestamp, 파일 경로)
+        self._spilled: Dict[str, Tuple[float, Path]] = {}
+        self._evict_lock = threading.Lock()
+        self.memory_stats = {"evictions": 0, "restores": 0, "spill_failures": 0, "snapshot_restores": 0}
+        
+        # 재시작 전 세션 스냅샷 (utils.session_snapshot.SnapshotReader)
+        self._snapshot = None
+    
+    def _adjust_count(self, delta: int):
+        with self._count_lock:
+            self._count += delta
+    
+    def _adjust_bytes(self, delta: int):
+        with self._count_lock:
+            self._total_bytes += delta
+    
+    def _schedule_expiry(self, session_id: str, expires_at: datetime):
+        with self._expiry_lock:
+            heapq.heappush(self._expiry_heap, (expires_at.timestamp(), session_id))
+    
+    def _account(self, session_id: str, fields: Mapping[str, Any]):
+        """변경된 필드 크기만 다시 계산해 합계에 반영 (호출자가 저장소 잠금을 보유해야 함)"""
+        sizes = self._field_sizes.setdefault(session_id, {})
+        delta = 0
+        for field, value in fields.items():
+            size = estimate_size(value)
+            delta += size - sizes.get(field, 0)
+            sizes[field] = size
+        self._adjust_bytes(delta)
+    
+    def _forget(self, session_id: str):
+        """세션 크기/접근 기록 제거 (호출자가 저장소 잠금을 보유해야 함)"""
+        sizes = self._field_sizes.pop(session_id, None)
+        if sizes:
+            self._adjust_bytes(-sum(sizes.values()))
+        self._last_access.pop(session_id, None)
+    
+    def _discard_spilled(self, session_id: str) -> Optional[Tuple[float, Path]]:
+        """디스크로 내보낸 세션 파일 삭제 (호출자가 저장소 잠금을 보유해야 함)"""
+        spilled = self._spilled.pop(session_id, None)
+        if spilled is not None:
+            try:
+                os.remove(spilled[1])
+            except FileNotFoundError:
+                pass
+        return spilled
+    
+    def _in_snapshot(self, session_id: str) -> bool:
+        return self._snapshot is not None and self._snapshot.contains(session_id)
     
     def create_session(self, session_id: str) -> Dict[str, Any]:
         """세션 생성"""
+        snapshot = MappingProxyType(self._new_session_data(session_id))
         with self._lock:
-            expires_at = datetime.now() + timedelta(hours=settings.session_expire_hours)
-            session_data = {
-                "session_id": session_id,
-                "created_at": datetime.now(),
-                "expires_at": expires_at,
-                "product_info": None,
-                "chat_history": [],
-                "temp_files": []
-            }
-            self._sessions[session_id] = session_data
-            return session_data
+            is_new = session_id not in self._sessions and self._discard_spilled(session_id) is None
+            if self._in_snapshot(session_id):
+                self._snapshot.consume(session_id)
+                is_new = False
+            self._sessions[session_id] = snapshot
+            self._forget(session_id)
+            self._account(session_id, snapshot)
+            self._last_access[session_id] = time.monotonic()
+        if is_new:
+            self._adjust_count(1)
+        self._schedule_expiry(session_id, snapshot["expires_at"])
+        self._enforce_budget()
+        return snapshot
     
     def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
-        """세션 조회"""
+        """세션 조회 (잠금 없이 읽기 전용 스냅샷 반환, 중첩 값은 공유되므로 수정 금지)"""
+        session = self._sessions.get(session_id)
+        if session is None:
+            if session_id not in self._spilled and not self._in_snapshot(session_id):
+                return None
+            session = self._restore(session_id)
+            if session is None:
+                return None
+        
+        self._last_access[session_id] = time.monotonic()
+        if session["expires_at"] > datetime.now():
+            return session
+        
+        # 만료된 세션 삭제 (그 사이 갱신되지 않은 경우에만), 임시 파일은 정리 작업에서 삭제
         with self._lock:
-            session = self._sessions.get(session_id)
-            if session and session["expires_at"] > datetime.now():
-                return session
-            elif session:
-                # 만료된 세션 삭제
+            if self._sessions.get(session_id) is session:
                 del self._sessions[session_id]
-            return None
+                self._forget(session_id)
+                self._adjust_count(-1)
+                self._expired_on_read.append(session)
+        return None
     
     def update_session(self, session_id: str, data: Dict[str, Any]) -> bool:
-        """세션 업데이트"""
+        """세션 업데이트 (복사 후 교체, 바뀐 필드 값만 얕게 복사하여 저장)"""
+        data = {field: _copy_field(value) for field, value in data.items()}
+        if session_id not in self._sessions and (session_id in self._spilled or self._in_snapshot(session_id)):
+            self._restore(session_id)
+        
         with self._lock:
             session = self._sessions.get(session_id)
             if session and session["expires_at"] > datetime.now():
-                session.update(data)
-                return True
-            return False
+                updated = dict(session)
+                updated.update(data)
+                self._sessions[session_id] = MappingProxyType(updated)
+                self._account(session_id, data)
+                self._last_access[session_id] = time.monotonic()
+            else:
+                return False
+        
+        if updated["expires_at"] != session["expires_at"]:
+            self._schedule_expiry(session_id, updated["expires_at"])
+        self._enforce_budget()
+        return True
     
     def delete_session(self, session_id: str) -> bool:
         """세션 삭제"""
         with self._lock:
-            if session_id in self._sessions:
-                del self._sessions[session_id]
-                return True
-            return False
+            removed = self._sessions.pop(session_id, None) is not None
+            removed = self._discard_spilled(session_id) is not None or removed
+            if self._in_snapshot(session_id):
+                self._snapshot.consume(session_id)
+                removed = True
+            self._forget(session_id)
+        if removed:
+            self._adjust_count(-1)
+        return removed
     
-    def cleanup_expired_sessions(self):
-        """만료된 세션 정리"""
+    def cleanup_expired_sessions(self) -> int:
+        """만료된 세션 정리 (전체 세션을 훑지 않고 만료 힙에서 꺼냄)"""
+        return len(self.pop_expired())
+    
+    def pop_expired(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """만료된 세션을 만료 시각 순으로 삭제하고 반환"""
+        removed: List[Dict[str, Any]] = []
+        while self._expired_on_read and (limit is None or len(removed) < limit):
+            removed.append(dict(self._expired_on_read.popleft()))
+        
+        now = datetime.now().timestamp()
+        while limit is None or len(removed) < limit:
+            with self._expiry_lock:
+                if not self._expiry_heap or self._expiry_heap[0][0] > now:
+                    break
+                expires_ts, session_id = heapq.heappop(self._expiry_heap)
+            
+            with self._lock:
+                session = self._sessions.get(session_id)
+                if session is None and self._spilled.get(session_id, (None,))[0] == expires_ts:
+                    # 디스크로 내보낸 세션은 임시 파일 목록을 읽어 함께 반환
+                    session = self._read_spilled(self._spilled[session_id][1])
+                    self._discard_spilled(session_id)
+                    if session is None:
+                        session = {"session_id": session_id, "temp_files": []}
+                elif session is None or session["expires_at"].timestamp() != expires_ts:
+                    # 만료 시각이 연장됐거나 이미 삭제된 세션의 힙 항목은 건너뜀
+                    continue
+                else:
+                    del self._sessions[session_id]
+                self._forget(session_id)
+            self._adjust_count(-1)
+            removed.append(dict(session))
+        
+        # 복원되지 않은 채 만료된 스냅샷 세션
+        if self._snapshot is not None and (limit is None or len(removed) < limit):
+            for session_id, data in self._snapshot.pop_expired(now, None if limit is None else limit - len(removed)):
+                self._adjust_count(-1)
+                removed.append(data)
+        
+        return removed
+    
+    def next_expiry(self) -> Optional[float]:
+        """가장 먼저 만료될 세션의 만료 시각"""
+        if self._expired_on_read:
+            return datetime.now().timestamp()
+        with self._expiry_lock:
+            next_expiry = self._expiry_heap[0][0] if self._expiry_heap else None
+        if self._snapshot is not None:
+            snapshot_expiry = self._snapshot.next_expiry()
+            if snapshot_expiry is not None and (next_expiry is None or snapshot_expiry < next_expiry):
+                return snapshot_expiry
+        return next_expiry
+    
+    def get_session_count(self) -> int:
+        """활성 세션 수 조회 (디스크로 내보낸 세션 포함)"""
+        return self._count
+    
+    @staticmethod
+    def _read_spilled(path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logger.warning(f"내보낸 세션 읽기 실패: {path} ({e})")
+            return None
+    
+    def _restore(self, session_id: str) -> Optional[Mapping[str, Any]]:
+        """디스크로 내보낸 세션이나 스냅샷의 세션을 메모리로 복원"""
         with self._lock:
-            now = datetime.now()
-            expired_sessions = [
-                sid for sid, session in self._sessions.items()
-                if session["expires_at"] <= now
+            session = self._sessions.get(session_id)
+            if session is not None:
+                return session
+            
+            from_snapshot = False
+            if session_id in self._spilled:
+                data = self._read_spilled(self._spilled[session_id][1])
+                self._discard_spilled(session_id)
+                self.memory_stats["restores"] += 1
+            elif self._in_snapshot(session_id):
+                from_snapshot = True
+                data = self._snapshot.get(session_id)
+                self._snapshot.consume(session_id)
+                self.memory_stats["snapshot_restores"] += 1
+            else:
+                return None
+            
+            if data is None:
+                self._adjust_count(-1)
+                return None
+            
+            session = MappingProxyType(data)
+            self._sessions[session_id] = session
+            self._account(session_id, session)
+            self._last_access[session_id] = time.monotonic()
+        
+        if from_snapshot:
+            # 디스크로 내보낸 세션은 만료 힙에 이미 있음
+            self._schedule_expiry(session_id, session["expires_at"])
+        self._enforce_budget(keep=session_id)
+        return session
+    
+    def attach_snapshot(self, reader) -> int:
+        """재시작 전 스냅샷 연결 (세션은 처음 조회할 때 복원)"""
+        self._snapshot = reader
+        self._adjust_count(reader.remaining)
+        return reader.remaining
+    
+    def iter_sessions(self):
+        """저장된 모든 세션 데이터 (메모리, 디스크로 내보낸 세션)"""
+        for session in list(self._sessions.values()):
+            yield dict(session)
+        for _, path in list(self._spilled.values()):
+            data = self._read_spilled(path)
+            if data is not None:
+                yield data
+    
+    @property
+    def snapshot(self):
+        """연결된 스냅샷 (복원되지 않은 세션은 다음 스냅샷에 그대로 옮김)"""
+        return self._snapshot
+    
+    def _enforce_budget(self, keep: Optional[str] = None):
+        """메모리 예산을 넘으면 가장 오래 접근하지 않은 세션부터 디스크로 내보냄"""
+        if not self.memory_budget_bytes or self._total_bytes <= self.memory_budget_bytes:
+            return
+        if not self._evict_lock.acquire(blocking=False):
+            return  # 다른 스레드가 정리 중
+        
+        try:
+            # 예산의 90%까지 줄여 매 업데이트마다 내보내지 않도록 함
+            target = self.memory_budget_bytes * 0.9
+            candidates = heapq.nsmallest(
+                max(1, len(self._last_access) // 10),
+                list(self._last_access.items()),
+                key=lambda item: item[1]
+            )
+            for session_id, _ in candidates:
+                if self._total_bytes <= target:
+                    break
+                if session_id != keep:
+                    self._spill(session_id)
+        finally:
+            self._evict_lock.release()
+    
+    def _spill(self, session_id: str):
+        """세션을 디스크로 내보냄"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                self._last_access.pop(session_id, None)
+                return
+            
+            path = self._spill_dir / str(os.getpid()) / f"{session_id}.pkl"
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path, "wb") as f:
+                    pickle.dump(dict(session), f, pickle.HIGHEST_PROTOCOL)
+            except Exception as e:
+                logger.warning(f"세션 내보내기 실패: {session_id} ({e})")
+                self.memory_stats["spill_failures"] += 1
+                return
+            
+            del self._sessions[session_id]
+            self._forget(session_id)
+            self._spilled[session_id] = (session["expires_at"].timestamp(), path)
+            self.memory_stats["evictions"] += 1
+    
+    def get_memory_stats(self) -> Dict[str, Any]:
+        """메모리 사용량 통계"""
+        return {
+            "sessions_in_memory": len(self._sessions),
+            "sessions_spilled": len(self._spilled),
+            "sessions_in_snapshot": self._snapshot.remaining if self._snapshot is not None else 0,
+            "approx_bytes": self._total_bytes,
+            "budget_bytes": self.memory_budget_bytes,
+            **self.memory_stats
+        }
+
+
+class SQLiteSessionStore(SessionStore):
+    """SQLite(WAL) 기반 세션 저장소 (여러 워커 프로세스에서 공유)
+    
+    - sessions: 세션별 만료 시각 (expires_at 인덱스로 만료 세션을 빠르게 찾음)
+    - session_fields: 세션 필드별 한 행 (pickle 값)
+    
+    필드별로 저장하므로 update_session은 전달한 필드만 한 트랜잭션으로 바꾸며,
+    서로 다른 워커가 다른 필드를 동시에 고쳐도 서로 덮어쓰지 않습니다.
+    """
+    
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized_pid: Optional[int] = None
+    
+    def _connect(self) -> sqlite3.Connection:
+        """스레드별 연결 반환 (포크 이후에는 새로 연결)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and getattr(self._local, "pid", None) == os.getpid():
+            return conn
+        
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        
+        with self._init_lock:
+            if self._initialized_pid != os.getpid():
+                conn.executescript(
+                    "CREATE TABLE IF NOT EXISTS sessions ("
+                    "session_id TEXT PRIMARY KEY, created_at REAL NOT NULL, expires_at REAL NOT NULL);"
+                    "CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_at);"
+                    "CREATE TABLE IF NOT EXISTS session_fields ("
+                    "session_id TEXT NOT NULL, field TEXT NOT NULL, value BLOB NOT NULL, "
+                    "PRIMARY KEY (session_id, field)) WITHOUT ROWID;"
+                )
+                self._initialized_pid = os.getpid()
+        
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+    
+    def create_session(self, session_id: str) -> Dict[str, Any]:
+        """세션 생성"""
+        session_data = self._new_session_data(session_id)
+        conn = self._connect()
+        
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM session_fields WHERE session_id = ?", (session_id,))
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, created_at, expires_at) VALUES (?, ?, ?)",
+                (session_id, session_data["created_at"].timestamp(), session_data["expires_at"].timestamp())
+            )
+            conn.executemany(
+                "INSERT INTO session_fields (session_id, field, value) VALUES (?, ?, ?)",
+                [
+                    (session_id, field, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+                    for field, value in session_data.items()
+                    if field not in ("session_id", "created_at", "expires_at")
+                ]
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        
+        return session_data
+    
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """세션 조회 (만료된 세션은 삭제)"""
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT created_at, expires_at FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        if row[1] <= datetime.now().timestamp():
+            # 만료된 세션은 임시 파일과 함께 정리 작업(pop_expired)에서 삭제
+            return None
+        
+        session = {
+            "session_id": session_id,
+            "created_at": datetime.fromtimestamp(row[0]),
+            "expires_at": datetime.fromtimestamp(row[1])
+        }
+        for field, value in conn.execute(
+            "SELECT field, value FROM session_fields WHERE session_id = ?", (session_id,)
+        ):
+            session[field] = pickle.loads(value)
+        return session
+    
+    def update_session(self, session_id: str, data: Dict[str, Any]) -> bool:
+        """세션 부분 업데이트 (전달한 필드만 한 트랜잭션으로 변경)"""
+        conn = self._connect()
+        
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT expires_at FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is None or row[0] <= datetime.now().timestamp():
+                conn.execute("ROLLBACK")
+                return False
+            
+            fields = dict(data)
+            fields.pop("session_id", None)
+            for column in ("created_at", "expires_at"):
+                if column in fields:
+                    conn.execute(
+                        f"UPDATE sessions SET {column} = ? WHERE session_id = ?",
+                        (fields.pop(column).timestamp(), session_id)
+                    )
+            
+            conn.executemany(
+                "INSERT OR REPLACE INTO session_fields (session_id, field, value) VALUES (?, ?, ?)",
+                [
+                    (session_id, field, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+                    for field, value in fields.items()
+                ]
+            )
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    
+    def delete_session(self, session_id: str) -> bool:
+        """세션 삭제"""
+        conn = self._connect()
+        
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            conn.execute("DELETE FROM session_fields WHERE session_id = ?", (session_id,))
+            conn.execute("COMMIT")
+            return cursor.rowcount > 0
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    
+    def cleanup_expired_sessions(self) -> int:
+        """만료된 세션 정리 (expires_at 인덱스 사용)"""
+        return len(self.pop_expired())
+    
+    def pop_expired(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """만료된 세션을 만료 시각 순으로 삭제하고 session_id, temp_files 반환"""
+        conn = self._connect()
+        now = datetime.now().timestamp()
+        
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            session_ids = [
+                row[0] for row in conn.execute(
+                    "SELECT session_id FROM sessions WHERE expires_at <= ? ORDER BY expires_at LIMIT ?",
+                    (now, -1 if limit is None else limit)
+                )
             ]
-            for sid in expired_sessions:
-                del self._sessions[sid]
-            return len(expired_sessions)
+            removed = []
+            for session_id in session_ids:
+                row = conn.execute(
+                    "SELECT value FROM session_fields WHERE session_id = ? AND field = 'temp_files'",
+                    (session_id,)
+                ).fetchone()
+                removed.append({
+                    "session_id": session_id,
+                    "temp_files": pickle.loads(row[0]) if row else []
+                })
+                conn.execute("DELETE FROM session_fields WHERE session_id = ?", (session_id,))
+                conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            conn.execute("COMMIT")
+            return removed
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    
+    def next_expiry(self) -> Optional[float]:
+        """가장 먼저 만료될 세션의 만료 시각"""
+        conn = self._connect()
+        row = conn.execute("SELECT MIN(expires_at) FROM sessions").fetchone()
+        return row[0]
     
     def get_session_count(self) -> int:
         """활성 세션 수 조회"""
-        with self._lock:
-            return len(self._sessions)
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT COUNT(*) FROM sessions WHERE expires_at > ?", (datetime.now().timestamp(),)
+        ).fetchone()
+        return row[0]
+
+
+def create_session_store(store_type: Optional[str] = None) -> SessionStore:
+    """설정에 따라 세션 저장소 생성 (memory | sqlite)"""
+    store_type = (store_type or settings.session_store).lower()
+    
+    if store_type == "sqlite":
+        return SQLiteSessionStore(settings.session_db_path)
+    if store_type == "memory":
+        return MemoryDatabase()
+    raise ValueError(f"지원하지 않는 세션 저장소입니다: {store_type}")
 
 
 # 전역 데이터베이스 인스턴스
-memory_db = MemoryDatabase() 
\ No newline at end of file
+session_store = create_session_store()
+memory_db = session_store  # 기존 코드 호환용 이름
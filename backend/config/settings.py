@@ -40,6 +40,99 @@ class Settings(BaseSettings):
     
     # 세션 설정
     session_expire_hours: int = 1
+    session_store: str = "memory"  # memory | sqlite (여러 워커로 실행하려면 sqlite)
+    session_db_path: str = "temp/sessions.sqlite3"
+    session_sweep_enabled: bool = True  # 만료 세션 백그라운드 정리
+    session_sweep_interval_seconds: float = 60.0  # 정리 작업 최대 대기 간격
+    session_sweep_batch_size: int = 100  # 한 번에 정리할 세션 수
+    session_memory_budget_mb: int = 256  # 메모리 세션 저장소 예산 (0이면 제한 없음)
+    session_spill_dir: str = "temp/session_spill"  # 예산 초과 시 세션을 내보낼 위치
+    chat_history_max_in_memory: int = 200  # 세션별 메모리에 보관할 최대 채팅 메시지 수 (0이면 제한 없음)
+    chat_history_spill_dir: str = "temp/chat_history"  # 오래된 채팅 메시지 저장 위치
+    snapshot_enabled: bool = True  # 종료 시 세션/채팅 로그 스냅샷 저장, 시작 시 복원
+    snapshot_dir: str = "temp/snapshot"
+    
+    # 작업 큐 설정 (제품 분석)
+    job_workers: int = 2  # 동시에 실행할 분석 작업 수 (막히는 작업을 실행할 스레드 수도 같음)
+    job_queue_max_size: int = 100  # 대기열 최대 길이
+    job_db_path: str = "temp/jobs.sqlite3"
+    job_retention_seconds: int = 86400  # 끝난 작업 기록 보관 기간
+    job_loop_stall_warn_seconds: float = 0.5  # 작업 실행 중 이벤트 루프가 이만큼 멈추면 경고 (0이면 끄기)
+    recognition_wait_seconds: int = 60  # 분석 시작 시 실행 중인 업로드 인식 작업을 기다리는 최대 시간
+    result_long_poll_max_seconds: float = 60.0  # 분석 결과 조회 ?wait= 최대 대기 시간
+    
+    # 요청 수용 제어 설정 (업로드/채팅/분석)
+    admission_enabled: bool = True
+    admission_upload_concurrency: int = 2  # 동시에 처리할 업로드(OCR) 수
+    admission_upload_queue: int = 4  # 자리가 날 때까지 기다릴 수 있는 업로드 수
+    admission_chat_concurrency: int = 4  # 동시에 처리할 채팅(LLM) 수
+    admission_chat_queue: int = 8
+    admission_queue_timeout_seconds: float = 10.0  # 대기열에서 기다릴 최대 시간 (넘으면 503)
+    admission_upload_rate_per_minute: float = 10.0  # 세션별 분당 요청 수 (0이면 제한 없음)
+    admission_chat_rate_per_minute: float = 20.0
+    admission_analyze_rate_per_minute: float = 6.0
+    admission_burst: int = 3  # 세션별로 연속해서 허용할 요청 수
+    
+    # 운영 서버 설정 (prod_server.py)
+    prod_host: str = "0.0.0.0"
+    prod_workers: int = 0  # 0이면 CPU 수 (메모리 세션 저장소에서는 1)
+    prod_loop: str = "auto"  # auto | uvloop | asyncio
+    prod_http: str = "auto"  # auto | httptools | h11
+    prod_access_log: bool = False
+    prod_backlog: int = 2048
+    prod_graceful_timeout_seconds: int = 30  # 워커 정상 종료 대기 시간
+    prod_restart_stagger_seconds: float = 2.0  # 순차 재시작 시 새 워커 준비 대기 시간
+    prod_preload_ocr: bool = True  # 마스터에서 OCR 모델을 미리 로드해 워커와 공유
+    prod_memory_report_interval_seconds: int = 300  # 워커 메모리 보고 주기 (0이면 끔)
+    
+    # 검색 캐시 설정
+    search_cache_enabled: bool = True
+    search_cache_path: str = "temp/cache/search_cache.sqlite3"
+    search_cache_max_entries: int = 1024  # 메모리 LRU 최대 항목 수
+    search_cache_ttl_seconds: int = 86400  # 24시간
+    search_cache_negative_ttl_seconds: int = 300  # 실패/빈 응답은 5분
+    
+    # 다중 소스 제품 검색 설정
+    search_deadline_seconds: float = 8.0  # 전체 검색 제한 시간
+    search_quality_threshold: float = 0.8  # 이 점수 이상인 첫 결과를 채택
+    
+    # 외부 API 서킷 브레이커 설정
+    circuit_failure_rate_threshold: float = 0.5  # 최근 호출 중 실패 비율
+    circuit_minimum_calls: int = 5  # 실패율 계산을 위한 최소 호출 수
+    circuit_window_size: int = 20  # 실패율 계산 구간 (최근 호출 수)
+    circuit_cooldown_seconds: float = 60.0  # 차단 후 시험 호출까지 대기 시간
+    naver_daily_quota: int = 25000  # 네이버 검색 API 일일 호출 한도
+    google_daily_quota: int = 100  # Google Custom Search 일일 무료 한도
+    
+    # 로컬 제품 카탈로그 설정
+    catalog_db_path: str = "temp/cache/product_catalog.sqlite3"
+    catalog_import_path: str = ""  # 시작 시 가져올 JSON/CSV 카탈로그 파일 (선택)
+    
+    # 공유 HTTP 클라이언트 설정
+    http_pool_limit: int = 50  # 전체 동시 연결 수
+    http_pool_limit_per_host: int = 10  # 호스트별 동시 연결 수
+    http_timeout_seconds: float = 10.0
+    
+    # 헤드리스 브라우저 풀 설정 (브랜드 공식 사이트 검색)
+    browser_pool_size: int = 2  # 동시에 사용할 수 있는 브라우저 수
+    browser_max_pages_per_driver: int = 50  # 이 페이지 수를 처리하면 브라우저 교체
+    browser_checkout_timeout_seconds: float = 15.0  # 브라우저 대여 대기 시간
+    browser_page_load_timeout_seconds: float = 10.0
+    official_site_browser_fallback: bool = True  # HTTP 추출 결과가 없으면 브라우저로 재시도
+    
+    # 후보 이미지 유사도 비교 설정
+    image_download_concurrency: int = 6  # 후보 이미지 동시 다운로드 수
+    image_similarity_early_stop_margin: float = 0.1  # 임계값 + 이 값 이상이면 비교 중단
+    image_cache_dir: str = "temp/cache/images"
+    image_cache_url_ttl_seconds: int = 604800  # URL → 이미지 매핑 유지 기간 (7일)
+    image_index_dir: str = "temp/cache/image_index"  # 카탈로그 이미지 특징 행렬 저장 위치
+    image_index_save_every: int = 20  # 이 개수만큼 추가될 때마다 디스크에 저장
+    
+    # 재촬영 이미지 검출 설정 (지각 해시)
+    image_dedup_enabled: bool = True
+    image_dedup_max_distance: int = 6  # 이 해밍 거리 이하면 같은 사진으로 보고 분석 결과 재사용
+    image_dedup_ttl_seconds: int = 3600  # 분석 결과 재사용 기간
+    image_dedup_max_entries: int = 1000
     
     # 로깅 설정
     log_level: str = "INFO"
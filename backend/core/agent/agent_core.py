@@ -5,6 +5,7 @@ LangGraph 기반 AI Agent 핵심 구현
 import json
 from typing import Dict, Any, List, Optional, Sequence
 from datetime import datetime
+from pathlib import Path
 
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
@@ -19,6 +20,8 @@ from core.agent.prompts.system_prompts import (
     GENERAL_CHAT_PROMPT
 )
 from core.agent.tools.search_tools import AVAILABLE_TOOLS
+from services.analysis_events import analysis_events
+from services.job_queue import job_queue
 
 
 class ApplianceAgent:
@@ -77,10 +80,9 @@ class ApplianceAgent:
         logger.info(f"제품 이미지 분석 시작: {image_path}")
         
         try:
-            # 먼저 product_recognition_service의 결과 확인
-            from services.product_recognition_service import ProductRecognitionService
-            recognition_service = ProductRecognitionService()
-            recognition_result = await recognition_service.classify_product_category(image_path)
+            # 먼저 product_recognition_service의 결과 확인 (업로드 후 인식한 결과 재사용)
+            from services.product_recognition_service import product_recognition_service
+            recognition_result = await product_recognition_service.recognize_for_session(session_id, image_path)
             
             # 가전제품이 아닌 경우 즉시 반환
             if not recognition_result.get("success", True) or recognition_result.get("category") == "가전제품_아님":
@@ -100,9 +102,10 @@ class ApplianceAgent:
                 }
             
             # 이미지를 base64로 인코딩
+            analysis_events.report("vision", "AI가 제품 이미지를 분석하고 있습니다.")
             import base64
-            with open(image_path, "rb") as image_file:
-                image_data = base64.b64encode(image_file.read()).decode()
+            image_bytes = await job_queue.offload(Path(image_path).read_bytes)
+            image_data = base64.b64encode(image_bytes).decode()
             
             # 시스템 프롬프트와 이미지 메시지 구성
             messages = [
@@ -115,9 +118,10 @@ class ApplianceAgent:
                 ])
             ]
             
-            # Agent 실행
+            # Agent 실행 (동기 호출이므로 작업 스레드에서 실행)
             config = {"configurable": {"thread_id": f"recognition_{session_id}"}}
-            response = self.product_recognition_agent.invoke(
+            response = await job_queue.offload(
+                self.product_recognition_agent.invoke,
                 {"messages": messages}, 
                 config=config
             )
@@ -186,9 +190,6 @@ class ApplianceAgent:
                         break
                 
                 # OCR 결과가 있으면 활용
-                session = memory_db.get_session(session_id)
-                recognition_result = session.get("product_recognition", {})
-                
                 product_info = {
                     "brand": recognition_result.get("brand", extracted_brand),
                     "category": recognition_result.get("category", extracted_category),
@@ -233,9 +234,10 @@ class ApplianceAgent:
                 HumanMessage(content=f"{system_prompt}\n\n이 제품의 기본 사용법을 단계별로 알려주세요. 안전 주의사항도 포함해 주세요.")
             ]
             
-            # Agent 실행
+            # Agent 실행 (동기 호출이므로 작업 스레드에서 실행)
             config = {"configurable": {"thread_id": f"guide_{session_id}"}}
-            response = self.chat_agent.invoke(
+            response = await job_queue.offload(
+                self.chat_agent.invoke,
                 {"messages": messages}, 
                 config=config
             )
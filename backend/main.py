@@ -20,6 +20,13 @@ from utils.logger import logger
 from api.routes import health, upload, session, product, chat, config
 from core.agent.agent_core import initialize_agent
 from services.simple_product_search_service import simple_product_search_service
+from services.product_catalog_service import product_catalog
+from services.browser_pool import browser_pool
+from services.image_similarity_index import image_similarity_index
+from services.session_sweeper import session_sweeper
+from services.state_snapshot import state_snapshot
+from services.job_queue import job_queue
+from utils.http_client import close_http_session
 
 
 @asynccontextmanager
@@ -39,13 +46,35 @@ async def lifespan(app: FastAPI):
     else:
         logger.warning("⚠️ 네이버 API 키가 설정되지 않았습니다. 모의 검색 모드로 실행됩니다.")
     
+    # 로컬 제품 카탈로그 일괄 가져오기 (선택)
+    if settings.catalog_import_path:
+        product_catalog.import_file(settings.catalog_import_path)
+    
     # AI Agent 초기화
     await initialize_agent()
     
+    # 재시작 전 세션/채팅 로그 스냅샷 연결 (세션별로 처음 조회할 때 복원)
+    if settings.snapshot_enabled:
+        state_snapshot.restore()
+    
+    # 만료 세션 백그라운드 정리
+    if settings.session_sweep_enabled:
+        session_sweeper.start()
+    
+    # 분석 작업 큐 (이전 실행에서 끝나지 않은 작업 복구)
+    await job_queue.start()
+    
     yield
     
     # 종료 시
     logger.info("🛑 백엔드 서버를 종료합니다...")
+    await job_queue.stop()
+    await session_sweeper.stop()
+    if settings.snapshot_enabled:
+        state_snapshot.save()
+    await browser_pool.close()
+    await close_http_session()
+    image_similarity_index.save()
 
 
 # FastAPI 앱 생성
@@ -0,0 +1,285 @@
+"""
+운영 서버 실행 스크립트 (프리포크 멀티 워커)
+
+마스터 프로세스가 앱과 OCR 모델 등 읽기 전용 상태를 한 번만 로드하고
+gc.freeze()로 고정한 뒤 워커를 fork합니다. 워커들은 마스터의 메모리 페이지를
+copy-on-write로 공유하므로 워커 수만큼 모델 사본이 생기지 않습니다.
+모든 워커는 마스터가 연 하나의 리슨 소켓에서 연결을 받습니다.
+
+사용법 (backend 디렉토리에서):
+    python prod_server.py
+    python prod_server.py --workers 4 --port 8000
+
+신호:
+    SIGHUP          워커를 하나씩 새로 띄우고 기존 워커를 정상 종료 (무중단 교체)
+    SIGTERM/SIGINT  모든 워커를 정상 종료한 뒤 마스터 종료
+
+SIGHUP은 마스터에 로드된 코드와 설정을 그대로 사용하므로,
+코드나 .env를 바꾼 경우에는 마스터를 다시 시작해야 합니다.
+"""
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Any, Dict, Optional
+
+# 인코딩 설정
+os.environ['PYTHONIOENCODING'] = 'utf-8'
+sys.stdout.reconfigure(encoding='utf-8')
+sys.stderr.reconfigure(encoding='utf-8')
+
+import uvicorn
+
+from config.settings import settings
+from utils.logger import logger
+from utils.process_memory import read_memory_usage
+
+
+def preload():
+    """워커가 공유할 앱과 무거운 읽기 전용 상태를 마스터에서 로드"""
+    from main import app
+    from services.product_recognition_service import product_recognition_service
+    from services.simple_product_search_service import simple_product_search_service
+
+    if settings.prod_preload_ocr:
+        product_recognition_service._initialize_ocr()
+        if product_recognition_service.ocr_reader is not None:
+            # 검색 서비스도 같은 OCR 리더를 사용하여 모델 사본을 하나만 유지
+            simple_product_search_service.ocr_reader = product_recognition_service.ocr_reader
+
+    # 지금까지 만든 객체를 GC 추적 대상에서 빼서, 워커의 GC가 공유 페이지에 쓰며 복사되는 것을 방지
+    gc.collect()
+    gc.freeze()
+    return app
+
+
+def _format_usage(usage: Optional[Dict[str, int]]) -> str:
+    if usage is None:
+        return "메모리 정보 없음"
+    return (
+        f"rss={usage['rss_kb'] / 1024:.1f}MB "
+        f"shared={usage['shared_kb'] / 1024:.1f}MB "
+        f"private={usage['private_kb'] / 1024:.1f}MB "
+        f"pss={usage.get('pss_kb', 0) / 1024:.1f}MB"
+    )
+
+
+class PreforkMaster:
+    """워커 프로세스 관리 (생성, 재시작, 종료, 메모리 보고)"""
+
+    def __init__(self, app: Any, workers: int, host: str, port: int):
+        self.app = app
+        self.worker_count = workers
+        self.workers: Dict[int, float] = {}  # pid -> 시작 시각
+        self.sock = self._bind(host, port)
+        self._reload_requested = False
+        self._stopping = False
+
+    @staticmethod
+    def _bind(host: str, port: int) -> socket.socket:
+        family = socket.AF_INET6 if ":" in host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((host, port))
+        sock.listen(settings.prod_backlog)
+        sock.set_inheritable(True)
+        logger.info(f"리슨 소켓 생성: http://{host}:{port}")
+        return sock
+
+    def _spawn(self) -> int:
+        """워커 fork"""
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker()
+        self.workers[pid] = time.monotonic()
+        logger.info(f"워커 시작: pid={pid}")
+        return pid
+
+    def _run_worker(self):
+        """워커 프로세스 본체 (반환하지 않음)"""
+        exit_code = 0
+        try:
+            # 터미널 Ctrl+C는 마스터만 받고, 워커 종료는 마스터가 신호를 한 번 전달
+            os.setpgid(0, 0)
+            # 종료 신호는 uvicorn이 처리, 재시작 신호는 마스터만 처리
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(sig, signal.SIG_DFL)
+
+            config = uvicorn.Config(
+                self.app,
+                loop=settings.prod_loop,
+                http=settings.prod_http,
+                lifespan="on",
+                access_log=settings.prod_access_log,
+                log_level=settings.log_level.lower(),
+                log_config=None,
+                timeout_graceful_shutdown=settings.prod_graceful_timeout_seconds
+            )
+            uvicorn.Server(config).run(sockets=[self.sock])
+        except Exception as e:
+            logger.error(f"워커 실행 오류: {e}")
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def _reap(self):
+        """종료된 워커 회수"""
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.workers.clear()
+                return
+            if pid == 0:
+                return
+
+            started = self.workers.pop(pid, None)
+            if started is not None and not self._stopping:
+                logger.warning(f"워커 비정상 종료: pid={pid}, status={status}")
+                if time.monotonic() - started < 5:
+                    time.sleep(1)  # 시작 직후 죽는 워커가 빠르게 반복 생성되지 않도록 대기
+
+    def _stop_worker(self, pid: int, timeout: float, signal_sent: bool = False):
+        """워커 정상 종료 요청 후 대기 (시간 초과 시 강제 종료)
+
+        uvicorn은 두 번째 종료 신호를 강제 종료로 처리하므로 신호는 한 번만 보냅니다.
+        """
+        if not signal_sent:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self.workers.pop(pid, None)
+                return
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                done, _ = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                done = pid
+            if done == pid:
+                self.workers.pop(pid, None)
+                return
+            time.sleep(0.1)
+
+        logger.warning(f"워커 정상 종료 시간 초과, 강제 종료: pid={pid}")
+        os.kill(pid, signal.SIGKILL)
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass
+        self.workers.pop(pid, None)
+
+    def _rolling_restart(self):
+        """워커를 하나씩 교체 (새 워커가 뜬 뒤 기존 워커 종료)"""
+        old_workers = list(self.workers)
+        logger.info(f"워커 순차 재시작: {len(old_workers)}개")
+        for pid in old_workers:
+            if self._stopping:
+                return
+            self._spawn()
+            time.sleep(settings.prod_restart_stagger_seconds)
+            self._stop_worker(pid, settings.prod_graceful_timeout_seconds + 5)
+
+    def report_memory(self) -> Dict[int, Optional[Dict[str, int]]]:
+        """마스터와 워커별 RSS/공유 메모리 로그"""
+        report = {os.getpid(): read_memory_usage()}
+        logger.info(f"[메모리] master pid={os.getpid()} {_format_usage(report[os.getpid()])}")
+        for pid in sorted(self.workers):
+            report[pid] = read_memory_usage(pid)
+            logger.info(f"[메모리] worker pid={pid} {_format_usage(report[pid])}")
+        return report
+
+    def _on_reload(self, signum, frame):
+        self._reload_requested = True
+
+    def _on_stop(self, signum, frame):
+        self._stopping = True
+
+    def run(self):
+        """워커 실행 및 관리 루프"""
+        signal.signal(signal.SIGHUP, self._on_reload)
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+
+        for _ in range(self.worker_count):
+            self._spawn()
+
+        report_interval = settings.prod_memory_report_interval_seconds
+        next_report = time.monotonic() + min(report_interval, 30) if report_interval else None
+
+        while not self._stopping:
+            self._reap()
+
+            if self._reload_requested:
+                self._reload_requested = False
+                self._rolling_restart()
+
+            while len(self.workers) < self.worker_count and not self._stopping:
+                self._spawn()
+
+            if next_report is not None and time.monotonic() >= next_report:
+                self.report_memory()
+                next_report = time.monotonic() + report_interval
+
+            time.sleep(0.5)
+
+        self.shutdown()
+
+    def shutdown(self):
+        """모든 워커 정상 종료"""
+        logger.info("🛑 모든 워커를 종료합니다...")
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self.workers.pop(pid, None)
+        for pid in list(self.workers):
+            self._stop_worker(pid, settings.prod_graceful_timeout_seconds + 5, signal_sent=True)
+        self.sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="운영 서버 실행 (프리포크 멀티 워커)")
+    parser.add_argument("--host", default=settings.prod_host, help="바인드 주소")
+    parser.add_argument("--port", type=int, default=settings.backend_port, help="포트")
+    parser.add_argument("--workers", type=int, default=settings.prod_workers, help="워커 수 (0이면 CPU 수)")
+    args = parser.parse_args()
+
+    if not hasattr(os, "fork"):
+        print("❌ 운영 모드는 fork를 지원하는 OS(Linux/macOS)에서만 실행할 수 있습니다.")
+        sys.exit(1)
+
+    workers = args.workers
+    if settings.session_store == "memory":
+        # 메모리 세션 저장소는 워커 간에 공유되지 않아, 다른 워커로 간 요청은 세션을 찾지 못함
+        if workers > 1:
+            print(
+                "❌ 메모리 세션 저장소로는 여러 워커를 실행할 수 없습니다. "
+                "SESSION_STORE=sqlite를 사용하거나 --workers 1로 실행하세요."
+            )
+            sys.exit(1)
+        if workers == 0:
+            logger.warning("메모리 세션 저장소를 사용하므로 워커 1개로 실행합니다. (여러 워커는 SESSION_STORE=sqlite)")
+            workers = 1
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and settings.snapshot_enabled:
+        # 워커마다 같은 스냅샷 파일을 덮어쓰지 않도록 단일 워커에서만 사용
+        logger.info("여러 워커로 실행하므로 상태 스냅샷을 사용하지 않습니다.")
+        settings.snapshot_enabled = False
+
+    logger.info("🚀 운영 서버 사전 로드 중...")
+    started = time.monotonic()
+    app = preload()
+    logger.info(f"사전 로드 완료 ({time.monotonic() - started:.1f}초), 워커 {workers}개 시작")
+
+    PreforkMaster(app, workers, args.host, args.port).run()
+
+
+if __name__ == "__main__":
+    main()
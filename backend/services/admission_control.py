@@ -0,0 +1,192 @@
+"""
+요청 수용 제어 - 비싼 엔드포인트(업로드 OCR, 채팅 LLM, 분석)의 동시 실행/대기/요청 빈도 제한
+"""
+
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from config.settings import settings
+
+
+class AdmissionRejected(Exception):
+    """요청을 받지 않음 (429: 세션 요청 빈도 초과, 503: 서버 혼잡)"""
+
+    def __init__(self, status_code: int, retry_after: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.detail = detail
+
+
+@dataclass
+class AdmissionPolicy:
+    """엔드포인트별 제한 (concurrency가 0이면 동시 실행 제한 없음)"""
+    concurrency: int = 0
+    max_queue: int = 0
+    rate_per_minute: float = 0.0
+    burst: int = 1
+
+
+class _ConcurrencyLimiter:
+    """동시 실행 수 제한과 대기열"""
+
+    def __init__(self, limit: int, max_queue: int):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(limit)
+        self._avg_service_seconds = 1.0
+
+    def retry_after(self) -> int:
+        """대기 중인 요청이 빠질 때까지 예상 시간 (초)"""
+        estimate = self._avg_service_seconds * (self.waiting + 1) / max(self.limit, 1)
+        return max(1, min(60, math.ceil(estimate)))
+
+    async def acquire(self, timeout: float) -> bool:
+        """실행 자리 확보 (대기했으면 True), 대기열이 가득 차거나 시간 초과면 AdmissionRejected"""
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+            self.in_flight += 1
+            return False
+
+        if self.waiting >= self.max_queue:
+            raise AdmissionRejected(503, self.retry_after(), "요청이 많아 잠시 후 다시 시도해 주세요.")
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise AdmissionRejected(503, self.retry_after(), "요청이 많아 잠시 후 다시 시도해 주세요.")
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        return True
+
+    def release(self, service_seconds: float):
+        self.in_flight -= 1
+        self._semaphore.release()
+        # 처리 시간 이동 평균 (Retry-After 추정용)
+        self._avg_service_seconds = 0.8 * self._avg_service_seconds + 0.2 * service_seconds
+
+
+class AdmissionController:
+    """엔드포인트별 수용 제어
+
+    - 세션별 토큰 버킷으로 요청 빈도를 제한하고 초과하면 429로 바로 거절합니다.
+    - 동시 실행 수를 넘으면 max_queue개까지 대기시키고, 그 이상이거나
+      queue_timeout 안에 자리가 나지 않으면 503으로 거절합니다.
+    - 거절 응답에는 Retry-After(초)를 붙일 수 있도록 예상 대기 시간을 함께 전달합니다.
+    """
+
+    def __init__(self, policies: Dict[str, AdmissionPolicy], queue_timeout: float = 10.0,
+                 max_buckets: int = 10000):
+        self.policies = policies
+        self.queue_timeout = queue_timeout
+        self.max_buckets = max_buckets
+
+        self._limiters: Dict[str, _ConcurrencyLimiter] = {}
+        self._buckets: "OrderedDict[Tuple[str, str], Tuple[float, float]]" = OrderedDict()  # (tokens, 갱신 시각)
+        self.stats: Dict[str, Dict[str, int]] = {
+            name: {"admitted": 0, "queued": 0, "shed": 0, "rate_limited": 0} for name in policies
+        }
+
+    def _limiter(self, endpoint: str) -> Optional[_ConcurrencyLimiter]:
+        policy = self.policies[endpoint]
+        if policy.concurrency <= 0:
+            return None
+        limiter = self._limiters.get(endpoint)
+        if limiter is None:
+            # 세마포어가 실행 중인 이벤트 루프에 묶이도록 첫 요청 때 생성 (프리포크 워커별)
+            limiter = _ConcurrencyLimiter(policy.concurrency, policy.max_queue)
+            self._limiters[endpoint] = limiter
+        return limiter
+
+    def _take_token(self, endpoint: str, key: str):
+        """세션 토큰 버킷에서 토큰 하나 사용 (부족하면 429)"""
+        policy = self.policies[endpoint]
+        if policy.rate_per_minute <= 0:
+            return
+
+        rate = policy.rate_per_minute / 60.0
+        now = time.monotonic()
+        tokens, updated = self._buckets.get((endpoint, key), (float(policy.burst), now))
+        tokens = min(float(policy.burst), tokens + (now - updated) * rate)
+
+        if tokens < 1.0:
+            self._buckets[(endpoint, key)] = (tokens, now)
+            self.stats[endpoint]["rate_limited"] += 1
+            retry_after = max(1, math.ceil((1.0 - tokens) / rate))
+            raise AdmissionRejected(429, retry_after, "요청이 너무 잦습니다. 잠시 후 다시 시도해 주세요.")
+
+        self._buckets[(endpoint, key)] = (tokens - 1.0, now)
+        self._buckets.move_to_end((endpoint, key))
+        while len(self._buckets) > self.max_buckets:
+            self._buckets.popitem(last=False)
+
+    async def admit(self, endpoint: str, key: Optional[str]) -> Optional[float]:
+        """요청 수용 (반환값은 release에 넘길 시작 시각, key가 None이면 빈도 제한 없음)"""
+        if key is not None:
+            self._take_token(endpoint, key)
+
+        limiter = self._limiter(endpoint)
+        if limiter is not None:
+            try:
+                if await limiter.acquire(self.queue_timeout):
+                    self.stats[endpoint]["queued"] += 1
+            except AdmissionRejected:
+                self.stats[endpoint]["shed"] += 1
+                raise
+
+        self.stats[endpoint]["admitted"] += 1
+        return time.monotonic()
+
+    def release(self, endpoint: str, started: Optional[float]):
+        """요청 처리 끝 (실행 자리 반환)"""
+        limiter = self._limiters.get(endpoint)
+        if limiter is not None and started is not None:
+            limiter.release(time.monotonic() - started)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """엔드포인트별 수용/대기/거절 수와 현재 실행·대기 중인 요청 수"""
+        metrics: Dict[str, Any] = {}
+        for endpoint, policy in self.policies.items():
+            limiter = self._limiters.get(endpoint)
+            metrics[endpoint] = {
+                **self.stats[endpoint],
+                "in_flight": limiter.in_flight if limiter else 0,
+                "waiting": limiter.waiting if limiter else 0,
+                "concurrency": policy.concurrency,
+                "max_queue": policy.max_queue
+            }
+        metrics["tracked_sessions"] = len(self._buckets)
+        return metrics
+
+
+# 전역 수용 제어 인스턴스
+admission_controller = AdmissionController(
+    policies={
+        "upload": AdmissionPolicy(
+            concurrency=settings.admission_upload_concurrency,
+            max_queue=settings.admission_upload_queue,
+            rate_per_minute=settings.admission_upload_rate_per_minute,
+            burst=settings.admission_burst
+        ),
+        "chat": AdmissionPolicy(
+            concurrency=settings.admission_chat_concurrency,
+            max_queue=settings.admission_chat_queue,
+            rate_per_minute=settings.admission_chat_rate_per_minute,
+            burst=settings.admission_burst
+        ),
+        # 분석은 작업 큐가 동시 실행 수와 대기열을 제한하므로 요청 빈도만 제한
+        "analyze": AdmissionPolicy(
+            rate_per_minute=settings.admission_analyze_rate_per_minute,
+            burst=settings.admission_burst
+        )
+    },
+    queue_timeout=settings.admission_queue_timeout_seconds
+)
@@ -0,0 +1,209 @@
+"""
+분석 진행 이벤트 - 제품 분석 단계별 진행 상황을 구독자에게 전달
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+
+# 분석 단계 -> 진행률 (%)
+STAGE_PROGRESS = {
+    "queued": 0,
+    "decode": 5,
+    "ocr": 20,
+    "search": 45,
+    "vision": 65,
+    "guide": 85,
+    "completed": 100,
+    "failed": 100
+}
+
+TERMINAL_STAGES = ("completed", "failed")
+
+# 현재 실행 중인 분석의 세션 ID (분석 코드 깊은 곳에서 report()로 단계를 알리기 위함)
+_current_session: ContextVar[Optional[str]] = ContextVar("analysis_session", default=None)
+
+
+class AnalysisEventBroker:
+    """세션별 분석 이벤트 발행/구독
+
+    - 분석 1회(run)의 이벤트를 세션별로 보관하여 늦게 연결한 구독자도 처음부터 받습니다.
+    - 이벤트 seq는 프로세스 전체에서 증가하므로 Last-Event-ID로 이어받을 수 있습니다.
+    - 이벤트는 이 프로세스에서 실행된 분석만 보이므로, 다른 워커의 분석은
+      호출자가 세션/작업 상태로 완료 여부를 확인해야 합니다.
+    """
+
+    def __init__(self, max_sessions: int = 1000):
+        self.max_sessions = max_sessions
+        self._events: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._subscribers: Dict[str, List[Tuple[asyncio.Queue, asyncio.AbstractEventLoop]]] = {}
+        self._waiters: Dict[str, List[Tuple[asyncio.Event, asyncio.AbstractEventLoop]]] = {}
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def make_event(self, session_id: str, stage: str, message: str = "", **extra: Any) -> Dict[str, Any]:
+        """이벤트 생성 (보관/전달하지 않음)"""
+        return {
+            "seq": next(self._seq),
+            "session_id": session_id,
+            "stage": stage,
+            "progress": STAGE_PROGRESS.get(stage, 0),
+            "message": message,
+            "timestamp": datetime.now().isoformat(),
+            **extra
+        }
+
+    def publish(self, session_id: str, stage: str, message: str = "", **extra: Any) -> Dict[str, Any]:
+        """이벤트 발행 (스레드에서 호출해도 됨)"""
+        event = self.make_event(session_id, stage, message, **extra)
+        with self._lock:
+            history = self._events.get(session_id)
+            if stage == "queued" or not history or history[-1]["stage"] in TERMINAL_STAGES:
+                # 새 분석 시작: 이전 분석의 이벤트는 버림
+                self._events[session_id] = []
+            self._events[session_id].append(event)
+            self._events.move_to_end(session_id)
+            while len(self._events) > self.max_sessions:
+                self._events.popitem(last=False)
+            subscribers = list(self._subscribers.get(session_id, ()))
+            waiters = list(self._waiters.get(session_id, ())) if stage in TERMINAL_STAGES else []
+
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                pass  # 구독자의 이벤트 루프가 이미 종료됨
+        for waiter, loop in waiters:
+            try:
+                loop.call_soon_threadsafe(waiter.set)
+            except RuntimeError:
+                pass
+        return event
+
+    def report(self, stage: str, message: str = "", **extra: Any):
+        """현재 추적 중인 분석의 단계 알림 (track() 밖에서는 무시)"""
+        session_id = _current_session.get()
+        if session_id is not None:
+            self.publish(session_id, stage, message, **extra)
+
+    @contextmanager
+    def track(self, session_id: str):
+        """이 블록 안에서 실행되는 report()를 session_id의 이벤트로 발행"""
+        token = _current_session.set(session_id)
+        try:
+            yield
+        finally:
+            _current_session.reset(token)
+
+    def finish(self, session_id: str, result: Dict[str, Any]):
+        """분석 결과에 따라 완료/실패 이벤트 발행"""
+        if result.get("success"):
+            data = result.get("data", {})
+            self.publish(
+                session_id, "completed", "제품 분석이 완료되었습니다.",
+                is_appliance=data.get("is_appliance", True)
+            )
+        else:
+            self.publish(session_id, "failed", result.get("error", "제품 분석에 실패했습니다."))
+
+    def get_events(self, session_id: str, after: int = 0) -> List[Dict[str, Any]]:
+        """보관 중인 최근 분석 이벤트 (seq가 after보다 큰 것)"""
+        with self._lock:
+            return [event for event in self._events.get(session_id, ()) if event["seq"] > after]
+
+    async def subscribe(self, session_id: str, after: int = 0,
+                        heartbeat_seconds: float = 15.0) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """이벤트 구독
+
+        보관된 이벤트를 먼저 보낸 뒤 새 이벤트를 기다립니다.
+        heartbeat_seconds 동안 이벤트가 없으면 None을 보내 호출자가 연결 유지/상태 확인을 하게 하고,
+        완료/실패 이벤트를 보낸 뒤 끝납니다.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        subscriber = (queue, asyncio.get_running_loop())
+        with self._lock:
+            backlog = [event for event in self._events.get(session_id, ()) if event["seq"] > after]
+            self._subscribers.setdefault(session_id, []).append(subscriber)
+
+        try:
+            last_seq = after
+            for event in backlog:
+                last_seq = event["seq"]
+                yield event
+                if event["stage"] in TERMINAL_STAGES:
+                    return
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if event["seq"] <= last_seq:
+                    continue
+                last_seq = event["seq"]
+                yield event
+                if event["stage"] in TERMINAL_STAGES:
+                    return
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(session_id, [])
+                if subscriber in subscribers:
+                    subscribers.remove(subscriber)
+                if not subscribers:
+                    self._subscribers.pop(session_id, None)
+
+    async def wait_finished(self, session_id: str, timeout: float, is_done: Callable[[], bool],
+                            recheck_seconds: float = 5.0) -> bool:
+        """분석이 끝날 때까지 대기 (끝났으면 True, 시간 초과면 False)
+
+        완료/실패 이벤트가 발행되면 바로 깨어납니다. 다른 워커에서 실행된 분석은
+        이벤트가 오지 않으므로 recheck_seconds마다 is_done()으로 확인합니다.
+        """
+        waiter = asyncio.Event()
+        entry = (waiter, asyncio.get_running_loop())
+        with self._lock:
+            self._waiters.setdefault(session_id, []).append(entry)
+
+        try:
+            # 등록 후 확인해야 확인과 대기 사이에 끝난 분석을 놓치지 않음
+            if is_done():
+                return True
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                try:
+                    await asyncio.wait_for(waiter.wait(), timeout=min(remaining, recheck_seconds))
+                    return True
+                except asyncio.TimeoutError:
+                    if is_done():
+                        return True
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(session_id, [])
+                if entry in waiters:
+                    waiters.remove(entry)
+                if not waiters:
+                    self._waiters.pop(session_id, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        """보관 중인 세션 수와 구독자/대기자 수"""
+        with self._lock:
+            return {
+                "sessions": len(self._events),
+                "subscribers": sum(len(subscribers) for subscribers in self._subscribers.values()),
+                "waiters": sum(len(waiters) for waiters in self._waiters.values())
+            }
+
+
+# 전역 분석 이벤트 인스턴스
+analysis_events = AnalysisEventBroker()
@@ -0,0 +1,275 @@
+"""
+헤드리스 브라우저 풀 - 미리 띄워 둔 Selenium WebDriver 재사용
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional, Set
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import WebDriverException
+from webdriver_manager.chrome import ChromeDriverManager
+
+from config.settings import settings
+from utils.logger import logger
+
+
+class BrowserUnavailableError(Exception):
+    """브라우저를 사용할 수 없음 (드라이버 생성 실패 또는 대기 시간 초과)"""
+    pass
+
+
+class PooledDriver:
+    """풀에서 대여한 WebDriver"""
+
+    def __init__(self, driver: Any):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.time()
+        self.broken = False  # 사용 중 오류가 나면 True로 표시 → 반납 시 폐기
+        self.pending: Optional[asyncio.Future] = None  # run()으로 스레드에서 실행 중인 작업
+
+
+class BrowserPool:
+    """헤드리스 Chrome WebDriver 풀
+
+    - 동시에 대여할 수 있는 드라이버 수를 size로 제한합니다.
+    - 반납된 드라이버는 about:blank로 초기화하여 재사용하고, 초기화에 실패하면 폐기합니다.
+    - 드라이버 하나가 max_pages 페이지를 처리하면 새 드라이버로 교체합니다.
+    - ChromeDriverManager().install()은 프로세스당 한 번만 실행합니다.
+    - Selenium 호출은 모두 스레드에서 실행하여 이벤트 루프를 막지 않습니다.
+    - WebDriver는 스레드 안전하지 않으므로, 대여자가 취소되면 드라이버를 재사용하지 않고
+      스레드 작업이 끝난 뒤 종료합니다. 그때까지 대여 자리도 반환하지 않습니다.
+      드라이버를 생성하는 도중 취소되어도 생성이 끝나면 새 드라이버를 종료합니다.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_pages: int = 50,
+        checkout_timeout: float = 15.0,
+        page_load_timeout: float = 10.0,
+        driver_factory: Optional[Callable[[], Any]] = None
+    ):
+        self.size = size
+        self.max_pages = max_pages
+        self.checkout_timeout = checkout_timeout
+        self.page_load_timeout = page_load_timeout
+        self._driver_factory = driver_factory or self._create_chrome_driver
+
+        self._idle: Deque[PooledDriver] = deque()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._driver_path: Optional[str] = None
+        self._install_lock = threading.Lock()
+        self._closed = False
+        self._in_use = 0
+        self._abandoned: Set[asyncio.Task] = set()  # 취소된 대여의 드라이버 종료 작업
+
+        self.stats = {"created": 0, "reused": 0, "recycled": 0, "discarded": 0, "checkout_timeouts": 0}
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """대여 수 제한 세마포어 (이벤트 루프 안에서 지연 생성)"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.size)
+        return self._semaphore
+
+    def _get_driver_path(self) -> str:
+        """ChromeDriver 경로 (설치는 최초 1회만)"""
+        with self._install_lock:
+            if self._driver_path is None:
+                self._driver_path = ChromeDriverManager().install()
+            return self._driver_path
+
+    def _create_chrome_driver(self) -> Any:
+        """헤드리스 Chrome WebDriver 생성"""
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")  # 헤드리스 모드
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
+
+        driver = webdriver.Chrome(service=Service(self._get_driver_path()), options=chrome_options)
+        driver.set_page_load_timeout(self.page_load_timeout)
+        return driver
+
+    def _new_driver(self) -> PooledDriver:
+        """새 드라이버 생성 (스레드에서 호출)"""
+        try:
+            driver = self._driver_factory()
+        except Exception as e:
+            raise BrowserUnavailableError(f"WebDriver 초기화 실패: {e}") from e
+        self.stats["created"] += 1
+        logger.info(f"WebDriver 생성 (풀 크기 {self.size})")
+        return PooledDriver(driver)
+
+    @staticmethod
+    def _reset_driver(pooled: PooledDriver) -> bool:
+        """재사용 전 초기화 겸 상태 확인 (스레드에서 호출)"""
+        try:
+            pooled.driver.delete_all_cookies()
+            pooled.driver.get("about:blank")
+            return True
+        except WebDriverException:
+            return False
+
+    @staticmethod
+    def _quit_driver(pooled: PooledDriver):
+        """드라이버 종료 (스레드에서 호출)"""
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.warning(f"WebDriver 종료 실패: {e}")
+
+    async def run(self, pooled: PooledDriver, func: Callable[..., Any], *args: Any) -> Any:
+        """대여한 드라이버로 func(driver, *args)를 스레드에서 실행
+
+        호출자가 취소되어도 스레드는 멈추지 않으므로, 스레드 작업을 pending으로 남겨
+        반납 시 끝날 때까지 드라이버를 건드리지 않게 합니다.
+        """
+        pooled.pending = asyncio.ensure_future(asyncio.to_thread(func, pooled.driver, *args))
+        try:
+            return await asyncio.shield(pooled.pending)
+        except asyncio.CancelledError:
+            pooled.broken = True
+            raise
+
+    @asynccontextmanager
+    async def checkout(self) -> AsyncIterator[PooledDriver]:
+        """드라이버 대여
+
+        사용 예:
+            async with browser_pool.checkout() as lease:
+                await browser_pool.run(lease, scrape, url)
+        """
+        if self._closed:
+            raise BrowserUnavailableError("브라우저 풀이 종료되었습니다.")
+
+        semaphore = self._get_semaphore()
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=self.checkout_timeout)
+        except asyncio.TimeoutError:
+            self.stats["checkout_timeouts"] += 1
+            raise BrowserUnavailableError("사용 가능한 브라우저가 없습니다 (대기 시간 초과).")
+
+        pooled: Optional[PooledDriver] = None
+        handed_off = False
+        self._in_use += 1
+        try:
+            if self._idle:
+                pooled = self._idle.pop()  # 가장 최근에 쓴 드라이버 우선
+                self.stats["reused"] += 1
+            else:
+                # 취소되어도 생성 스레드는 멈추지 않으므로 shield로 기다렸다가 결과를 정리
+                creating = asyncio.ensure_future(asyncio.to_thread(self._new_driver))
+                try:
+                    pooled = await asyncio.shield(creating)
+                except asyncio.CancelledError:
+                    handed_off = True
+                    self._hand_off(self._discard_when_created(creating, semaphore))
+                    raise
+
+            try:
+                yield pooled
+            except (WebDriverException, asyncio.CancelledError):
+                pooled.broken = True
+                raise
+            finally:
+                pooled.pages += 1
+                if pooled.pending is not None and not pooled.pending.done():
+                    # 스레드가 아직 드라이버를 사용 중: 끝난 뒤 종료하고 대여 자리 반환
+                    handed_off = True
+                    self._hand_off(self._discard_when_done(pooled, semaphore))
+                else:
+                    await self._release(pooled)
+        finally:
+            if not handed_off:
+                self._in_use -= 1
+                semaphore.release()
+
+    def _hand_off(self, coro):
+        """취소된 대여의 뒷정리 작업 실행 (close()에서 끝날 때까지 기다림)"""
+        task = asyncio.ensure_future(coro)
+        self._abandoned.add(task)
+        task.add_done_callback(self._abandoned.discard)
+
+    async def _discard_when_created(self, creating: asyncio.Future, semaphore: asyncio.Semaphore):
+        """드라이버 생성 중 취소된 대여: 생성이 끝나면 새 드라이버 종료"""
+        try:
+            await asyncio.wait([creating])
+            if not creating.cancelled() and creating.exception() is None:
+                self.stats["discarded"] += 1
+                await asyncio.to_thread(self._quit_driver, creating.result())
+        finally:
+            self._in_use -= 1
+            semaphore.release()
+
+    async def _discard_when_done(self, pooled: PooledDriver, semaphore: asyncio.Semaphore):
+        """취소된 대여의 스레드 작업이 끝나면 드라이버 종료"""
+        try:
+            await asyncio.wait([pooled.pending])
+            self.stats["discarded"] += 1
+            await asyncio.to_thread(self._quit_driver, pooled)
+        finally:
+            self._in_use -= 1
+            semaphore.release()
+
+    async def _release(self, pooled: PooledDriver):
+        """드라이버 반납 (교체 대상이면 종료)"""
+        if self._closed or pooled.broken:
+            self.stats["discarded"] += 1
+            await asyncio.to_thread(self._quit_driver, pooled)
+            return
+
+        if pooled.pages >= self.max_pages:
+            self.stats["recycled"] += 1
+            await asyncio.to_thread(self._quit_driver, pooled)
+            return
+
+        if await asyncio.to_thread(self._reset_driver, pooled):
+            self._idle.append(pooled)
+        else:
+            self.stats["discarded"] += 1
+            await asyncio.to_thread(self._quit_driver, pooled)
+
+    async def warm_up(self, count: Optional[int] = None):
+        """드라이버를 미리 생성하여 첫 검색 지연을 줄임"""
+        for _ in range(min(count or self.size, self.size) - len(self._idle)):
+            try:
+                self._idle.append(await asyncio.to_thread(self._new_driver))
+            except BrowserUnavailableError as e:
+                logger.warning(f"브라우저 풀 예열 실패: {e}")
+                break
+
+    async def close(self):
+        """유휴 드라이버 모두 종료 (대여 중인 드라이버는 반납 시 종료)"""
+        self._closed = True
+        while self._idle:
+            await asyncio.to_thread(self._quit_driver, self._idle.pop())
+        if self._abandoned:
+            await asyncio.wait(list(self._abandoned), timeout=self.page_load_timeout)
+        logger.info("브라우저 풀 종료 완료")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """풀 통계"""
+        return {
+            **self.stats,
+            "size": self.size,
+            "idle": len(self._idle),
+            "in_use": self._in_use
+        }
+
+
+# 전역 브라우저 풀 인스턴스
+browser_pool = BrowserPool(
+    size=settings.browser_pool_size,
+    max_pages=settings.browser_max_pages_per_driver,
+    checkout_timeout=settings.browser_checkout_timeout_seconds,
+    page_load_timeout=settings.browser_page_load_timeout_seconds
+)
@@ -0,0 +1,448 @@
+"""
+채팅 히스토리 저장소 - 세션별 추가 전용 메시지 로그
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import settings
+
+
+ROLES = ("user", "assistant")
+
+
+class ChatLog:
+    """한 세션의 채팅 로그
+
+    메시지 ID는 1부터 단조 증가하며, 메모리에는 최근 메시지만 배열로 보관합니다.
+    - _roles: 역할 코드 (bytearray)
+    - _times: 작성 시각 timestamp (array('d'))
+    - _texts: 메시지 본문
+
+    메모리 보관 수가 max_in_memory를 넘으면 오래된 절반을 JSONL 파일로 내보내고
+    줄별 파일 오프셋만 남겨 커서 조회 시 해당 위치부터 읽습니다.
+    """
+
+    def __init__(self, spill_path: Path, max_in_memory: int = 0):
+        self.spill_path = spill_path
+        self.max_in_memory = max_in_memory
+        self.lock = threading.Lock()
+
+        self._roles = bytearray()
+        self._times = array("d")
+        self._texts: List[str] = []
+        # 메모리에 있는 첫 메시지의 ID - 1 (= 파일로 내보낸 메시지 수)
+        self._spilled = 0
+        self._spill_offsets = array("q")
+
+        self.role_counts = [0] * len(ROLES)
+        self.first_at: Optional[float] = None
+        self.last_at: Optional[float] = None
+
+    @property
+    def last_id(self) -> int:
+        return self._spilled + len(self._texts)
+
+    @property
+    def spilled(self) -> int:
+        return self._spilled
+
+    def append(self, role: str, message: str, timestamp: float) -> Dict[str, Any]:
+        """메시지 추가 (호출자가 self.lock을 보유해야 함)"""
+        role_code = ROLES.index(role)
+        self._roles.append(role_code)
+        self._times.append(timestamp)
+        self._texts.append(message)
+
+        self.role_counts[role_code] += 1
+        if self.first_at is None:
+            self.first_at = timestamp
+        self.last_at = timestamp
+
+        message_id = self.last_id
+        if self.max_in_memory and len(self._texts) > self.max_in_memory:
+            self._spill(len(self._texts) // 2)
+        return self._format(message_id, role_code, message, timestamp)
+
+    @staticmethod
+    def _format(message_id: int, role_code: int, message: str, timestamp: float) -> Dict[str, Any]:
+        return {
+            "id": message_id,
+            "role": ROLES[role_code],
+            "message": message,
+            "timestamp": datetime.fromtimestamp(timestamp).isoformat()
+        }
+
+    def _spill(self, count: int):
+        """오래된 메시지 count개를 JSONL 파일로 내보냄"""
+        self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.spill_path, "ab") as f:
+            offset = f.tell()
+            for index in range(count):
+                line = json.dumps(
+                    {"r": self._roles[index], "t": self._times[index], "m": self._texts[index]},
+                    ensure_ascii=False
+                ).encode("utf-8") + b"\n"
+                self._spill_offsets.append(offset)
+                f.write(line)
+                offset += len(line)
+
+        del self._roles[:count]
+        del self._times[:count]
+        del self._texts[:count]
+        self._spilled += count
+
+    def _read_spilled(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        """파일로 내보낸 메시지 중 [start, stop) 위치 읽기"""
+        messages = []
+        with open(self.spill_path, "rb") as f:
+            f.seek(self._spill_offsets[start])
+            for index in range(start, stop):
+                item = json.loads(f.readline())
+                messages.append(self._format(index + 1, item["r"], item["m"], item["t"]))
+        return messages
+
+    def slice(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        """메시지 위치 [start, stop) 반환 (위치 = ID - 1)"""
+        start, stop = max(start, 0), min(stop, self.last_id)
+        if start >= stop:
+            return []
+
+        messages = []
+        if start < self._spilled:
+            messages.extend(self._read_spilled(start, min(stop, self._spilled)))
+            start = self._spilled
+        for position in range(start - self._spilled, stop - self._spilled):
+            messages.append(self._format(
+                self._spilled + position + 1,
+                self._roles[position],
+                self._texts[position],
+                self._times[position]
+            ))
+        return messages
+
+    def to_state(self) -> Dict[str, Any]:
+        """스냅샷 저장용 상태 (호출자가 self.lock을 보유해야 함)"""
+        return {
+            "spill_path": str(self.spill_path),
+            "roles": bytes(self._roles),
+            "times": self._times.tobytes(),
+            "texts": list(self._texts),
+            "spilled": self._spilled,
+            "spill_offsets": self._spill_offsets.tobytes(),
+            "role_counts": list(self.role_counts),
+            "first_at": self.first_at,
+            "last_at": self.last_at
+        }
+
+    @classmethod
+    def from_state(cls, spill_path: Path, max_in_memory: int, state: Dict[str, Any]) -> "ChatLog":
+        """스냅샷 상태에서 복원"""
+        # 내보낸 메시지는 스냅샷을 만든 프로세스의 파일에 있음
+        log = cls(Path(state.get("spill_path") or spill_path), max_in_memory)
+        log._roles = bytearray(state["roles"])
+        log._times.frombytes(state["times"])
+        log._texts = list(state["texts"])
+        log._spilled = state["spilled"]
+        log._spill_offsets.frombytes(state["spill_offsets"])
+        log.role_counts = list(state["role_counts"])
+        log.first_at = state["first_at"]
+        log.last_at = state["last_at"]
+        return log
+
+    def discard(self):
+        """내보낸 파일 삭제"""
+        if self._spilled:
+            try:
+                os.remove(self.spill_path)
+            except FileNotFoundError:
+                pass
+
+
+class ChatHistoryStore:
+    """세션별 채팅 로그 저장소
+
+    메시지 추가는 O(1)이고, 히스토리 조회는 메시지 ID 커서(after)로 필요한 부분만 읽으며,
+    통계는 추가할 때 갱신한 카운터로 바로 반환합니다.
+    메모리 세션 저장소와 마찬가지로 워커 프로세스 메모리에 보관하며, 재시작 전 스냅샷을
+    연결하면(attach_snapshot) 세션 로그를 처음 사용할 때 하나씩 복원합니다.
+    내보내기 파일은 프로세스별로 따로 만들어 다른 프로세스와 섞이지 않게 합니다.
+    """
+
+    def __init__(self, spill_dir: str, max_in_memory: int = 0):
+        self.spill_dir = Path(spill_dir)
+        self.max_in_memory = max_in_memory
+        self._logs: Dict[str, ChatLog] = {}
+        self._lock = threading.Lock()
+        # 재시작 전 채팅 로그 스냅샷 (utils.session_snapshot.SnapshotReader)
+        self._snapshot = None
+
+    def _get_log(self, session_id: str, create: bool = False) -> Optional[ChatLog]:
+        log = self._logs.get(session_id)
+        if log is None and (create or self._snapshot is not None):
+            with self._lock:
+                log = self._logs.get(session_id)
+                if log is None:
+                    spill_path = self.spill_dir / f"{session_id}.{os.getpid()}.jsonl"
+                    state = self._snapshot.get(session_id) if self._snapshot is not None else None
+                    if state is not None:
+                        self._snapshot.consume(session_id)
+                        log = ChatLog.from_state(spill_path, self.max_in_memory, state)
+                    elif create:
+                        log = ChatLog(spill_path, self.max_in_memory)
+                    if log is not None:
+                        self._logs[session_id] = log
+        return log
+
+    def attach_snapshot(self, reader) -> int:
+        """재시작 전 스냅샷 연결"""
+        self._snapshot = reader
+        return reader.remaining
+
+    def iter_states(self):
+        """(세션 ID, 로그 상태) 목록 (스냅샷 저장용)"""
+        with self._lock:
+            logs = list(self._logs.items())
+        for session_id, log in logs:
+            with log.lock:
+                yield session_id, log.to_state()
+
+    @property
+    def snapshot(self):
+        """연결된 스냅샷 (복원되지 않은 로그는 다음 스냅샷에 그대로 옮김)"""
+        return self._snapshot
+
+    def append(self, session_id: str, role: str, message: str, timestamp: Optional[float] = None) -> Dict[str, Any]:
+        """메시지 추가 후 ID가 붙은 메시지 반환"""
+        log = self._get_log(session_id, create=True)
+        with log.lock:
+            return log.append(role, message, timestamp or datetime.now().timestamp())
+
+    def get_page(
+        self,
+        session_id: str,
+        after: Optional[int] = None,
+        limit: int = 50
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """메시지 조회와 전체 메시지 수 반환
+
+        after를 주면 그 ID 다음 메시지부터 limit개, 없으면 최근 limit개를 반환합니다.
+        """
+        log = self._get_log(session_id)
+        if log is None:
+            return [], 0
+
+        with log.lock:
+            total = log.last_id
+            if after is None:
+                return log.slice(total - limit, total), total
+            return log.slice(after, after + limit), total
+
+    def recent(self, session_id: str, limit: int) -> List[Dict[str, Any]]:
+        """최근 limit개 메시지"""
+        return self.get_page(session_id, limit=limit)[0]
+
+    def get_stats(self, session_id: str) -> Dict[str, Any]:
+        """채팅 통계 (메시지를 훑지 않고 카운터에서 계산)"""
+        log = self._get_log(session_id)
+        if log is None:
+            return {
+                "total_messages": 0,
+                "user_messages": 0,
+                "ai_messages": 0,
+                "last_message_id": 0,
+                "first_chat_at": None,
+                "last_chat_at": None
+            }
+
+        with log.lock:
+            return {
+                "total_messages": log.last_id,
+                "user_messages": log.role_counts[ROLES.index("user")],
+                "ai_messages": log.role_counts[ROLES.index("assistant")],
+                "last_message_id": log.last_id,
+                "first_chat_at": datetime.fromtimestamp(log.first_at).isoformat() if log.first_at else None,
+                "last_chat_at": datetime.fromtimestamp(log.last_at).isoformat() if log.last_at else None
+            }
+
+    def count(self, session_id: str) -> int:
+        """세션의 메시지 수"""
+        log = self._get_log(session_id)
+        return log.last_id if log is not None else 0
+
+    def drop(self, session_id: str):
+        """세션 로그 삭제 (히스토리 초기화, 세션 삭제/만료 시)"""
+        self._get_log(session_id)  # 스냅샷에만 있는 로그도 복원 후 삭제
+        with self._lock:
+            log = self._logs.pop(session_id, None)
+        if log is not None:
+            with log.lock:
+                log.discard()
+
+    def get_summary(self) -> Dict[str, Any]:
+        """저장소 전체 요약"""
+        with self._lock:
+            logs = list(self._logs.values())
+        return {
+            "sessions": len(logs),
+            "messages": sum(log.last_id for log in logs),
+            "spilled_messages": sum(log.spilled for log in logs)
+        }
+
+
+class SQLiteChatHistoryStore:
+    """SQLite(WAL) 기반 채팅 로그 저장소 (여러 워커 프로세스에서 공유)
+
+    SQLite 세션 저장소와 같은 파일의 chat_messages 테이블에 세션별 메시지 ID 순으로 저장하며,
+    ChatHistoryStore와 같은 메서드를 제공합니다. 조회와 통계는 (session_id, message_id)
+    기본 키 범위만 읽습니다. 이미 디스크에 있으므로 상태 스냅샷 대상이 아닙니다.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized_pid: Optional[int] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """스레드별 연결 반환 (포크 이후에는 새로 연결)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and getattr(self._local, "pid", None) == os.getpid():
+            return conn
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+
+        with self._init_lock:
+            if self._initialized_pid != os.getpid():
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS chat_messages ("
+                    "session_id TEXT NOT NULL, message_id INTEGER NOT NULL, role INTEGER NOT NULL, "
+                    "created_at REAL NOT NULL, message TEXT NOT NULL, "
+                    "PRIMARY KEY (session_id, message_id)) WITHOUT ROWID"
+                )
+                self._initialized_pid = os.getpid()
+
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _format(row: Tuple[int, int, float, str]) -> Dict[str, Any]:
+        return ChatLog._format(row[0], row[1], row[3], row[2])
+
+    def append(self, session_id: str, role: str, message: str, timestamp: Optional[float] = None) -> Dict[str, Any]:
+        """메시지 추가 후 ID가 붙은 메시지 반환"""
+        role_code = ROLES.index(role)
+        timestamp = timestamp or datetime.now().timestamp()
+        conn = self._connect()
+
+        # 쓰기 잠금을 먼저 잡아 다른 워커와 같은 ID를 쓰지 않게 함
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            message_id = conn.execute(
+                "SELECT COALESCE(MAX(message_id), 0) + 1 FROM chat_messages WHERE session_id = ?",
+                (session_id,)
+            ).fetchone()[0]
+            conn.execute(
+                "INSERT INTO chat_messages (session_id, message_id, role, created_at, message) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (session_id, message_id, role_code, timestamp, message)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return ChatLog._format(message_id, role_code, message, timestamp)
+
+    def get_page(
+        self,
+        session_id: str,
+        after: Optional[int] = None,
+        limit: int = 50
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """메시지 조회와 전체 메시지 수 반환
+
+        after를 주면 그 ID 다음 메시지부터 limit개, 없으면 최근 limit개를 반환합니다.
+        """
+        conn = self._connect()
+        total = self.count(session_id)
+        if after is None:
+            rows = conn.execute(
+                "SELECT message_id, role, created_at, message FROM chat_messages "
+                "WHERE session_id = ? ORDER BY message_id DESC LIMIT ?",
+                (session_id, limit)
+            ).fetchall()
+            rows.reverse()
+        else:
+            rows = conn.execute(
+                "SELECT message_id, role, created_at, message FROM chat_messages "
+                "WHERE session_id = ? AND message_id > ? ORDER BY message_id LIMIT ?",
+                (session_id, after, limit)
+            ).fetchall()
+        return [self._format(row) for row in rows], total
+
+    def recent(self, session_id: str, limit: int) -> List[Dict[str, Any]]:
+        """최근 limit개 메시지"""
+        return self.get_page(session_id, limit=limit)[0]
+
+    def get_stats(self, session_id: str) -> Dict[str, Any]:
+        """채팅 통계"""
+        row = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(role = 0), 0), COALESCE(SUM(role = 1), 0), "
+            "COALESCE(MAX(message_id), 0), MIN(created_at), MAX(created_at) "
+            "FROM chat_messages WHERE session_id = ?",
+            (session_id,)
+        ).fetchone()
+        return {
+            "total_messages": row[0],
+            "user_messages": row[1],
+            "ai_messages": row[2],
+            "last_message_id": row[3],
+            "first_chat_at": datetime.fromtimestamp(row[4]).isoformat() if row[4] else None,
+            "last_chat_at": datetime.fromtimestamp(row[5]).isoformat() if row[5] else None
+        }
+
+    def count(self, session_id: str) -> int:
+        """세션의 메시지 수 (메시지 ID는 1부터 연속)"""
+        row = self._connect().execute(
+            "SELECT COALESCE(MAX(message_id), 0) FROM chat_messages WHERE session_id = ?",
+            (session_id,)
+        ).fetchone()
+        return row[0]
+
+    def drop(self, session_id: str):
+        """세션 로그 삭제 (히스토리 초기화, 세션 삭제/만료 시)"""
+        self._connect().execute("DELETE FROM chat_messages WHERE session_id = ?", (session_id,))
+
+    def get_summary(self) -> Dict[str, Any]:
+        """저장소 전체 요약"""
+        row = self._connect().execute(
+            "SELECT COUNT(DISTINCT session_id), COUNT(*) FROM chat_messages"
+        ).fetchone()
+        return {"sessions": row[0], "messages": row[1], "spilled_messages": 0}
+
+
+def create_chat_history_store(store_type: Optional[str] = None):
+    """세션 저장소 설정에 맞는 채팅 로그 저장소 생성 (sqlite면 워커 간 공유)"""
+    store_type = (store_type or settings.session_store).lower()
+
+    if store_type == "sqlite":
+        return SQLiteChatHistoryStore(settings.session_db_path)
+    return ChatHistoryStore(
+        spill_dir=settings.chat_history_spill_dir,
+        max_in_memory=settings.chat_history_max_in_memory
+    )
+
+
+# 전역 채팅 히스토리 저장소 인스턴스
+chat_history_store = create_chat_history_store()
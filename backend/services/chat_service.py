@@ -8,6 +8,11 @@ from datetime import datetime
 from core.agent.agent_core import get_agent
 from config.database import memory_db
 from utils.logger import logger
+from .chat_history_store import chat_history_store
+
+
+# AI에 전달할 최근 대화 수
+AGENT_HISTORY_LIMIT = 10
 
 
 class ChatService:
@@ -40,57 +45,37 @@ class ChatService:
                     "timestamp": datetime.now().isoformat()
                 }
             
-            # 현재 채팅 히스토리 가져오기
-            chat_history = session.get("chat_history", [])
+            # 최근 대화 (현재 메시지 제외)
+            recent_history = chat_history_store.recent(session_id, AGENT_HISTORY_LIMIT)
             
-            # 사용자 메시지를 히스토리에 추가
-            user_message = {
-                "role": "user",
-                "message": message,
-                "timestamp": datetime.now().isoformat()
-            }
-            chat_history.append(user_message)
+            # 사용자 메시지를 히스토리에 추가 (AI 응답 실패 시에도 유지)
+            user_message = chat_history_store.append(session_id, "user", message)
             
             # AI Agent와 대화
             response_result = await self.agent.chat_with_user(
                 message=message,
                 product_info=product_info,
                 session_id=session_id,
-                chat_history=chat_history[:-1]  # 현재 메시지 제외한 히스토리
+                chat_history=recent_history
             )
             
             if response_result["success"]:
                 # AI 응답을 히스토리에 추가
-                ai_message = {
-                    "role": "assistant",
-                    "message": response_result["response"],
-                    "timestamp": response_result["timestamp"]
-                }
-                chat_history.append(ai_message)
-                
-                # 세션에 업데이트된 히스토리 저장
-                memory_db.update_session(session_id, {
-                    "chat_history": chat_history,
-                    "last_chat_at": datetime.now().isoformat()
-                })
+                ai_message = chat_history_store.append(session_id, "assistant", response_result["response"])
+                total_messages = ai_message["id"]
                 
-                logger.info(f"채팅 메시지 처리 완료: {len(chat_history)}개 메시지")
+                logger.info(f"채팅 메시지 처리 완료: {total_messages}개 메시지")
                 
                 return {
                     "success": True,
                     "data": {
                         "user_message": user_message,
                         "ai_response": ai_message,
-                        "total_messages": len(chat_history)
+                        "total_messages": total_messages
                     },
                     "timestamp": datetime.now().isoformat()
                 }
             else:
-                # AI 응답 실패 시에도 사용자 메시지는 저장
-                memory_db.update_session(session_id, {
-                    "chat_history": chat_history
-                })
-                
                 logger.error(f"AI 응답 생성 실패: {response_result.get('error', 'Unknown error')}")
                 return {
                     "success": False,
@@ -98,7 +83,7 @@ class ChatService:
                     "user_message": user_message,
                     "timestamp": datetime.now().isoformat()
                 }
-                
+        
         except Exception as e:
             logger.error(f"채팅 서비스 오류: {str(e)}")
             return {
@@ -107,8 +92,51 @@ class ChatService:
                 "timestamp": datetime.now().isoformat()
             }
     
-    def get_chat_history(self, session_id: str, limit: int = 50) -> Dict[str, Any]:
-        """채팅 히스토리 조회"""
+    def build_history_page(self, session_id: str, limit: int = 50, after: Optional[int] = None) -> Dict[str, Any]:
+        """메시지 페이지와 커서 정보 (세션 확인은 호출자가 함)"""
+        
+        # after가 없으면 최근 메시지 limit개, 있으면 그 다음 메시지부터 limit개
+        messages, total_count = chat_history_store.get_page(session_id, after=after, limit=limit)
+        next_after = messages[-1]["id"] if messages else (after or total_count)
+        
+        return {
+            "messages": messages,
+            "total_count": total_count,
+            "returned_count": len(messages),
+            "next_after": next_after,
+            "has_more": next_after < total_count,
+            "last_chat_at": chat_history_store.get_stats(session_id)["last_chat_at"] or ""
+        }
+    
+    def build_chat_status(self, session_id: str, session: Dict[str, Any]) -> Dict[str, Any]:
+        """채팅 상태 (제품 분석 여부와 메시지 수로 판단)"""
+        
+        has_product_info = session.get("product_info") is not None
+        chat_stats = chat_history_store.get_stats(session_id)
+        total_messages = chat_stats["total_messages"]
+        
+        if has_product_info:
+            if total_messages > 0:
+                status = "active"
+                message = "채팅이 활성 상태입니다."
+            else:
+                status = "ready"
+                message = "채팅을 시작할 수 있습니다."
+        else:
+            status = "waiting"
+            message = "제품 분석을 먼저 완료해 주세요."
+        
+        return {
+            "status": status,
+            "message": message,
+            "has_product_info": has_product_info,
+            "total_messages": total_messages,
+            "last_chat_at": chat_stats["last_chat_at"] or "",
+            "session_id": session_id
+        }
+    
+    def get_chat_history(self, session_id: str, limit: int = 50, after: Optional[int] = None) -> Dict[str, Any]:
+        """채팅 히스토리 조회 (after가 있으면 해당 메시지 ID 이후부터)"""
         
         try:
             session = memory_db.get_session(session_id)
@@ -119,23 +147,15 @@ class ChatService:
                     "timestamp": datetime.now().isoformat()
                 }
             
-            chat_history = session.get("chat_history", [])
-            
-            # 최근 메시지부터 limit 개수만큼 반환
-            recent_history = chat_history[-limit:] if len(chat_history) > limit else chat_history
-            
             return {
                 "success": True,
                 "data": {
-                    "messages": recent_history,
-                    "total_count": len(chat_history),
-                    "returned_count": len(recent_history),
-                    "product_info": session.get("product_info", {}),
-                    "last_chat_at": session.get("last_chat_at", "")
+                    **self.build_history_page(session_id, limit, after),
+                    "product_info": session.get("product_info", {})
                 },
                 "timestamp": datetime.now().isoformat()
             }
-            
+        
         except Exception as e:
             logger.error(f"채팅 히스토리 조회 오류: {str(e)}")
             return {
@@ -159,10 +179,7 @@ class ChatService:
                 }
             
             # 채팅 히스토리만 초기화 (제품 정보는 유지)
-            memory_db.update_session(session_id, {
-                "chat_history": [],
-                "last_chat_at": None
-            })
+            chat_history_store.drop(session_id)
             
             logger.info("채팅 히스토리 초기화 완료")
             
@@ -174,7 +191,7 @@ class ChatService:
                 },
                 "timestamp": datetime.now().isoformat()
             }
-            
+        
         except Exception as e:
             logger.error(f"채팅 히스토리 초기화 오류: {str(e)}")
             return {
@@ -183,6 +200,53 @@ class ChatService:
                 "timestamp": datetime.now().isoformat()
             }
     
+    @staticmethod
+    def suggest_questions(product_info: Dict[str, Any]) -> List[str]:
+        """제품 카테고리별 추천 질문"""
+        
+        category = (product_info or {}).get("category", "가전제품")
+        
+        # 제품 카테고리별 추천 질문
+        suggestions_map = {
+            "에어프라이어": [
+                "기본 사용법을 알려주세요",
+                "온도와 시간 설정은 어떻게 하나요?",
+                "청소는 어떻게 해야 하나요?",
+                "어떤 음식을 조리할 수 있나요?",
+                "안전 주의사항이 있나요?"
+            ],
+            "전자레인지": [
+                "기본 사용법을 알려주세요",
+                "출력 조절은 어떻게 하나요?",
+                "청소 방법을 알려주세요",
+                "사용하면 안 되는 용기가 있나요?",
+                "냄새 제거 방법이 있나요?"
+            ],
+            "밥솥": [
+                "밥 짓는 방법을 알려주세요",
+                "물 양은 얼마나 넣어야 하나요?",
+                "청소는 어떻게 해야 하나요?",
+                "예약 취사는 어떻게 하나요?",
+                "다른 요리도 할 수 있나요?"
+            ],
+            "공기청정기": [
+                "기본 사용법을 알려주세요",
+                "필터 교체는 언제 해야 하나요?",
+                "청소 방법을 알려주세요",
+                "효과적인 배치 위치는 어디인가요?",
+                "전력 소비량이 궁금해요"
+            ]
+        }
+        
+        # 해당 카테고리의 추천 질문, 없으면 기본 질문
+        return suggestions_map.get(category, [
+            "기본 사용법을 알려주세요",
+            "청소 방법을 알려주세요",
+            "안전 주의사항이 있나요?",
+            "고장 났을 때 어떻게 해야 하나요?",
+            "효율적인 사용 팁이 있나요?"
+        ])
+    
     def get_suggested_questions(self, session_id: str) -> Dict[str, Any]:
         """제품별 추천 질문 생성"""
         
@@ -195,49 +259,9 @@ class ChatService:
                     "timestamp": datetime.now().isoformat()
                 }
             
-            product_info = session.get("product_info", {})
+            product_info = session.get("product_info") or {}
             category = product_info.get("category", "가전제품")
-            
-            # 제품 카테고리별 추천 질문
-            suggestions_map = {
-                "에어프라이어": [
-                    "기본 사용법을 알려주세요",
-                    "온도와 시간 설정은 어떻게 하나요?",
-                    "청소는 어떻게 해야 하나요?",
-                    "어떤 음식을 조리할 수 있나요?",
-                    "안전 주의사항이 있나요?"
-                ],
-                "전자레인지": [
-                    "기본 사용법을 알려주세요",
-                    "출력 조절은 어떻게 하나요?",
-                    "청소 방법을 알려주세요",
-                    "사용하면 안 되는 용기가 있나요?",
-                    "냄새 제거 방법이 있나요?"
-                ],
-                "밥솥": [
-                    "밥 짓는 방법을 알려주세요",
-                    "물 양은 얼마나 넣어야 하나요?",
-                    "청소는 어떻게 해야 하나요?",
-                    "예약 취사는 어떻게 하나요?",
-                    "다른 요리도 할 수 있나요?"
-                ],
-                "공기청정기": [
-                    "기본 사용법을 알려주세요",
-                    "필터 교체는 언제 해야 하나요?",
-                    "청소 방법을 알려주세요",
-                    "효과적인 배치 위치는 어디인가요?",
-                    "전력 소비량이 궁금해요"
-                ]
-            }
-            
-            # 해당 카테고리의 추천 질문, 없으면 기본 질문
-            suggestions = suggestions_map.get(category, [
-                "기본 사용법을 알려주세요",
-                "청소 방법을 알려주세요",
-                "안전 주의사항이 있나요?",
-                "고장 났을 때 어떻게 해야 하나요?",
-                "효율적인 사용 팁이 있나요?"
-            ])
+            suggestions = self.suggest_questions(product_info)
             
             return {
                 "success": True,
@@ -248,7 +272,7 @@ class ChatService:
                 },
                 "timestamp": datetime.now().isoformat()
             }
-            
+        
         except Exception as e:
             logger.error(f"추천 질문 생성 오류: {str(e)}")
             return {
@@ -269,29 +293,22 @@ class ChatService:
                     "timestamp": datetime.now().isoformat()
                 }
             
-            chat_history = session.get("chat_history", [])
-            
-            # 통계 계산
-            total_messages = len(chat_history)
-            user_messages = len([msg for msg in chat_history if msg["role"] == "user"])
-            ai_messages = len([msg for msg in chat_history if msg["role"] == "assistant"])
-            
-            first_chat = chat_history[0]["timestamp"] if chat_history else None
-            last_chat = session.get("last_chat_at", "")
+            # 메시지 추가 시 갱신한 카운터 사용
+            stats = chat_history_store.get_stats(session_id)
             
             return {
                 "success": True,
                 "data": {
-                    "total_messages": total_messages,
-                    "user_messages": user_messages,
-                    "ai_messages": ai_messages,
-                    "first_chat_at": first_chat,
-                    "last_chat_at": last_chat,
+                    "total_messages": stats["total_messages"],
+                    "user_messages": stats["user_messages"],
+                    "ai_messages": stats["ai_messages"],
+                    "first_chat_at": stats["first_chat_at"],
+                    "last_chat_at": stats["last_chat_at"] or "",
                     "product_info": session.get("product_info", {})
                 },
                 "timestamp": datetime.now().isoformat()
             }
-            
+        
         except Exception as e:
             logger.error(f"채팅 통계 조회 오류: {str(e)}")
             return {
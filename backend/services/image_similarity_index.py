@@ -0,0 +1,255 @@
+"""
+이미지 유사도 인덱스 - 카탈로그 이미지 특징을 행렬로 저장하고 한 번에 비교
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from config.settings import settings
+from utils.logger import logger
+
+
+HIST_BINS = 50 * 60  # ProductSearchService._extract_image_features의 H-S 히스토그램 크기
+SCALAR_COUNT = 4  # 엣지 밀도 1개 + 텍스처 특징 3개
+
+# ProductSearchService._calculate_similarity와 같은 가중치
+WEIGHTS = {"color": 0.5, "edge": 0.3, "texture": 0.2}
+
+
+def _center_normalize(hist: np.ndarray) -> np.ndarray:
+    """평균을 빼고 L2 정규화 (내적 = cv2.HISTCMP_CORREL 상관계수)"""
+    hist = np.asarray(hist, dtype=np.float32).reshape(-1, HIST_BINS)
+    centered = hist - hist.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(centered, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return centered / norms
+
+
+def _scalars(features: Dict[str, Any]) -> np.ndarray:
+    """스칼라 특징 벡터 (엣지 밀도, 텍스처 특징)"""
+    return np.array(
+        [features["edge_density"], *features["texture_features"]],
+        dtype=np.float32
+    )
+
+
+class ImageSimilarityIndex:
+    """카탈로그 이미지 특징 행렬 인덱스
+
+    - hist.npy: (n, 3000) 평균 제거 후 정규화한 색상 히스토그램
+    - scalars.npy: (n, 4) 엣지 밀도와 텍스처 특징
+    - meta.json: 행별 제품 정보
+
+    저장된 행렬은 메모리 맵으로 열고, 업로드 이미지와의 비교는
+    행렬-벡터 곱 한 번으로 모든 항목의 점수를 계산합니다.
+    저장 후 추가된 항목은 별도의 메모리 블록에 쌓아 두고 두 블록을 각각 점수 계산하며,
+    두 블록은 저장할 때만 합칩니다.
+    """
+
+    def __init__(self, root: str, save_every: int = 20):
+        self.root = Path(root)
+        self.save_every = save_every
+        self._lock = threading.RLock()
+
+        self._hist = np.empty((0, HIST_BINS), dtype=np.float32)
+        self._scalars = np.empty((0, SCALAR_COUNT), dtype=np.float32)
+        self._meta: List[Dict[str, Any]] = []
+        self._keys: Dict[str, int] = {}
+
+        # 저장 후 추가된 항목 (용량을 두 배씩 늘리는 블록, 앞의 _pending_count개 행만 유효)
+        self._pending_hist = np.empty((0, HIST_BINS), dtype=np.float32)
+        self._pending_scalars = np.empty((0, SCALAR_COUNT), dtype=np.float32)
+        self._pending_count = 0
+        self._unsaved = 0
+
+        self._load()
+
+    def _load(self):
+        """저장된 인덱스를 메모리 맵으로 로드"""
+        hist_path = self.root / "hist.npy"
+        scalars_path = self.root / "scalars.npy"
+        meta_path = self.root / "meta.json"
+        if not (hist_path.exists() and scalars_path.exists() and meta_path.exists()):
+            return
+
+        try:
+            hist = np.load(hist_path, mmap_mode="r")
+            scalars = np.load(scalars_path, mmap_mode="r")
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            if hist.shape[0] != len(meta) or scalars.shape[0] != len(meta):
+                raise ValueError("행렬과 메타데이터 크기가 다릅니다.")
+        except Exception as e:
+            logger.warning(f"이미지 유사도 인덱스 로드 실패: {e}")
+            return
+
+        self._hist, self._scalars, self._meta = hist, scalars, meta
+        self._keys = {item["key"]: row for row, item in enumerate(meta)}
+        logger.info(f"이미지 유사도 인덱스 로드 완료: {len(meta)}개 항목")
+
+    def _append_pending(self, hist: np.ndarray, scalars: np.ndarray):
+        """추가 블록에 한 행 기록 (호출자가 self._lock을 보유해야 함)
+
+        이미 기록된 행은 바꾸지 않고 용량이 모자라면 새 블록으로 옮기므로,
+        search가 잠금 밖에서 앞쪽 행의 뷰를 읽어도 안전합니다.
+        """
+        if self._pending_count == len(self._pending_hist):
+            capacity = max(16, 2 * len(self._pending_hist))
+            pending_hist = np.empty((capacity, HIST_BINS), dtype=np.float32)
+            pending_scalars = np.empty((capacity, SCALAR_COUNT), dtype=np.float32)
+            pending_hist[:self._pending_count] = self._pending_hist[:self._pending_count]
+            pending_scalars[:self._pending_count] = self._pending_scalars[:self._pending_count]
+            self._pending_hist, self._pending_scalars = pending_hist, pending_scalars
+        self._pending_hist[self._pending_count] = hist
+        self._pending_scalars[self._pending_count] = scalars
+        self._pending_count += 1
+
+    def add(self, key: str, features: Dict[str, Any], meta: Dict[str, Any]) -> bool:
+        """항목 추가 (같은 키가 이미 있으면 무시)"""
+        if not features or key in self._keys:
+            return False
+
+        hist = _center_normalize(features["color_hist"])
+        scalars = _scalars(features).reshape(1, SCALAR_COUNT)
+
+        with self._lock:
+            if key in self._keys:
+                return False
+            self._keys[key] = len(self._meta)
+            self._meta.append({**meta, "key": key})
+            self._append_pending(hist[0], scalars[0])
+            self._unsaved += 1
+            should_save = self._unsaved >= self.save_every
+
+        if should_save:
+            self.save()
+        return True
+
+    def search(
+        self,
+        features: Dict[str, Any],
+        k: int = 5,
+        min_similarity: float = 0.0,
+        brand: Optional[str] = None,
+        category: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """업로드 이미지 특징과 가장 유사한 상위 k개 항목 반환 (brand/category를 주면 같은 항목만)"""
+        if not features:
+            return []
+
+        query_hist = _center_normalize(features["color_hist"])[0]
+        query_scalars = _scalars(features)
+
+        with self._lock:
+            # 저장된 블록과 추가 블록의 뷰, 같은 행 수의 메타데이터 (잠금을 놓은 뒤 add가 있어도 행 수가 맞음)
+            blocks = [
+                (self._hist, self._scalars),
+                (self._pending_hist[:self._pending_count], self._pending_scalars[:self._pending_count])
+            ]
+            meta = self._meta[:len(self._hist) + self._pending_count]
+        if not meta:
+            return []
+
+        # 블록마다 한 번의 행렬 연산으로 모든 항목의 점수 계산
+        scores = np.concatenate([
+            self._score_block(hist, scalars, query_hist, query_scalars)
+            for hist, scalars in blocks
+        ])
+
+        if brand or category:
+            mask = np.fromiter(
+                (
+                    (not brand or item.get("brand") == brand)
+                    and (not category or item.get("category") == category)
+                    for item in meta
+                ),
+                dtype=bool,
+                count=len(meta)
+            )
+            scores = np.where(mask, scores, -1.0)
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            {**meta[row], "similarity": float(scores[row])}
+            for row in top
+            if scores[row] >= min_similarity
+        ]
+
+    @staticmethod
+    def _score_block(hist: np.ndarray, scalars: np.ndarray,
+                     query_hist: np.ndarray, query_scalars: np.ndarray) -> np.ndarray:
+        """한 블록의 모든 행과 업로드 이미지의 유사도"""
+        if len(hist) == 0:
+            return np.empty(0, dtype=np.float32)
+        color_sim = hist @ query_hist
+        edge_sim = 1.0 - np.abs(scalars[:, 0] - query_scalars[0])
+        texture_sim = 1.0 - np.abs(scalars[:, 1:] - query_scalars[1:]).mean(axis=1) / 255
+        return (
+            WEIGHTS["color"] * np.maximum(color_sim, 0)
+            + WEIGHTS["edge"] * np.maximum(edge_sim, 0)
+            + WEIGHTS["texture"] * np.maximum(texture_sim, 0)
+        )
+
+    def save(self):
+        """저장된 블록과 추가 블록을 합쳐 디스크에 저장하고 메모리 맵으로 다시 열기
+
+        합친 행렬은 메모리에 만들지 않고 새 파일의 메모리 맵에 블록별로 복사합니다.
+        """
+        with self._lock:
+            if self._unsaved == 0:
+                return
+
+            try:
+                self.root.mkdir(parents=True, exist_ok=True)
+                count = self._pending_count
+                for name, saved, pending in (
+                    ("hist", self._hist, self._pending_hist),
+                    ("scalars", self._scalars, self._pending_scalars)
+                ):
+                    tmp_path = self.root / f"{name}.{os.getpid()}.tmp.npy"
+                    merged = np.lib.format.open_memmap(
+                        tmp_path, mode="w+", dtype=np.float32, shape=(len(saved) + count, saved.shape[1])
+                    )
+                    merged[:len(saved)] = saved
+                    merged[len(saved):] = pending[:count]
+                    merged.flush()
+                    del merged
+                    os.replace(tmp_path, self.root / f"{name}.npy")
+
+                tmp_meta = self.root / f"meta.{os.getpid()}.tmp.json"
+                tmp_meta.write_text(json.dumps(self._meta, ensure_ascii=False), encoding="utf-8")
+                os.replace(tmp_meta, self.root / "meta.json")
+
+                self._hist = np.load(self.root / "hist.npy", mmap_mode="r")
+                self._scalars = np.load(self.root / "scalars.npy", mmap_mode="r")
+                # 추가 블록은 새 배열로 바꿔, 잠금 밖에서 읽고 있는 이전 뷰는 그대로 둠
+                self._pending_hist = np.empty((0, HIST_BINS), dtype=np.float32)
+                self._pending_scalars = np.empty((0, SCALAR_COUNT), dtype=np.float32)
+                self._pending_count = 0
+                self._unsaved = 0
+            except Exception as e:
+                logger.warning(f"이미지 유사도 인덱스 저장 실패: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """인덱스 통계"""
+        with self._lock:
+            return {
+                "entries": len(self._meta),
+                "unsaved": self._unsaved,
+                "pending_rows": self._pending_count,
+                "memory_mapped": isinstance(self._hist, np.memmap)
+            }
+
+
+# 전역 이미지 유사도 인덱스 인스턴스
+image_similarity_index = ImageSimilarityIndex(
+    root=settings.image_index_dir,
+    save_every=settings.image_index_save_every
+)
@@ -0,0 +1,484 @@
+"""
+작업 큐 - 제품 분석 같은 오래 걸리는 작업을 고정된 워커 수로 실행
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple, TypeVar
+
+from config.database import memory_db
+from config.settings import settings
+from utils.logger import logger
+
+
+T = TypeVar("T")
+
+
+class JobState(str, Enum):
+    """작업 상태"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+ACTIVE_STATES = (JobState.QUEUED.value, JobState.RUNNING.value)
+
+
+class JobQueueFullError(Exception):
+    """대기열이 가득 차서 작업을 받을 수 없음"""
+
+
+@dataclass
+class Job:
+    """작업 정보"""
+    job_id: str
+    kind: str
+    group: str
+    session_id: str
+    state: str
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    owner_pid: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        for field in ("created_at", "started_at", "finished_at"):
+            if data[field] is not None:
+                data[field] = datetime.fromtimestamp(data[field]).isoformat()
+        now = time.time()
+        if self.started_at is not None:
+            data["wait_seconds"] = round(self.started_at - self.created_at, 3)
+        elif self.state == JobState.QUEUED.value:
+            data["wait_seconds"] = round(now - self.created_at, 3)
+        if self.started_at is not None:
+            data["run_seconds"] = round((self.finished_at or now) - self.started_at, 3)
+        return data
+
+
+_COLUMNS = ("job_id", "kind", "group_name", "session_id", "state", "created_at",
+            "started_at", "finished_at", "error", "owner_pid")
+
+
+def _row_to_job(row: Tuple) -> Job:
+    values = dict(zip(_COLUMNS, row))
+    values["group"] = values.pop("group_name")
+    return Job(**values)
+
+
+class JobQueue:
+    """작업 큐
+
+    - 작업 종류별 처리 함수를 등록하고(register) submit으로 작업을 넣습니다.
+    - 같은 그룹(예: 분석/재분석)에서 세션당 진행 중인 작업은 하나뿐이며,
+      이미 있으면 새로 만들지 않고 기존 작업을 반환합니다 (single-flight).
+    - 작업 상태는 SQLite에 기록하여 여러 워커 프로세스가 같은 작업을 보고,
+      종료 시 끝나지 않은 작업은 다음 시작 때 다시 실행합니다.
+    - 다른 프로세스의 작업은 그 세션을 이 프로세스에서 볼 수 있을 때만(session_exists) 가져오고,
+      볼 수 없으면 실패로 기록합니다.
+    - 처리 함수는 이벤트 루프에서 실행되므로 OCR, 이미지 처리, 동기 LLM 호출 같은 막히는 작업은
+      offload()로 워커 수만큼의 스레드 풀에서 실행해야 합니다. 작업 실행 중 이벤트 루프가
+      loop_stall_warn_seconds 이상 멈추면 경고를 남기고 loop_stalls로 집계합니다.
+    """
+
+    def __init__(self, db_path: str, worker_count: int = 2, max_queue_size: int = 100,
+                 retention_seconds: int = 86400,
+                 session_exists: Optional[Callable[[str], bool]] = None,
+                 loop_stall_warn_seconds: float = 0.5):
+        self.db_path = Path(db_path)
+        self.worker_count = worker_count
+        self.max_queue_size = max_queue_size
+        self.retention_seconds = retention_seconds
+        self.loop_stall_warn_seconds = loop_stall_warn_seconds
+        self._session_exists = session_exists
+
+        self._handlers: Dict[str, Tuple[str, Callable[[str], Awaitable[Dict[str, Any]]]]] = {}
+        self._finish_callbacks: Dict[str, Callable[[Job, Dict[str, Any]], None]] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._running = 0
+        self._running_jobs: Dict[str, Job] = {}
+        self._stall_window_kinds: Set[str] = set()  # 루프 멈춤 확인 구간에 실행된 작업 종류
+        self._executor: Optional[ThreadPoolExecutor] = None  # 막히는 작업용 (워커 수만큼의 스레드)
+        self._stall_monitor: Optional[asyncio.Task] = None
+        self._done_events: Dict[str, asyncio.Event] = {}  # 이 프로세스에서 실행할 작업의 종료 알림
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+
+        self._wait_times: Deque[float] = deque(maxlen=500)
+        self.stats = {"submitted": 0, "deduplicated": 0, "rejected": 0, "done": 0, "failed": 0,
+                      "recovered": 0, "loop_stalls": 0}
+
+    def register(self, kind: str, handler: Callable[[str], Awaitable[Dict[str, Any]]], group: Optional[str] = None,
+                 on_finished: Optional[Callable[[Job, Dict[str, Any]], None]] = None):
+        """작업 종류별 처리 함수 등록 (handler(session_id) -> {"success": ...})
+
+        처리 함수 안의 막히는 작업은 offload()로 실행해야 합니다.
+        on_finished(job, result)는 끝난 상태(DONE/FAILED)를 기록한 뒤 호출되므로,
+        완료 알림을 받은 쪽이 작업을 조회해도 진행 중으로 보이지 않습니다.
+        """
+        self._handlers[kind] = (group or kind, handler)
+        if on_finished is not None:
+            self._finish_callbacks[kind] = on_finished
+
+    async def offload(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """막히는 작업을 작업 스레드 풀에서 실행
+
+        스레드 풀은 워커 수(worker_count)만큼이라 OCR, 이미지 처리 같은 CPU 작업은 동시에 그 수까지만 실행됩니다.
+        호출한 쪽의 컨텍스트(분석 진행 이벤트의 세션 등)를 그대로 이어받습니다.
+        큐가 시작되지 않았으면(스크립트 등) 기본 스레드 풀을 사용합니다.
+        """
+        if self._executor is None:
+            return await asyncio.to_thread(func, *args, **kwargs)
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, func, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """SQLite 연결 반환 (호출자가 self._lock을 보유해야 함)"""
+        if self._conn is not None and self._conn_pid == os.getpid():
+            return self._conn
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "job_id TEXT PRIMARY KEY, kind TEXT NOT NULL, group_name TEXT NOT NULL, "
+            "session_id TEXT NOT NULL, state TEXT NOT NULL, created_at REAL NOT NULL, "
+            "started_at REAL, finished_at REAL, error TEXT, owner_pid INTEGER);"
+            "CREATE INDEX IF NOT EXISTS idx_jobs_session ON jobs(session_id, group_name, created_at);"
+            "CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs(state);"
+        )
+        self._conn = conn
+        self._conn_pid = os.getpid()
+        return conn
+
+    def _save(self, job: Job):
+        with self._lock:
+            conn = self._get_connection()
+            conn.execute(
+                f"INSERT OR REPLACE INTO jobs ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                (job.job_id, job.kind, job.group, job.session_id, job.state, job.created_at,
+                 job.started_at, job.finished_at, job.error, job.owner_pid)
+            )
+
+    def _create_or_get_active(self, kind: str, group: str, session_id: str) -> Tuple[Job, bool]:
+        """세션의 진행 중 작업이 있으면 반환, 없으면 새 작업 기록 (한 트랜잭션)"""
+        with self._lock:
+            conn = self._get_connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    f"SELECT {', '.join(_COLUMNS)} FROM jobs "
+                    "WHERE session_id = ? AND group_name = ? AND state IN (?, ?) "
+                    "ORDER BY created_at DESC LIMIT 1",
+                    (session_id, group, *ACTIVE_STATES)
+                ).fetchone()
+                if row is not None:
+                    conn.execute("COMMIT")
+                    return _row_to_job(row), False
+
+                job = Job(
+                    job_id=str(uuid.uuid4()),
+                    kind=kind,
+                    group=group,
+                    session_id=session_id,
+                    state=JobState.QUEUED.value,
+                    created_at=time.time(),
+                    owner_pid=os.getpid()
+                )
+                conn.execute(
+                    f"INSERT INTO jobs ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                    (job.job_id, job.kind, job.group, job.session_id, job.state, job.created_at,
+                     None, None, None, job.owner_pid)
+                )
+                conn.execute("COMMIT")
+                return job, True
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    async def submit(self, kind: str, session_id: str) -> Tuple[Job, bool]:
+        """작업 추가 후 (작업, 새로 만들었는지) 반환
+
+        같은 그룹에 세션의 진행 중 작업이 있으면 그 작업을 반환합니다.
+        대기열이 가득 차면 JobQueueFullError를 발생시킵니다.
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"등록되지 않은 작업 종류입니다: {kind}")
+        if self._queue is None:
+            raise RuntimeError("작업 큐가 시작되지 않았습니다.")
+
+        group = self._handlers[kind][0]
+        if self._queue.qsize() >= self.max_queue_size:
+            # 진행 중 작업 반환은 대기열이 가득 차도 허용
+            active = await asyncio.to_thread(self.latest_for_session, session_id, group)
+            if active is not None and active.state in ACTIVE_STATES:
+                self.stats["deduplicated"] += 1
+                return active, False
+            self.stats["rejected"] += 1
+            raise JobQueueFullError("작업 대기열이 가득 찼습니다.")
+
+        job, created = await asyncio.to_thread(self._create_or_get_active, kind, group, session_id)
+        if created:
+            self.stats["submitted"] += 1
+            self._done_events[job.job_id] = asyncio.Event()
+            self._queue.put_nowait(job)
+            logger.info(f"작업 추가: {kind} job_id={job.job_id} session_id={session_id}")
+        else:
+            self.stats["deduplicated"] += 1
+            logger.info(f"진행 중 작업 재사용: {job.kind} job_id={job.job_id} session_id={session_id}")
+        return job, created
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """작업 조회"""
+        with self._lock:
+            row = self._get_connection().execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return _row_to_job(row) if row else None
+
+    def latest_for_session(self, session_id: str, group: Optional[str] = None) -> Optional[Job]:
+        """세션의 가장 최근 작업 (group을 주면 해당 그룹만)"""
+        query = f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE session_id = ?"
+        params: Tuple = (session_id,)
+        if group is not None:
+            query += " AND group_name = ?"
+            params += (group,)
+        with self._lock:
+            row = self._get_connection().execute(
+                query + " ORDER BY created_at DESC LIMIT 1", params
+            ).fetchone()
+        return _row_to_job(row) if row else None
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[Job]:
+        """작업이 끝날 때까지 대기 후 작업 반환 (시간 초과 시 그때의 상태)
+
+        이 프로세스의 작업은 종료 알림을 기다리고, 다른 프로세스의 작업은 상태를 주기적으로 확인합니다.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            job = await asyncio.to_thread(self.get, job_id)
+            remaining = deadline - time.monotonic()
+            if job is None or job.state not in ACTIVE_STATES or remaining <= 0:
+                return job
+
+            done_event = self._done_events.get(job_id)
+            try:
+                if done_event is not None:
+                    await asyncio.wait_for(done_event.wait(), timeout=remaining)
+                else:
+                    await asyncio.sleep(min(remaining, 0.5))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run_job(self, job: Job):
+        _, handler = self._handlers[job.kind]
+        job.state = JobState.RUNNING.value
+        job.started_at = time.time()
+        self._wait_times.append(job.started_at - job.created_at)
+        await asyncio.to_thread(self._save, job)
+
+        try:
+            result = await handler(job.session_id)
+            if result.get("success"):
+                job.state = JobState.DONE.value
+            else:
+                job.state = JobState.FAILED.value
+                job.error = result.get("error", "작업 처리에 실패했습니다.")
+        except asyncio.CancelledError:
+            # 종료로 중단됨: 대기 상태로 되돌려 다음 시작 때 다시 실행 (취소 중이므로 바로 기록)
+            job.state = JobState.QUEUED.value
+            job.started_at = None
+            self._save(job)
+            logger.info(f"작업 중단, 다음 시작 때 다시 실행: {job.kind} job_id={job.job_id}")
+            raise
+        except Exception as e:
+            logger.error(f"작업 실행 오류: {job.kind} job_id={job.job_id} ({e})")
+            job.state = JobState.FAILED.value
+            job.error = str(e)
+            result = {"success": False, "error": job.error}
+
+        job.finished_at = time.time()
+        self.stats["done" if job.state == JobState.DONE.value else "failed"] += 1
+        await asyncio.to_thread(self._save, job)
+        on_finished = self._finish_callbacks.get(job.kind)
+        if on_finished is not None:
+            try:
+                on_finished(job, result)
+            except Exception as e:
+                logger.error(f"작업 종료 알림 오류: {job.kind} job_id={job.job_id} ({e})")
+        done_event = self._done_events.pop(job.job_id, None)
+        if done_event is not None:
+            done_event.set()
+        logger.info(
+            f"작업 종료: {job.kind} job_id={job.job_id} state={job.state} "
+            f"({job.finished_at - job.started_at:.1f}초)"
+        )
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            self._running += 1
+            self._running_jobs[job.job_id] = job
+            self._stall_window_kinds.add(job.kind)
+            try:
+                await self._run_job(job)
+            except Exception as e:
+                logger.error(f"작업 워커 오류: {e}")
+            finally:
+                self._running -= 1
+                self._running_jobs.pop(job.job_id, None)
+                self._queue.task_done()
+
+    async def _monitor_loop_stalls(self):
+        """작업 실행 중 이벤트 루프가 멈추면 경고 (처리 함수가 offload하지 않은 막히는 작업 검출)"""
+        interval = max(self.loop_stall_warn_seconds / 2, 0.05)
+        loop = asyncio.get_running_loop()
+        while True:
+            # 구간 안에 시작해서 끝난 작업도 놓치지 않도록 구간 동안 실행된 작업 종류를 모음
+            self._stall_window_kinds = {job.kind for job in self._running_jobs.values()}
+            started = loop.time()
+            await asyncio.sleep(interval)
+            stalled = loop.time() - started - interval
+            if stalled >= self.loop_stall_warn_seconds and self._stall_window_kinds:
+                self.stats["loop_stalls"] += 1
+                kinds = ", ".join(sorted(self._stall_window_kinds))
+                logger.warning(
+                    f"작업 실행 중 이벤트 루프가 {stalled:.2f}초 멈춤 (실행 중 작업: {kinds}) - "
+                    "막히는 작업은 job_queue.offload()로 실행해야 합니다."
+                )
+
+    def _recover(self) -> List[Job]:
+        """종료된 프로세스가 남긴 미완료 작업을 이 프로세스로 가져옴"""
+        recovered = []
+        with self._lock:
+            conn = self._get_connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "DELETE FROM jobs WHERE state NOT IN (?, ?) AND finished_at < ?",
+                    (*ACTIVE_STATES, time.time() - self.retention_seconds)
+                )
+                rows = conn.execute(
+                    f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE state IN (?, ?) ORDER BY created_at",
+                    ACTIVE_STATES
+                ).fetchall()
+                for row in rows:
+                    job = _row_to_job(row)
+                    if job.owner_pid and job.owner_pid != os.getpid() and _process_alive(job.owner_pid):
+                        continue
+                    if job.kind not in self._handlers:
+                        continue
+                    if self._session_exists is not None and not self._session_exists(job.session_id):
+                        # 세션을 볼 수 없는 작업은 실행해도 실패하므로 바로 실패로 기록
+                        conn.execute(
+                            "UPDATE jobs SET state = ?, finished_at = ?, error = ? WHERE job_id = ?",
+                            (JobState.FAILED.value, time.time(), "세션을 찾을 수 없어 작업을 복구하지 않았습니다.", job.job_id)
+                        )
+                        continue
+                    job.state = JobState.QUEUED.value
+                    job.started_at = None
+                    job.owner_pid = os.getpid()
+                    conn.execute(
+                        "UPDATE jobs SET state = ?, started_at = NULL, owner_pid = ? WHERE job_id = ?",
+                        (job.state, job.owner_pid, job.job_id)
+                    )
+                    recovered.append(job)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return recovered
+
+    async def start(self):
+        """워커 시작 및 미완료 작업 복구"""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=self.worker_count, thread_name_prefix="job-worker")
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+        if self.loop_stall_warn_seconds > 0:
+            self._stall_monitor = asyncio.create_task(self._monitor_loop_stalls())
+
+        try:
+            recovered = await asyncio.to_thread(self._recover)
+        except Exception as e:
+            logger.error(f"미완료 작업 복구 실패: {e}")
+            recovered = []
+        for job in recovered:
+            self._done_events[job.job_id] = asyncio.Event()
+            self._queue.put_nowait(job)
+        self.stats["recovered"] += len(recovered)
+        logger.info(f"작업 큐 시작: 워커 {self.worker_count}개, 복구한 작업 {len(recovered)}개")
+
+    async def stop(self):
+        """워커 중지 (실행 중이던 작업은 다음 시작 때 다시 실행)"""
+        tasks = self._workers + ([self._stall_monitor] if self._stall_monitor is not None else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._stall_monitor = None
+        if self._executor is not None:
+            # 스레드에서 실행 중인 작업은 중단할 수 없으므로 기다리지 않음
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """대기열 길이, 대기 시간 등 지표"""
+        waits = sorted(self._wait_times)
+
+        def percentile(p: float) -> Optional[float]:
+            if not waits:
+                return None
+            return round(waits[min(len(waits) - 1, int(len(waits) * p))], 3)
+
+        return {
+            "workers": self.worker_count,
+            "running": self._running,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue_size": self.max_queue_size,
+            "wait_seconds_p50": percentile(0.5),
+            "wait_seconds_p95": percentile(0.95),
+            **self.stats
+        }
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# 전역 작업 큐 인스턴스
+job_queue = JobQueue(
+    db_path=settings.job_db_path,
+    worker_count=settings.job_workers,
+    max_queue_size=settings.job_queue_max_size,
+    retention_seconds=settings.job_retention_seconds,
+    session_exists=lambda session_id: memory_db.get_session(session_id) is not None,
+    loop_stall_warn_seconds=settings.job_loop_stall_warn_seconds
+)
@@ -0,0 +1,434 @@
+"""
+로컬 제품 카탈로그 - 모델명 인덱스 기반 즉시 제품 식별
+"""
+
+import bisect
+import csv
+import json
+import os
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from config.settings import settings
+from utils.logger import logger
+from utils.model_matcher import model_matcher, normalize_model
+
+
+_TOKEN = re.compile(r"[A-Za-z0-9][A-Za-z0-9\-_/.]*")
+_HTML_TAG = re.compile(r"<[^>]+>")
+
+# 카탈로그에 등록하지 않는 모델명 (검색 서비스의 자리표시 값)
+_PLACEHOLDER_MODELS = {"", "모델명 확인 필요", "확인 불가", "모델 미상", "해당없음"}
+
+
+def is_model_like(normalized: str) -> bool:
+    """정규화된 문자열이 모델명 형태인지 확인 (영문과 숫자 모두 포함, 4자 이상)"""
+    return (
+        len(normalized) >= 4
+        and any(ch.isdigit() for ch in normalized)
+        and any(ch.isalpha() for ch in normalized)
+    )
+
+
+@dataclass
+class CatalogEntry:
+    """카탈로그 항목"""
+    brand: str
+    category: str
+    model: str
+    title: str
+    aliases: List[str] = field(default_factory=list)
+    source: str = "search"
+    updated_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    @property
+    def normalized_model(self) -> str:
+        return normalize_model(self.model)
+
+    def keys(self) -> Set[str]:
+        """인덱스 키 (모델명 + 별칭)"""
+        keys = {self.normalized_model}
+        keys.update(normalize_model(alias) for alias in self.aliases)
+        return {key for key in keys if key}
+
+
+class ProductCatalog:
+    """로컬 제품 카탈로그
+
+    (brand, category, model, title, aliases) 항목을 SQLite에 저장하고,
+    정규화된 모델명에 대한 역색인과 정렬된 접두사 인덱스를 메모리에 유지합니다.
+    OCR 텍스트에서 모델명을 네트워크 검색 없이 바로 찾는 데 사용합니다.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._loaded = False
+
+        # 항목 저장소 ((brand, 정규화 모델명) -> 항목)
+        self._entries: Dict[tuple, CatalogEntry] = {}
+        # 역색인 (정규화 키 -> 항목 키 집합)
+        self._index: Dict[str, Set[tuple]] = {}
+        # 접두사 검색용 정렬 키 목록
+        self._sorted_keys: List[str] = []
+        self._sorted_dirty = False
+
+        self.stats = {"hits": 0, "prefix_hits": 0, "fuzzy_hits": 0, "misses": 0, "added": 0}
+
+    def _get_connection(self) -> Optional[sqlite3.Connection]:
+        """SQLite 연결 반환 (호출자가 self._lock을 보유해야 함)"""
+        if self._conn is not None and self._conn_pid == os.getpid():
+            return self._conn
+
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS catalog ("
+                "brand TEXT NOT NULL, normalized_model TEXT NOT NULL, category TEXT, "
+                "model TEXT NOT NULL, title TEXT, aliases TEXT, source TEXT, updated_at TEXT, "
+                "PRIMARY KEY (brand, normalized_model))"
+            )
+            conn.commit()
+            self._conn = conn
+            self._conn_pid = os.getpid()
+        except Exception as e:
+            logger.warning(f"제품 카탈로그 DB 연결 실패, 메모리에서만 사용: {e}")
+            self._conn = None
+
+        return self._conn
+
+    def _ensure_loaded(self):
+        """최초 사용 시 저장된 카탈로그를 메모리 인덱스로 로드"""
+        if self._loaded:
+            return
+
+        with self._lock:
+            if self._loaded:
+                return
+
+            conn = self._get_connection()
+            if conn is not None:
+                try:
+                    rows = conn.execute(
+                        "SELECT brand, category, model, title, aliases, source, updated_at FROM catalog"
+                    ).fetchall()
+                    for brand, category, model, title, aliases, source, updated_at in rows:
+                        entry = CatalogEntry(
+                            brand=brand,
+                            category=category or "",
+                            model=model,
+                            title=title or "",
+                            aliases=json.loads(aliases) if aliases else [],
+                            source=source or "search",
+                            updated_at=updated_at or datetime.now().isoformat()
+                        )
+                        self._index_entry(entry)
+                    logger.info(f"제품 카탈로그 로드 완료: {len(self._entries)}개 항목")
+                except sqlite3.Error as e:
+                    logger.warning(f"제품 카탈로그 로드 실패: {e}")
+
+            self._loaded = True
+
+    def _index_entry(self, entry: CatalogEntry):
+        """항목을 메모리 인덱스에 반영 (호출자가 self._lock을 보유해야 함)"""
+        entry_key = (entry.brand, entry.normalized_model)
+
+        previous = self._entries.get(entry_key)
+        if previous is not None:
+            for key in previous.keys():
+                refs = self._index.get(key)
+                if refs is not None:
+                    refs.discard(entry_key)
+                    if not refs:
+                        del self._index[key]
+
+        self._entries[entry_key] = entry
+        for key in entry.keys():
+            if key not in self._index:
+                self._index[key] = set()
+                self._sorted_dirty = True
+            self._index[key].add(entry_key)
+
+        # OCR 오인식 허용 매칭을 위해 모델명 유사도 인덱스에 등록
+        model_matcher.add_known(entry.model)
+        for alias in entry.aliases:
+            model_matcher.add_known(alias)
+
+    @staticmethod
+    def _make_entry(
+        brand: str,
+        category: str,
+        model: str,
+        title: str,
+        aliases: Iterable[str],
+        source: str
+    ) -> Optional[CatalogEntry]:
+        """카탈로그 항목 생성 (모델명이 자리표시 값이거나 모델명 형태가 아니면 None)"""
+        if model in _PLACEHOLDER_MODELS or not is_model_like(normalize_model(model)):
+            return None
+        return CatalogEntry(
+            brand=brand.lower(),
+            category=category,
+            model=model.upper(),
+            title=_HTML_TAG.sub("", title).strip(),
+            aliases=sorted({alias for alias in aliases if alias}),
+            source=source
+        )
+
+    def _merge_and_index(self, entry: CatalogEntry):
+        """같은 브랜드·모델 항목과 합쳐 메모리 인덱스에 반영 (호출자가 self._lock을 보유해야 함)"""
+        existing = self._entries.get((entry.brand, entry.normalized_model))
+        if existing is not None:
+            # 기존 별칭과 빈 필드는 유지
+            entry.aliases = sorted(set(existing.aliases) | set(entry.aliases))
+            entry.category = entry.category or existing.category
+            entry.title = entry.title or existing.title
+
+        self._index_entry(entry)
+        self.stats["added"] += 1
+
+    def _persist(self, entries: List[CatalogEntry]):
+        """항목들을 한 트랜잭션으로 저장 (호출자가 self._lock을 보유해야 함)"""
+        conn = self._get_connection()
+        if conn is None or not entries:
+            return
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO catalog "
+                    "(brand, normalized_model, category, model, title, aliases, source, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            entry.brand, entry.normalized_model, entry.category, entry.model,
+                            entry.title, json.dumps(entry.aliases, ensure_ascii=False),
+                            entry.source, entry.updated_at
+                        )
+                        for entry in entries
+                    ]
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"제품 카탈로그 저장 실패: {e}")
+
+    def add(
+        self,
+        brand: str,
+        category: str,
+        model: str,
+        title: str = "",
+        aliases: Iterable[str] = (),
+        source: str = "search"
+    ) -> Optional[CatalogEntry]:
+        """카탈로그 항목 추가 (같은 브랜드·모델이 있으면 갱신)"""
+        entry = self._make_entry(brand, category, model, title, aliases, source)
+        if entry is None:
+            return None
+
+        self._ensure_loaded()
+        with self._lock:
+            self._merge_and_index(entry)
+            self._persist([entry])
+
+        return entry
+
+    def lookup(self, model: str, brand: Optional[str] = None) -> Optional[CatalogEntry]:
+        """정규화된 모델명으로 정확히 일치하는 항목 조회"""
+        self._ensure_loaded()
+        with self._lock:
+            refs = self._index.get(normalize_model(model))
+            return self._pick(refs, brand)
+
+    def prefix_lookup(self, prefix: str, limit: int = 10) -> List[CatalogEntry]:
+        """정규화된 모델명 접두사로 항목 조회"""
+        self._ensure_loaded()
+        normalized = normalize_model(prefix)
+        if not normalized:
+            return []
+
+        with self._lock:
+            if self._sorted_dirty:
+                self._sorted_keys = sorted(self._index.keys())
+                self._sorted_dirty = False
+            sorted_keys = self._sorted_keys
+
+            matches: List[CatalogEntry] = []
+            position = bisect.bisect_left(sorted_keys, normalized)
+            while position < len(sorted_keys) and sorted_keys[position].startswith(normalized):
+                for entry_key in self._index.get(sorted_keys[position], ()):
+                    matches.append(self._entries[entry_key])
+                    if len(matches) >= limit:
+                        return matches
+                position += 1
+            return matches
+
+    def _pick(self, refs: Optional[Set[tuple]], brand: Optional[str]) -> Optional[CatalogEntry]:
+        """후보 중 브랜드가 일치하는 항목 선택"""
+        if not refs:
+            return None
+        candidates = [self._entries[ref] for ref in refs if ref in self._entries]
+        if brand:
+            branded = [entry for entry in candidates if entry.brand == brand.lower()]
+            if branded:
+                return branded[0]
+            return None
+        return candidates[0] if len(candidates) == 1 else None
+
+    def resolve_texts(self, texts: List[str], brand: Optional[str] = None) -> Optional[CatalogEntry]:
+        """OCR 텍스트 목록에서 카탈로그에 있는 모델명 찾기"""
+        self._ensure_loaded()
+        if not self._entries:
+            return None
+
+        candidates = self._candidate_tokens(texts)
+
+        # 1. 정확히 일치
+        with self._lock:
+            for token in candidates:
+                entry = self._pick(self._index.get(token), brand)
+                if entry is not None:
+                    self.stats["hits"] += 1
+                    return entry
+
+        # 2. 접두사 일치 (끝 글자가 인식되지 않은 경우, 후보가 하나일 때만)
+        for token in candidates:
+            if len(token) < 5:
+                continue
+            matches = self.prefix_lookup(token, limit=2)
+            if brand:
+                matches = [entry for entry in matches if entry.brand == brand.lower()]
+            if len(matches) == 1:
+                self.stats["prefix_hits"] += 1
+                return matches[0]
+
+        # 3. OCR 혼동 문자(O/0, l/1, S/5 등)를 허용한 유사도 일치 (후보가 하나일 때만)
+        for token in candidates:
+            matches = model_matcher.match(token, k=2, max_distance=1 if len(token) >= 6 else 0)
+            entries = [self.lookup(model, brand) for model, _, _ in matches]
+            entries = [entry for entry in entries if entry is not None]
+            if len(entries) == 1:
+                self.stats["fuzzy_hits"] += 1
+                return entries[0]
+
+        self.stats["misses"] += 1
+        return None
+
+    @staticmethod
+    def _candidate_tokens(texts: List[str]) -> List[str]:
+        """텍스트에서 모델명 후보 토큰 추출 (인접 토큰 결합 포함, 긴 것 우선)"""
+        tokens: List[str] = []
+        for text in texts:
+            words = [normalize_model(word) for word in _TOKEN.findall(text)]
+            words = [word for word in words if word]
+            tokens.extend(words)
+            # OCR이 'AP 1512H'처럼 모델명을 나눈 경우
+            tokens.extend(a + b for a, b in zip(words, words[1:]))
+
+        unique = {token for token in tokens if is_model_like(token)}
+        return sorted(unique, key=len, reverse=True)
+
+    def import_file(self, path: str) -> int:
+        """JSON 또는 CSV 파일에서 카탈로그 일괄 가져오기
+
+        JSON: [{"brand", "category", "model", "title", "aliases": [...]}, ...]
+        CSV: brand,category,model,title,aliases (별칭은 '|'로 구분)
+        """
+        file_path = Path(path)
+        if not file_path.exists():
+            logger.warning(f"카탈로그 가져오기 파일이 없습니다: {path}")
+            return 0
+
+        try:
+            if file_path.suffix.lower() == ".csv":
+                with open(file_path, encoding="utf-8") as f:
+                    rows = [
+                        {**row, "aliases": [a for a in (row.get("aliases") or "").split("|") if a]}
+                        for row in csv.DictReader(f)
+                    ]
+            else:
+                with open(file_path, encoding="utf-8") as f:
+                    rows = json.load(f)
+        except Exception as e:
+            logger.error(f"카탈로그 가져오기 실패: {e}")
+            return 0
+
+        imported = self.import_entries(rows)
+        logger.info(f"카탈로그 가져오기 완료: {imported}개 항목 ({path})")
+        return imported
+
+    def import_entries(self, rows: Iterable[Any]) -> int:
+        """항목 목록 일괄 추가 (추가한 항목 수 반환)
+
+        딕셔너리가 아니거나 브랜드/모델명이 없는 행, 값의 형식이 맞지 않는 행은 건너뛰고,
+        추가할 항목은 한 트랜잭션으로 저장합니다.
+        """
+        entries: List[CatalogEntry] = []
+        skipped = 0
+        for row in rows:
+            entry = self._entry_from_row(row)
+            if entry is None:
+                skipped += 1
+            else:
+                entries.append(entry)
+
+        if entries:
+            self._ensure_loaded()
+            with self._lock:
+                for entry in entries:
+                    self._merge_and_index(entry)
+                self._persist(entries)
+
+        if skipped:
+            logger.warning(f"카탈로그 가져오기: 올바르지 않은 행 {skipped}개 건너뜀")
+        return len(entries)
+
+    def _entry_from_row(self, row: Any) -> Optional[CatalogEntry]:
+        """가져오기 행을 항목으로 변환 (올바르지 않으면 None)"""
+        if not isinstance(row, dict):
+            return None
+
+        def text(name: str, default: str = "") -> Optional[str]:
+            value = row.get(name)
+            if value is None:
+                return default
+            return value.strip() if isinstance(value, str) else None
+
+        brand, category, model, title = text("brand"), text("category"), text("model"), text("title")
+        source = text("source") or "import"
+        if not brand or not model or category is None or title is None:
+            return None
+
+        aliases = row.get("aliases") or []
+        if isinstance(aliases, str):
+            aliases = aliases.split("|")
+        if not isinstance(aliases, (list, tuple)) or not all(isinstance(alias, str) for alias in aliases):
+            return None
+
+        return self._make_entry(brand, category, model, title, [alias.strip() for alias in aliases], source)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """카탈로그 통계"""
+        self._ensure_loaded()
+        with self._lock:
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "index_keys": len(self._index)
+            }
+
+    @staticmethod
+    def to_dict(entry: CatalogEntry) -> Dict[str, Any]:
+        """항목을 딕셔너리로 변환"""
+        return asdict(entry)
+
+
+# 전역 카탈로그 인스턴스
+product_catalog = ProductCatalog(settings.catalog_db_path)
@@ -12,12 +12,21 @@ except ImportError:
 import cv2
 import numpy as np
 from PIL import Image
+import asyncio
 import re
+import threading
 from typing import Dict, List, Optional, Tuple, Any
 from pathlib import Path
 
+from config.database import memory_db
+from config.settings import settings
 from utils.logger import logger
-from .simple_product_search_service import simple_product_search_service
+from utils.image_hash import near_duplicate_index, parse_hash
+from utils.model_matcher import MODEL_GRAMMAR
+from .job_queue import ACTIVE_STATES, JobState, job_queue
+from .search_orchestrator import search_orchestrator, MODEL_PLACEHOLDERS
+from .product_catalog_service import product_catalog
+from .analysis_events import analysis_events
 
 
 class ProductRecognitionService:
@@ -26,6 +35,7 @@ class ProductRecognitionService:
     def __init__(self):
         """서비스 초기화"""
         self.ocr_reader = None
+        self._ocr_init_lock = threading.Lock()  # 작업 스레드 여러 개가 동시에 초기화하지 않도록
         self.confidence_threshold = 0.7  # 확신도 임계값
         
         # 가전제품 필터링을 위한 객체 탐지 카테고리
@@ -80,7 +90,9 @@ class ProductRecognitionService:
             logger.info("EasyOCR이 설치되지 않음 - 기본 분류 모드로 실행")
             return
             
-        if self.ocr_reader is None:
+        with self._ocr_init_lock:
+            if self.ocr_reader is not None:
+                return
             try:
                 logger.info("EasyOCR 초기화 중...")
                 # GPU 사용 불가능한 경우 CPU 모드로 실행
@@ -386,10 +398,14 @@ class ProductRecognitionService:
         return None
     
     async def classify_product_category(self, image_path: str, detected_brand: Optional[str] = None) -> Dict[str, Any]:
-        """제품 카테고리 분류 (웹 검색 통합)"""
+        """제품 카테고리 분류 (웹 검색 통합)
+
+        OCR과 이미지 특징 분석은 이벤트 루프를 막지 않도록 작업 스레드 풀에서 실행합니다.
+        """
         try:
             # 1단계: 가전제품 여부 판별
-            appliance_check = self.is_appliance_image(image_path)
+            analysis_events.report("ocr", "이미지에서 글자와 브랜드를 읽고 있습니다.")
+            appliance_check = await job_queue.offload(self.is_appliance_image, image_path)
             
             if not appliance_check["is_appliance"]:
                 logger.warning(f"가전제품이 아닌 이미지로 판별됨: {appliance_check['reason']}")
@@ -407,7 +423,7 @@ class ProductRecognitionService:
             logger.info("가전제품으로 판별됨 - 상세 분류 시작")
             
             # 이미지에서 텍스트 추출
-            extracted_texts = self.extract_text_from_image(image_path)
+            extracted_texts = await job_queue.offload(self.extract_text_from_image, image_path)
             all_text = " ".join([item['text'].lower() for item in extracted_texts])
             
             # 브랜드가 검출되지 않은 경우 OCR로 다시 시도
@@ -418,71 +434,87 @@ class ProductRecognitionService:
                 logger.info(f"브랜드 검출: {detected_brand}")
                 
                 # 3단계: 기본 OCR 기반 분류
-                basic_result = self._basic_classify_product(image_path, detected_brand, extracted_texts, all_text, appliance_check)
+                basic_result = await job_queue.offload(
+                    self._basic_classify_product, image_path, detected_brand, extracted_texts, all_text, appliance_check
+                )
                 
                 if not basic_result["success"]:
                     return basic_result
                 
-                # 4단계: 간단한 제품 검색으로 모델명 찾기
+                # 4단계: 로컬 카탈로그에서 모델명 조회 (검색 호출 없음)
+                analysis_events.report("search", f"{detected_brand} 제품 정보를 검색하고 있습니다.")
+                catalog_entry = await job_queue.offload(
+                    product_catalog.resolve_texts,
+                    [item['text'] for item in extracted_texts], brand=detected_brand.lower()
+                )
+                if catalog_entry is not None:
+                    logger.info(f"로컬 카탈로그에서 모델 확인: {catalog_entry.brand} {catalog_entry.model}")
+                    
+                    return {
+                        "success": True,
+                        "category": catalog_entry.category or basic_result["category"],
+                        "brand": catalog_entry.brand,
+                        "model": catalog_entry.model,
+                        "confidence": 0.9,
+                        "message": f"제품 정보를 찾았습니다: {catalog_entry.title or catalog_entry.model}",
+                        "extracted_texts": [item['text'] for item in extracted_texts],
+                        "appliance_check": appliance_check,
+                        "search_method": "local_catalog",
+                        "product_title": catalog_entry.title or f"{catalog_entry.brand} {catalog_entry.model}",
+                        "similarity_score": 1.0
+                    }
+                
+                # 5단계: 카탈로그에 없으면 다중 소스 동시 검색으로 모델명 찾기
                 try:
                     logger.info(f"제품 검색 시작: {detected_brand} - {basic_result['category']}")
                     
-                    # 먼저 이미지 기반 검색 시도
-                    image_search_result = await simple_product_search_service.search_product_by_image(
-                        image_path, 
-                        detected_brand.lower(), 
-                        basic_result["category"]
+                    # 네이버 쇼핑/이미지/Google 검색을 동시에 실행하고 첫 번째 양질의 결과 채택
+                    search_result = await search_orchestrator.search(
+                        detected_brand.lower(),
+                        basic_result["category"],
+                        image_path=image_path,
+                        extracted_texts=extracted_texts
                     )
                     
-                    if image_search_result["success"]:
-                        # 이미지 기반 검색 결과 사용
-                        product_info = image_search_result["product_info"]
+                    if search_result["success"]:
+                        product_details = search_result["product_details"]
                         
-                        logger.info(f"이미지 기반 제품 검색 성공: {product_info['brand']} {product_info['model']}")
+                        logger.info(f"제품 검색 성공 ({search_result['source']}): {product_details['title']}")
+                        
+                        # 다음 요청은 카탈로그에서 바로 찾을 수 있도록 기록
+                        # (모의 결과가 아니고, 채택된 결과가 품질 기준을 넘고 모델명이 모델명 문법에 맞을 때만)
+                        model = product_details.get("model", "")
+                        if (
+                            search_result["met_quality_bar"]
+                            and not product_details["search_method"].endswith("_mock")
+                            and model not in MODEL_PLACEHOLDERS
+                            and MODEL_GRAMMAR.fullmatch(model.upper())
+                        ):
+                            await asyncio.to_thread(
+                                product_catalog.add,
+                                detected_brand.lower(),
+                                product_details["category"],
+                                model,
+                                product_details["title"],
+                                source=product_details["search_method"]
+                            )
                         
                         return {
                             "success": True,
-                            "category": product_info["category"],
-                            "brand": product_info["brand"],
-                            "model": product_info["model"],
-                            "confidence": product_info["confidence"],
-                            "message": f"이미지 분석으로 제품 정보를 찾았습니다: {product_info['brand']} {product_info['model']}",
-                            "extracted_texts": product_info["extracted_texts"],
+                            "category": product_details["category"],
+                            "brand": product_details["brand"],
+                            "model": product_details.get("model", ""),
+                            "confidence": product_details["confidence"],
+                            "message": f"제품 정보를 찾았습니다: {product_details['title']}",
+                            "extracted_texts": [item['text'] for item in extracted_texts],
                             "appliance_check": appliance_check,
-                            "search_method": "image_based_search",
-                            "product_title": f"{product_info['brand']} {product_info['model']}",
-                            "similarity_score": product_info["confidence"]
+                            "search_method": product_details["search_method"],
+                            "product_title": product_details["title"],
+                            "similarity_score": product_details["similarity"]
                         }
                     else:
-                        # 이미지 기반 검색 실패 시 기존 검색 방법 사용
-                        search_result = await simple_product_search_service.get_product_details(
-                            detected_brand.lower(), 
-                            basic_result["category"], 
-                            image_path
-                        )
-                        
-                        if search_result["success"]:
-                            # 검색 결과로 업데이트
-                            product_details = search_result["product_details"]
-                            
-                            logger.info(f"제품 검색 성공: {product_details['title']}")
-                            
-                            return {
-                                "success": True,
-                                "category": product_details["category"],
-                                "brand": product_details["brand"],
-                                "model": product_details.get("model", ""),
-                                "confidence": product_details["confidence"],
-                                "message": f"제품 정보를 찾았습니다: {product_details['title']}",
-                                "extracted_texts": [item['text'] for item in extracted_texts],
-                                "appliance_check": appliance_check,
-                                "search_method": product_details["search_method"],
-                                "product_title": product_details["title"],
-                                "similarity_score": product_details["similarity"]
-                            }
-                        else:
-                            logger.info(f"제품 검색 실패, 기본 분류 결과 사용: {search_result.get('error', '')}")
-                            return basic_result
+                        logger.info(f"제품 검색 실패, 기본 분류 결과 사용: {search_result.get('error', '')}")
+                        return basic_result
                         
                 except Exception as e:
                     logger.warning(f"제품 검색 중 오류 발생, 기본 분류 결과 사용: {e}")
@@ -622,6 +654,104 @@ class ProductRecognitionService:
             logger.error(f"이미지 특징 분석 중 오류: {e}")
             return {category: 0.1 for category in self.category_keywords.keys()}
 
+    def store_recognition(self, session_id: str, image_path: str, result: Dict[str, Any]) -> bool:
+        """인식 결과를 세션에 저장 (그 사이 다른 이미지가 업로드되었으면 버리고 False)"""
+        session = memory_db.get_session(session_id)
+        uploaded_image = (session or {}).get("uploaded_image")
+        if not uploaded_image or uploaded_image.get("file_path") != image_path:
+            logger.info(f"이전 업로드 이미지의 인식 결과는 저장하지 않음: session_id={session_id}")
+            return False
+
+        memory_db.update_session(session_id, {
+            "product_recognition": result,
+            "recognized_image": image_path
+        })
+        image_hash = parse_hash(uploaded_image["image_hash"]) if uploaded_image.get("image_hash") else None
+        if image_hash is not None:
+            near_duplicate_index.remember(image_hash, recognition=result)
+        return True
+
+    @staticmethod
+    def _session_recognition(session_id: str, image_path: str) -> Optional[Dict[str, Any]]:
+        """세션에 저장된 image_path의 인식 결과"""
+        session = memory_db.get_session(session_id) or {}
+        if session.get("recognized_image") != image_path:
+            return None
+        return session.get("product_recognition")
+
+    @staticmethod
+    def build_recognition_status(session_id: str, session: Dict[str, Any]) -> Dict[str, Any]:
+        """업로드 이미지의 제품 인식 상태
+
+        recognition_status: done / queued / running / failed / pending(작업 없음, 분석 시작 시 인식)
+        """
+        uploaded_image = session.get("uploaded_image") or {}
+        recognition = None
+        if uploaded_image and session.get("recognized_image") == uploaded_image.get("file_path"):
+            recognition = session.get("product_recognition")
+
+        job = job_queue.latest_for_session(session_id, group="recognition")
+        if recognition is not None:
+            recognition_status = "done"
+        elif job is not None and (job.state in ACTIVE_STATES or job.state == JobState.FAILED.value):
+            recognition_status = job.state
+        else:
+            recognition_status = "pending"
+
+        return {
+            "recognition_status": recognition_status,
+            "product_recognition": recognition,
+            "recognition_job": job.to_dict() if job is not None else None
+        }
+
+    async def recognize_for_session(self, session_id: str, image_path: str) -> Dict[str, Any]:
+        """세션 이미지의 인식 결과 (업로드 후 실행된 인식 작업 결과를 재사용)
+
+        인식 작업이 실행 중이면 끝날 때까지 기다리고, 아직 시작 전이거나 없으면 바로 인식합니다.
+        대기 중인 인식 작업은 실행될 때 저장된 결과를 보고 건너뜁니다.
+        """
+        cached = self._session_recognition(session_id, image_path)
+        if cached is not None:
+            return cached
+
+        job = job_queue.latest_for_session(session_id, group="recognition")
+        if job is not None and job.state == JobState.RUNNING.value:
+            logger.info(f"실행 중인 인식 작업 대기: job_id={job.job_id}")
+            await job_queue.wait(job.job_id, timeout=settings.recognition_wait_seconds)
+            cached = self._session_recognition(session_id, image_path)
+            if cached is not None:
+                return cached
+
+        result = await self.classify_product_category(image_path)
+        self.store_recognition(session_id, image_path, result)
+        return result
+
 
 # 전역 서비스 인스턴스
-product_recognition_service = ProductRecognitionService() 
\ No newline at end of file
+product_recognition_service = ProductRecognitionService()
+
+
+async def _run_recognition_job(session_id: str) -> Dict[str, Any]:
+    """업로드된 이미지의 제품 인식 (업로드 응답 후 백그라운드 실행)
+
+    인식 작업은 세션당 하나만 실행되므로, 인식 중에 새 이미지가 업로드되면
+    (새 업로드는 이 작업을 그대로 돌려받음) 끝난 뒤 새 이미지를 이어서 인식합니다.
+    """
+    while True:
+        session = memory_db.get_session(session_id)
+        uploaded_image = (session or {}).get("uploaded_image")
+        if not uploaded_image:
+            return {"success": False, "error": "업로드된 이미지가 없습니다."}
+
+        image_path = uploaded_image["file_path"]
+        if session.get("recognized_image") == image_path and session.get("product_recognition") is not None:
+            # 분석이 먼저 시작되었거나 재촬영 사진이라 이미 인식함
+            return {"success": True, "skipped": True}
+
+        result = await product_recognition_service.classify_product_category(image_path)
+        if product_recognition_service.store_recognition(session_id, image_path, result):
+            logger.info(f"제품 인식 완료: session_id={session_id}, category={result.get('category')}")
+            return {"success": True}
+
+
+job_queue.register("recognize", _run_recognition_job, group="recognition") 
\ No newline at end of file
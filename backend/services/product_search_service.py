@@ -6,25 +6,37 @@ import asyncio
 import time
 from typing import Dict, List, Optional, Tuple, Any
 from pathlib import Path
-import requests
 from bs4 import BeautifulSoup
 import cv2
 import numpy as np
 from PIL import Image
 import io
 import base64
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, quote_plus
 import re
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 
+from config.settings import settings
 from utils.logger import logger
+from utils.http_client import get_http_session
+from utils.image_feature_cache import image_feature_cache
+from .browser_pool import browser_pool, BrowserUnavailableError
+from .image_similarity_index import image_similarity_index
+
+
+# 대체 사이트 제품 이미지 셀렉터 (한 번의 탐색으로 모두 찾도록 묶음)
+FALLBACK_IMAGE_SELECTOR = ", ".join([
+    "img[src*='product']",
+    "img[src*='item']",
+    ".product img",
+    ".item img",
+    "[class*='product'] img",
+    "[class*='item'] img"
+])
 
 
 class ProductSearchService:
@@ -32,7 +44,7 @@ class ProductSearchService:
     
     def __init__(self):
         """서비스 초기화"""
-        self.driver = None
+        self.browser_pool = browser_pool
         self.similarity_threshold = 0.7  # 이미지 유사도 임계값
         
         # 브랜드별 검색 설정
@@ -44,7 +56,8 @@ class ProductSearchService:
                 "image_selector": ".product-image img",
                 "title_selector": ".product-title",
                 "model_selector": ".product-model",
-                "search_params": {"q": ""}
+                "search_params": {"q": ""},
+                "requires_js": True  # 검색 결과를 자바스크립트로 렌더링하는 사이트
             },
             "lg": {
                 "name": "LG전자",
@@ -53,7 +66,8 @@ class ProductSearchService:
                 "image_selector": ".product-img img",
                 "title_selector": ".product-name",
                 "model_selector": ".product-code",
-                "search_params": {"keyword": ""}
+                "search_params": {"keyword": ""},
+                "requires_js": True
             },
             "philips": {
                 "name": "필립스",
@@ -62,7 +76,8 @@ class ProductSearchService:
                 "image_selector": ".product-image img",
                 "title_selector": ".product-title",
                 "model_selector": ".product-model",
-                "search_params": {"q": ""}
+                "search_params": {"q": ""},
+                "requires_js": False
             },
             "cuckoo": {
                 "name": "쿠쿠",
@@ -71,7 +86,8 @@ class ProductSearchService:
                 "image_selector": ".product-image img",
                 "title_selector": ".product-title",
                 "model_selector": ".product-model",
-                "search_params": {"keyword": ""}
+                "search_params": {"keyword": ""},
+                "requires_js": False
             },
             "winix": {
                 "name": "위닉스",
@@ -80,7 +96,8 @@ class ProductSearchService:
                 "image_selector": ".product-image img",
                 "title_selector": ".product-title",
                 "model_selector": ".product-model",
-                "search_params": {"q": ""}
+                "search_params": {"q": ""},
+                "requires_js": False
             }
         }
         
@@ -91,55 +108,31 @@ class ProductSearchService:
             "https://shopping.daum.net/search?q="
         ]
     
-    def _initialize_driver(self):
-        """Selenium WebDriver 초기화"""
-        if self.driver is None:
-            try:
-                chrome_options = Options()
-                chrome_options.add_argument("--headless")  # 헤드리스 모드
-                chrome_options.add_argument("--no-sandbox")
-                chrome_options.add_argument("--disable-dev-shm-usage")
-                chrome_options.add_argument("--disable-gpu")
-                chrome_options.add_argument("--window-size=1920,1080")
-                chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
-                
-                self.driver = webdriver.Chrome(
-                    service=webdriver.chrome.service.Service(ChromeDriverManager().install()),
-                    options=chrome_options
-                )
-                logger.info("Selenium WebDriver 초기화 완료")
-            except Exception as e:
-                logger.error(f"WebDriver 초기화 실패: {e}")
-                self.driver = None
-    
-    def _cleanup_driver(self):
-        """WebDriver 정리"""
-        if self.driver:
-            try:
-                self.driver.quit()
-                self.driver = None
-                logger.info("WebDriver 정리 완료")
-            except Exception as e:
-                logger.error(f"WebDriver 정리 실패: {e}")
-    
     async def search_product_by_brand(self, brand: str, category: str, image_path: str) -> Dict[str, Any]:
         """브랜드별 제품 검색 및 이미지 유사도 비교"""
         
         logger.info(f"브랜드별 제품 검색 시작: {brand} - {category}")
         
         try:
-            # WebDriver 초기화
-            self._initialize_driver()
-            if not self.driver:
-                return self._fallback_search(brand, category, image_path)
-            
             # 브랜드 설정 확인
             if brand not in self.brand_search_configs:
                 logger.warning(f"지원하지 않는 브랜드: {brand}")
-                return self._fallback_search(brand, category, image_path)
+                return await self._fallback_search(brand, category, image_path)
             
             config = self.brand_search_configs[brand]
             
+            # 이전 검색에서 모은 카탈로그 이미지 인덱스에서 먼저 찾기
+            target_features = await self._load_target_features(image_path)
+            indexed_match = self._match_from_index(target_features, brand, category)
+            if indexed_match:
+                logger.info(f"이미지 인덱스에서 제품 매칭: {indexed_match['title']} (유사도: {indexed_match['similarity']:.2f})")
+                return {
+                    "success": True,
+                    "matched_product": indexed_match,
+                    "search_method": "image_index",
+                    "total_products": image_similarity_index.get_stats()["entries"]
+                }
+            
             # 검색어 구성
             search_query = f"{config['name']} {category}"
             
@@ -148,13 +141,14 @@ class ProductSearchService:
             
             if not products:
                 logger.info(f"공식 사이트에서 제품을 찾을 수 없음: {brand}")
-                return self._fallback_search(brand, category, image_path)
+                return await self._fallback_search(brand, category, image_path)
             
             # 이미지 유사도 비교
-            best_match = await self._compare_image_similarity(products, image_path)
+            best_match = await self._compare_image_similarity(products, image_path, target_features=target_features)
             
             if best_match:
                 logger.info(f"제품 매칭 성공: {best_match['title']} (유사도: {best_match['similarity']:.2f})")
+                await self._remember_match(best_match, brand, category)
                 return {
                     "success": True,
                     "matched_product": best_match,
@@ -163,39 +157,110 @@ class ProductSearchService:
                 }
             else:
                 logger.info("유사한 제품을 찾을 수 없음")
-                return self._fallback_search(brand, category, image_path)
+                return await self._fallback_search(brand, category, image_path)
                 
+        except BrowserUnavailableError as e:
+            logger.warning(f"브라우저를 사용할 수 없어 대체 검색 사용: {e}")
+            return await self._fallback_search(brand, category, image_path)
         except Exception as e:
             logger.error(f"브랜드별 제품 검색 실패: {e}")
-            return self._fallback_search(brand, category, image_path)
-        finally:
-            self._cleanup_driver()
+            return await self._fallback_search(brand, category, image_path)
+    
+    def _build_official_search_url(self, config: Dict, search_query: str) -> str:
+        """공식 사이트 검색 URL 구성"""
+        
+        search_url = config["search_url"]
+        params = config["search_params"].copy()
+        params[list(params.keys())[0]] = search_query
+        
+        # URL에 파라미터 추가
+        param_str = "&".join([f"{k}={v}" for k, v in params.items()])
+        return f"{search_url}?{param_str}"
     
     async def _search_official_site(self, config: Dict, search_query: str) -> List[Dict]:
-        """브랜드 공식 사이트에서 제품 검색"""
+        """브랜드 공식 사이트에서 제품 검색
         
-        products = []
+        서버에서 렌더링하는 사이트는 HTTP 요청과 HTML 파싱만으로 추출하고,
+        자바스크립트가 필요한 사이트(requires_js)나 HTTP 추출 결과가 없는 경우에만 브라우저를 사용합니다.
+        """
+        
+        full_url = self._build_official_search_url(config, search_query)
+        logger.info(f"공식 사이트 검색: {full_url}")
+        
+        if not config.get("requires_js", True):
+            products = await self._search_official_site_http(config, full_url)
+            if products or not settings.official_site_browser_fallback:
+                logger.info(f"공식 사이트에서 {len(products)}개 제품 발견 (HTTP)")
+                return products
+            logger.info("HTTP 추출 결과 없음, 브라우저로 재시도")
+        
+        # 풀에서 브라우저 대여 (Selenium 호출은 블로킹이므로 스레드에서 실행)
+        async with self.browser_pool.checkout() as lease:
+            products = await self.browser_pool.run(lease, self._scrape_official_site, config, full_url)
+        logger.info(f"공식 사이트에서 {len(products)}개 제품 발견 (브라우저)")
+        return products
+    
+    async def _search_official_site_http(self, config: Dict, full_url: str) -> List[Dict]:
+        """HTTP 요청으로 검색 결과 HTML을 받아 제품 목록 추출"""
         
         try:
-            # 검색 URL 구성
-            search_url = config["search_url"]
-            params = config["search_params"].copy()
-            params[list(params.keys())[0]] = search_query
+            session = await get_http_session()
+            async with session.get(full_url) as response:
+                response.raise_for_status()
+                html = await response.text()
             
-            # URL에 파라미터 추가
-            param_str = "&".join([f"{k}={v}" for k, v in params.items()])
-            full_url = f"{search_url}?{param_str}"
-            
-            logger.info(f"공식 사이트 검색: {full_url}")
+            # HTML 파싱은 CPU 작업이므로 스레드에서 실행
+            return await asyncio.to_thread(self._parse_official_site_html, html, config, str(response.url))
             
+        except Exception as e:
+            logger.warning(f"공식 사이트 HTTP 검색 실패: {e}")
+            return []
+    
+    def _parse_official_site_html(self, html: str, config: Dict, base_url: str) -> List[Dict]:
+        """검색 결과 HTML에서 설정된 셀렉터로 제품 목록 추출"""
+        
+        products = []
+        soup = BeautifulSoup(html, "lxml")
+        
+        for element in soup.select(config["product_selector"])[:10]:  # 상위 10개 제품만 처리
+            title_element = element.select_one(config["title_selector"])
+            image_element = element.select_one(config["image_selector"])
+            if title_element is None or image_element is None:
+                continue
+            
+            title = title_element.get_text(strip=True)
+            # 지연 로딩 이미지는 data-src에 실제 주소가 있음
+            image_url = image_element.get("src") or image_element.get("data-src")
+            if image_url and image_url.startswith("data:"):
+                image_url = image_element.get("data-src")
+            
+            model_element = element.select_one(config["model_selector"])
+            model = model_element.get_text(strip=True) if model_element is not None else ""
+            
+            if image_url and title:
+                products.append({
+                    "title": title,
+                    "model": model,
+                    "image_url": urljoin(base_url, image_url),
+                    "source": "official_site"
+                })
+        
+        return products
+    
+    def _scrape_official_site(self, driver, config: Dict, full_url: str) -> List[Dict]:
+        """WebDriver로 검색 결과 페이지를 열고 제품 목록 추출"""
+        
+        products = []
+        
+        try:
             # 페이지 로드
-            self.driver.get(full_url)
-            WebDriverWait(self.driver, 10).until(
+            driver.get(full_url)
+            WebDriverWait(driver, 10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, config["product_selector"]))
             )
             
             # 제품 목록 추출
-            product_elements = self.driver.find_elements(By.CSS_SELECTOR, config["product_selector"])
+            product_elements = driver.find_elements(By.CSS_SELECTOR, config["product_selector"])
             
             for element in product_elements[:10]:  # 상위 10개 제품만 처리
                 try:
@@ -222,39 +287,50 @@ class ProductSearchService:
                     logger.warning(f"제품 정보 추출 실패: {e}")
                     continue
             
-            logger.info(f"공식 사이트에서 {len(products)}개 제품 발견")
             return products
             
         except TimeoutException:
             logger.warning("페이지 로드 시간 초과")
             return []
+        except WebDriverException:
+            # 브라우저 자체 오류는 풀이 드라이버를 폐기하도록 전파
+            raise
         except Exception as e:
             logger.error(f"공식 사이트 검색 실패: {e}")
             return []
     
     async def _fallback_search(self, brand: str, category: str, image_path: str) -> Dict[str, Any]:
-        """대체 검색 사이트에서 제품 검색"""
+        """대체 검색 사이트에서 제품 검색
+        
+        모든 대체 사이트를 동시에 검색하고, 유사도 임계값을 넘는 제품을 먼저 찾은 사이트의
+        결과를 채택한 뒤 나머지 사이트 요청은 취소합니다.
+        """
         
         logger.info(f"대체 검색 사이트에서 검색: {brand} - {category}")
         
         try:
             search_query = f"{brand} {category}"
+            target_features = await self._load_target_features(image_path)
             
-            for site in self.fallback_search_sites:
-                try:
-                    products = await self._search_fallback_site(site, search_query)
-                    if products:
-                        best_match = await self._compare_image_similarity(products, image_path)
-                        if best_match:
-                            return {
-                                "success": True,
-                                "matched_product": best_match,
-                                "search_method": "fallback_site",
-                                "total_products": len(products)
-                            }
-                except Exception as e:
-                    logger.warning(f"대체 사이트 검색 실패 ({site}): {e}")
-                    continue
+            tasks = {
+                asyncio.ensure_future(
+                    self._match_fallback_site(site, search_query, image_path, brand, category, target_features)
+                ): site
+                for site in self.fallback_search_sites
+            }
+            
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    try:
+                        result = await next_done
+                    except Exception as e:
+                        logger.warning(f"대체 사이트 검색 실패: {e}")
+                        continue
+                    if result is not None:
+                        return result
+            finally:
+                for task in tasks:
+                    task.cancel()
             
             return {
                 "success": False,
@@ -270,56 +346,49 @@ class ProductSearchService:
                 "search_method": "fallback_site"
             }
     
+    async def _match_fallback_site(
+        self,
+        site_url: str,
+        search_query: str,
+        image_path: str,
+        brand: str,
+        category: str,
+        target_features: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """대체 사이트 하나를 검색하고 이미지 유사도 비교 (임계값 미달이면 None)"""
+        
+        products = await self._search_fallback_site(site_url, search_query)
+        if not products:
+            return None
+        
+        best_match = await self._compare_image_similarity(
+            products, image_path, target_features=target_features
+        )
+        if best_match is None:
+            return None
+        
+        logger.info(f"대체 사이트 매칭 성공 ({site_url}): {best_match['title']}")
+        await self._remember_match(best_match, brand, category)
+        return {
+            "success": True,
+            "matched_product": best_match,
+            "search_method": "fallback_site",
+            "total_products": len(products)
+        }
+    
     async def _search_fallback_site(self, site_url: str, search_query: str) -> List[Dict]:
         """대체 검색 사이트에서 제품 검색"""
         
-        products = []
-        
         try:
-            # HTTP 요청으로 검색
-            full_url = f"{site_url}{search_query}"
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-            
-            response = requests.get(full_url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            # HTML 파싱
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # 제품 이미지 찾기 (일반적인 셀렉터들)
-            image_selectors = [
-                "img[src*='product']",
-                "img[src*='item']",
-                ".product img",
-                ".item img",
-                "[class*='product'] img",
-                "[class*='item'] img"
-            ]
-            
-            for selector in image_selectors:
-                images = soup.select(selector)
-                for img in images[:20]:  # 상위 20개 이미지만 처리
-                    try:
-                        src = img.get("src")
-                        if src and not src.startswith("data:"):
-                            # 절대 URL로 변환
-                            if not src.startswith("http"):
-                                src = urljoin(site_url, src)
-                            
-                            # 제품명 추출 (근처 텍스트에서)
-                            title = self._extract_product_title(img)
-                            
-                            products.append({
-                                "title": title or f"제품 ({len(products) + 1})",
-                                "model": "",
-                                "image_url": src,
-                                "source": "fallback_site"
-                            })
-                    except Exception as e:
-                        continue
-            
+            # 공유 HTTP 세션으로 검색
+            full_url = f"{site_url}{quote_plus(search_query)}"
+            session = await get_http_session()
+            async with session.get(full_url) as response:
+                response.raise_for_status()
+                html = await response.text()
+            
+            # HTML 파싱은 CPU 작업이므로 스레드에서 실행
+            products = await asyncio.to_thread(self._parse_fallback_site_html, html, site_url)
             logger.info(f"대체 사이트에서 {len(products)}개 제품 발견")
             return products
             
@@ -327,6 +396,35 @@ class ProductSearchService:
             logger.error(f"대체 사이트 검색 실패: {e}")
             return []
     
+    def _parse_fallback_site_html(self, html: str, site_url: str) -> List[Dict]:
+        """검색 결과 HTML에서 제품 이미지 추출 (셀렉터 묶음으로 한 번에 탐색)"""
+        
+        products = []
+        soup = BeautifulSoup(html, "lxml")
+        
+        # 제품 이미지 찾기 (일반적인 셀렉터들을 하나로 묶어 문서를 한 번만 탐색)
+        for img in soup.select(FALLBACK_IMAGE_SELECTOR, limit=20):  # 상위 20개 이미지만 처리
+            src = img.get("src")
+            if not src or src.startswith("data:"):
+                continue
+            
+            # 절대 URL로 변환
+            if not src.startswith("http"):
+                src = urljoin(site_url, src)
+            
+            # 제품명 추출 (근처 텍스트에서)
+            title = self._extract_product_title(img)
+            
+            products.append({
+                "title": title or f"제품 ({len(products) + 1})",
+                "model": "",
+                "image_url": src,
+                "source": "fallback_site",
+                "placeholder_title": not title  # 제품명을 찾지 못해 임시 이름을 붙임
+            })
+        
+        return products
+    
     def _extract_product_title(self, img_element) -> str:
         """이미지 요소에서 제품명 추출"""
         
@@ -360,47 +458,99 @@ class ProductSearchService:
         except Exception:
             return ""
     
-    async def _compare_image_similarity(self, products: List[Dict], target_image_path: str) -> Optional[Dict]:
-        """이미지 유사도 비교"""
+    async def _load_target_features(self, target_image_path: str) -> Dict[str, Any]:
+        """업로드 이미지 로드 및 특징 추출 (스레드에서 실행)"""
+        
+        target_image = await asyncio.to_thread(cv2.imread, target_image_path)
+        if target_image is None:
+            logger.error("타겟 이미지를 로드할 수 없습니다.")
+            return {}
+        return await asyncio.to_thread(self._extract_image_features, target_image)
+    
+    def _match_from_index(self, target_features: Dict[str, Any], brand: str, category: str) -> Optional[Dict]:
+        """카탈로그 이미지 인덱스에서 같은 브랜드/카테고리 중 임계값 이상인 가장 유사한 제품 조회"""
+        
+        matches = image_similarity_index.search(
+            target_features, k=1, min_similarity=self.similarity_threshold, brand=brand, category=category
+        )
+        if not matches:
+            return None
+        
+        match = dict(matches[0])
+        match.pop("key", None)
+        match["source"] = "image_index"
+        return match
+    
+    async def _remember_match(self, match: Dict[str, Any], brand: str, category: str):
+        """매칭된 제품을 다음 검색에서 사이트 요청 없이 찾을 수 있도록 인덱스에 기록
+        
+        제품명을 찾지 못한 대체 사이트 결과는 기록하지 않습니다.
+        """
+        
+        image_key = match.get("image_key")
+        if not image_key or match.get("placeholder_title") or not match.get("title"):
+            return
         
         try:
-            # 타겟 이미지 로드
-            target_image = cv2.imread(target_image_path)
-            if target_image is None:
-                logger.error("타겟 이미지를 로드할 수 없습니다.")
+            features = await asyncio.to_thread(image_feature_cache.load_features, image_key)
+            if not features:
+                return
+            meta = {
+                key: value for key, value in match.items()
+                if key not in ("similarity", "image_key", "placeholder_title")
+            }
+            await asyncio.to_thread(
+                image_similarity_index.add,
+                image_key,
+                features,
+                {**meta, "brand": brand, "category": category}
+            )
+        except Exception as e:
+            logger.warning(f"이미지 인덱스 기록 실패: {e}")
+    
+    async def _compare_image_similarity(
+        self,
+        products: List[Dict],
+        target_image_path: str,
+        target_features: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict]:
+        """이미지 유사도 비교
+        
+        후보 이미지를 제한된 동시성으로 내려받고 특징 추출은 스레드에서 수행합니다.
+        임계값을 여유 있게 넘는 후보가 나오면 나머지 후보 처리를 중단합니다.
+        """
+        
+        try:
+            # 타겟 이미지 특징
+            if not target_features:
+                target_features = await self._load_target_features(target_image_path)
+            if not target_features:
                 return None
             
-            target_features = self._extract_image_features(target_image)
+            semaphore = asyncio.Semaphore(settings.image_download_concurrency)
+            early_stop_similarity = self.similarity_threshold + settings.image_similarity_early_stop_margin
             
-            best_match = None
-            best_similarity = 0
+            tasks = [
+                asyncio.ensure_future(self._score_candidate(product, target_features, semaphore))
+                for product in products
+            ]
             
-            for product in products:
-                try:
-                    # 제품 이미지 다운로드
-                    product_image = await self._download_image(product["image_url"])
-                    if product_image is None:
+            best_match = None
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    candidate = await next_done
+                    if candidate is None:
                         continue
                     
-                    # 이미지 특징 추출
-                    product_features = self._extract_image_features(product_image)
+                    if best_match is None or candidate["similarity"] > best_match["similarity"]:
+                        best_match = candidate
                     
-                    # 유사도 계산
-                    similarity = self._calculate_similarity(target_features, product_features)
-                    
-                    if similarity > best_similarity:
-                        best_similarity = similarity
-                        best_match = {
-                            **product,
-                            "similarity": similarity
-                        }
-                    
-                    # 메모리 정리
-                    del product_image
-                    
-                except Exception as e:
-                    logger.warning(f"제품 이미지 처리 실패: {e}")
-                    continue
+                    if candidate["similarity"] >= early_stop_similarity:
+                        logger.info(f"유사도 {candidate['similarity']:.2f} 후보 발견, 나머지 후보 비교 중단")
+                        break
+            finally:
+                for task in tasks:
+                    task.cancel()
             
             # 임계값 이상인 경우만 반환
             if best_match and best_match["similarity"] >= self.similarity_threshold:
@@ -412,27 +562,85 @@ class ProductSearchService:
             logger.error(f"이미지 유사도 비교 실패: {e}")
             return None
     
-    async def _download_image(self, image_url: str) -> Optional[np.ndarray]:
-        """이미지 다운로드"""
+    async def _score_candidate(
+        self,
+        product: Dict,
+        target_features: Dict,
+        semaphore: asyncio.Semaphore
+    ) -> Optional[Dict]:
+        """후보 제품 이미지의 특징을 구해 유사도 계산 (캐시 우선)
+
+        image_key에는 특징 캐시 키를 담아, 매칭된 후보만 _remember_match로 인덱스에 기록합니다.
+        """
+        
+        image_url = product["image_url"]
         
         try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-            
-            response = requests.get(image_url, headers=headers, timeout=10)
-            response.raise_for_status()
+            digest = image_feature_cache.lookup_url(image_url)
+            product_features = image_feature_cache.load_features(digest) if digest else None
+            
+            if product_features is None:
+                if digest:
+                    content = await asyncio.to_thread(image_feature_cache.load_image, digest)
+                else:
+                    async with semaphore:
+                        content = await self._download_image_bytes(image_url)
+                    if content is None:
+                        return None
+                    digest = await asyncio.to_thread(image_feature_cache.store_image, image_url, content)
+                
+                if content is None:
+                    return None
+                
+                # 디코딩과 특징 추출은 CPU 작업이므로 스레드에서 실행
+                product_features = await asyncio.to_thread(self._featurize_image_bytes, content)
+                if not product_features:
+                    return None
+                await asyncio.to_thread(image_feature_cache.store_features, digest, product_features)
             
-            # 이미지 데이터를 numpy 배열로 변환
-            image_data = np.frombuffer(response.content, np.uint8)
-            image = cv2.imdecode(image_data, cv2.IMREAD_COLOR)
+            similarity = self._calculate_similarity(target_features, product_features)
+            return {
+                **product,
+                "similarity": similarity,
+                "image_key": digest
+            }
             
-            return image
+        except Exception as e:
+            logger.warning(f"제품 이미지 처리 실패: {e}")
+            return None
+    
+    def _featurize_image_bytes(self, content: bytes) -> Dict[str, Any]:
+        """이미지 바이트를 디코딩하여 특징 추출"""
+        
+        image = cv2.imdecode(np.frombuffer(content, np.uint8), cv2.IMREAD_COLOR)
+        if image is None:
+            return {}
+        return self._extract_image_features(image)
+    
+    async def _download_image_bytes(self, image_url: str) -> Optional[bytes]:
+        """이미지 원본 다운로드 (공유 HTTP 세션 사용)"""
+        
+        try:
+            session = await get_http_session()
+            async with session.get(image_url) as response:
+                response.raise_for_status()
+                return await response.read()
             
         except Exception as e:
             logger.warning(f"이미지 다운로드 실패 ({image_url}): {e}")
             return None
     
+    async def _download_image(self, image_url: str) -> Optional[np.ndarray]:
+        """이미지 다운로드"""
+        
+        content = await self._download_image_bytes(image_url)
+        if content is None:
+            return None
+        
+        # 이미지 데이터를 numpy 배열로 변환
+        image_data = np.frombuffer(content, np.uint8)
+        return cv2.imdecode(image_data, cv2.IMREAD_COLOR)
+    
     def _extract_image_features(self, image: np.ndarray) -> Dict[str, Any]:
         """이미지 특징 추출"""
         
@@ -9,6 +9,9 @@ from core.agent.agent_core import get_agent
 from config.database import memory_db
 from utils.logger import logger
 from utils.file_utils import cleanup_temp_file
+from utils.image_hash import near_duplicate_index, parse_hash
+from .analysis_events import analysis_events
+from .job_queue import Job, job_queue
 
 
 class ProductRecognitionService:
@@ -17,8 +20,8 @@ class ProductRecognitionService:
     def __init__(self):
         self.agent = get_agent()
     
-    async def analyze_product(self, session_id: str) -> Dict[str, Any]:
-        """세션의 업로드된 이미지에서 제품 분석"""
+    async def analyze_product(self, session_id: str, reuse_duplicates: bool = True) -> Dict[str, Any]:
+        """세션의 업로드된 이미지에서 제품 분석 (재촬영 사진이면 이전 결과 재사용)"""
         
         logger.info(f"제품 분석 시작: session_id={session_id}")
         
@@ -42,6 +45,14 @@ class ProductRecognitionService:
                 }
             
             image_path = uploaded_image["file_path"]
+            analysis_events.report("decode", "업로드된 이미지를 확인하고 있습니다.")
+            
+            # 최근 분석한 사진의 재촬영이면 이전 분석 결과 재사용
+            image_hash = parse_hash(uploaded_image["image_hash"]) if uploaded_image.get("image_hash") else None
+            if image_hash is not None and reuse_duplicates:
+                reused = self._reuse_duplicate_analysis(session_id, image_hash)
+                if reused is not None:
+                    return reused
             
             # AI Agent를 통한 제품 인식
             analysis_result = await self.agent.analyze_product_image(image_path, session_id)
@@ -63,6 +74,8 @@ class ProductRecognitionService:
                         "usage_guide": "",
                         "analysis_completed_at": datetime.now().isoformat()
                     })
+                    if image_hash is not None:
+                        near_duplicate_index.remember(image_hash, product_info=product_info, usage_guide="")
                     return {
                         "success": True,
                         "data": {
@@ -76,6 +89,7 @@ class ProductRecognitionService:
                     }
                 
                 # 가전제품인 경우 사용법 가이드 생성
+                analysis_events.report("guide", "사용법 가이드를 작성하고 있습니다.")
                 guide_result = await self.agent.generate_usage_guide(product_info, session_id)
                 
                 if guide_result["success"]:
@@ -83,9 +97,13 @@ class ProductRecognitionService:
                     memory_db.update_session(session_id, {
                         "usage_guide": guide_result["usage_guide"]
                     })
+                    if image_hash is not None:
+                        near_duplicate_index.remember(
+                            image_hash, product_info=product_info, usage_guide=guide_result["usage_guide"]
+                        )
                 
                 logger.info(f"제품 분석 완료: {product_info.get('brand', 'Unknown')} {product_info.get('category', 'Unknown')}")
-
+                
                 
                 return {
                     "success": True,
@@ -101,7 +119,7 @@ class ProductRecognitionService:
             else:
                 logger.error(f"제품 분석 실패: {analysis_result.get('error', 'Unknown error')}")
                 return analysis_result
-                
+        
         except Exception as e:
             logger.error(f"제품 분석 서비스 오류: {str(e)}")
             return {
@@ -110,6 +128,65 @@ class ProductRecognitionService:
                 "timestamp": datetime.now().isoformat()
             }
     
+    def _reuse_duplicate_analysis(self, session_id: str, image_hash: int) -> Optional[Dict[str, Any]]:
+        """재촬영 사진이면 이전 제품 정보와 사용법 가이드를 세션에 복사하여 반환"""
+        
+        duplicate = near_duplicate_index.find(image_hash)
+        if duplicate is None:
+            return None
+        
+        entry, distance = duplicate
+        product_info = entry.get("product_info")
+        usage_guide = entry.get("usage_guide")
+        if product_info is None or usage_guide is None:
+            return None
+        
+        logger.info(f"재촬영 이미지 검출 (해밍 거리 {distance}), 이전 분석 결과 재사용: session_id={session_id}")
+        
+        memory_db.update_session(session_id, {
+            "product_info": product_info,
+            "usage_guide": usage_guide,
+            "analysis_completed_at": datetime.now().isoformat()
+        })
+        
+        is_appliance = product_info.get("category") != "가전제품_아님"
+        return {
+            "success": True,
+            "data": {
+                "product_info": product_info,
+                "usage_guide": usage_guide,
+                "confidence": product_info.get("confidence", 0.0),
+                "analysis_timestamp": datetime.now().isoformat(),
+                "is_appliance": is_appliance,
+                "reused_from_duplicate": True,
+                "duplicate_distance": distance
+            },
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    @staticmethod
+    def build_analysis_data(session: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """세션의 분석 결과 (분석 전이면 None)"""
+        
+        product_info = session.get("product_info")
+        if not product_info:
+            return None
+        
+        # 가전제품 여부 판별
+        is_appliance = True
+        if product_info.get("category") == "가전제품_아님":
+            is_appliance = False
+        elif not product_info.get("success", True):  # success가 False인 경우도 비가전제품
+            is_appliance = False
+        
+        return {
+            "product_info": product_info,
+            "usage_guide": session.get("usage_guide", ""),
+            "analysis_timestamp": session.get("analysis_completed_at", ""),
+            "has_image": "uploaded_image" in session,
+            "is_appliance": is_appliance
+        }
+    
     def get_analysis_result(self, session_id: str) -> Dict[str, Any]:
         """분석 결과 조회"""
         
@@ -122,33 +199,20 @@ class ProductRecognitionService:
                     "timestamp": datetime.now().isoformat()
                 }
             
-            product_info = session.get("product_info")
-            if not product_info:
+            data = self.build_analysis_data(session)
+            if data is None:
                 return {
                     "success": False,
                     "error": "분석된 제품 정보가 없습니다.",
                     "timestamp": datetime.now().isoformat()
                 }
             
-            # 가전제품 여부 판별
-            is_appliance = True
-            if product_info.get("category") == "가전제품_아님":
-                is_appliance = False
-            elif not product_info.get("success", True):  # success가 False인 경우도 비가전제품
-                is_appliance = False
-            
             return {
                 "success": True,
-                "data": {
-                    "product_info": product_info,
-                    "usage_guide": session.get("usage_guide", ""),
-                    "analysis_timestamp": session.get("analysis_completed_at", ""),
-                    "has_image": "uploaded_image" in session,
-                    "is_appliance": is_appliance
-                },
+                "data": data,
                 "timestamp": datetime.now().isoformat()
             }
-            
+        
         except Exception as e:
             logger.error(f"분석 결과 조회 오류: {str(e)}")
             return {
@@ -170,9 +234,9 @@ class ProductRecognitionService:
                 "analysis_completed_at": None
             })
             
-            # 재분석 수행
-            return await self.analyze_product(session_id)
-            
+            # 재분석 수행 (재분석 요청은 이전 결과를 재사용하지 않음)
+            return await self.analyze_product(session_id, reuse_duplicates=False)
+        
         except Exception as e:
             logger.error(f"제품 재분석 오류: {str(e)}")
             return {
@@ -238,4 +302,34 @@ def get_product_service() -> ProductRecognitionService:
     if _service_instance is None:
         _service_instance = ProductRecognitionService()
     
-    return _service_instance 
\ No newline at end of file
+    return _service_instance
+
+
+async def _run_with_events(session_id: str, reanalyze: bool) -> Dict[str, Any]:
+    """분석 실행 중 단계별 진행 이벤트 발행 (완료/실패 이벤트는 작업 상태 기록 후 _publish_finished에서)"""
+    service = get_product_service()
+    with analysis_events.track(session_id):
+        if reanalyze:
+            return await service.reanalyze_product(session_id)
+        return await service.analyze_product(session_id)
+
+
+def _publish_finished(job: Job, result: Dict[str, Any]):
+    """작업이 끝난 상태로 기록된 뒤 완료/실패 이벤트 발행
+
+    이벤트를 받고 결과를 조회한 쪽이 작업을 진행 중으로 보지 않도록 기록 후에 발행합니다.
+    """
+    analysis_events.finish(job.session_id, result)
+
+
+async def _run_analysis_job(session_id: str) -> Dict[str, Any]:
+    return await _run_with_events(session_id, reanalyze=False)
+
+
+async def _run_reanalysis_job(session_id: str) -> Dict[str, Any]:
+    return await _run_with_events(session_id, reanalyze=True)
+
+
+# 분석/재분석은 같은 그룹으로 묶어 세션당 하나만 실행
+job_queue.register("analyze", _run_analysis_job, group="analysis", on_finished=_publish_finished)
+job_queue.register("reanalyze", _run_reanalysis_job, group="analysis", on_finished=_publish_finished)
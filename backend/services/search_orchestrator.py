@@ -0,0 +1,203 @@
+"""
+다중 소스 제품 검색 오케스트레이터 - 동시 검색 후 첫 번째 양질의 결과 채택
+"""
+
+import asyncio
+from typing import Dict, List, Optional, Any, Awaitable, Tuple
+
+from config.settings import settings
+from utils.logger import logger
+from .simple_product_search_service import simple_product_search_service
+
+
+# 모델명을 찾지 못했을 때 검색 서비스가 사용하는 자리표시 값
+MODEL_PLACEHOLDERS = {"", "모델명 확인 필요", "확인 불가", "모델 미상"}
+
+
+class SearchOrchestrator:
+    """다중 소스 제품 검색 오케스트레이터
+
+    네이버 쇼핑(브랜드 동의어 쿼리 변형 포함), 네이버 이미지, Google Custom Search를
+    동시에 실행하고 품질 기준을 넘는 첫 결과를 채택합니다. 나머지 요청은 취소하며
+    전체 검색에 하나의 제한 시간을 적용합니다.
+    """
+
+    def __init__(self, search_service=None):
+        self.search_service = search_service or simple_product_search_service
+
+    async def search(
+        self,
+        brand: str,
+        category: str,
+        image_path: Optional[str] = None,
+        extracted_texts: Optional[List[Dict[str, Any]]] = None,
+        deadline_seconds: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """모든 소스를 동시에 검색하여 제품 상세 정보 반환"""
+
+        deadline = deadline_seconds or settings.search_deadline_seconds
+        threshold = settings.search_quality_threshold
+
+        sources = self._build_sources(brand, category, image_path, extracted_texts)
+        logger.info(f"다중 소스 제품 검색 시작: {brand} - {category} ({len(sources)}개 소스, 제한 {deadline}초)")
+
+        loop = asyncio.get_running_loop()
+        end_time = loop.time() + deadline
+        tasks = {asyncio.ensure_future(coro): name for name, coro in sources}
+
+        best: Optional[Dict[str, Any]] = None
+        winner: Optional[Dict[str, Any]] = None
+
+        try:
+            while tasks and winner is None:
+                remaining = end_time - loop.time()
+                if remaining <= 0:
+                    break
+
+                done, _ = await asyncio.wait(
+                    tasks.keys(), timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+
+                for task in done:
+                    name = tasks.pop(task)
+                    if task.cancelled():
+                        continue
+                    if task.exception() is not None:
+                        logger.warning(f"검색 소스 실패 ({name}): {task.exception()}")
+                        continue
+
+                    candidate = task.result()
+                    if candidate is None:
+                        continue
+
+                    logger.info(f"검색 소스 완료 ({name}): 점수 {candidate['score']:.2f}")
+                    if best is None or candidate["score"] > best["score"]:
+                        best = candidate
+                    if candidate["score"] >= threshold:
+                        winner = candidate
+                        break
+        finally:
+            # 남은 요청 취소
+            for task in tasks:
+                task.cancel()
+
+        if tasks and winner is None:
+            logger.info(f"검색 제한 시간 도달, 미완료 소스 취소: {list(tasks.values())}")
+
+        result = winner or best
+        if result is None:
+            return {
+                "success": False,
+                "error": "모든 검색 소스에서 제품을 찾지 못했습니다.",
+                "message": "제품 정보를 찾을 수 없습니다."
+            }
+
+        return {
+            "success": True,
+            "source": result["source"],
+            "score": result["score"],
+            "met_quality_bar": winner is not None,
+            "product_details": result["product_details"]
+        }
+
+    def _build_sources(
+        self,
+        brand: str,
+        category: str,
+        image_path: Optional[str],
+        extracted_texts: Optional[List[Dict[str, Any]]]
+    ) -> List[Tuple[str, Awaitable[Optional[Dict[str, Any]]]]]:
+        """검색 소스 목록 구성"""
+
+        sources = []
+
+        for query in self.search_service.build_query_variants(brand, category):
+            sources.append((f"naver_shopping:{query}", self._search_shopping(brand, category, query)))
+
+        if image_path:
+            sources.append(("naver_image", self._search_image(brand, category, image_path, extracted_texts)))
+
+        if self.search_service.search_apis["google"]["enabled"]:
+            query = self.search_service.build_query_variants(brand, category)[0]
+            sources.append(("google", self._search_google(brand, category, query)))
+
+        return sources
+
+    async def _search_shopping(self, brand: str, category: str, query: str) -> Optional[Dict[str, Any]]:
+        """네이버 쇼핑 검색 소스"""
+        search_result = await self.search_service.search_product(brand, category, query=query)
+        if not search_result.get("success"):
+            return None
+        return self._make_candidate("naver_shopping", brand, category, search_result)
+
+    async def _search_google(self, brand: str, category: str, query: str) -> Optional[Dict[str, Any]]:
+        """Google Custom Search 소스"""
+        search_result = await self.search_service.search_google(query)
+        if not search_result.get("success"):
+            return None
+        return self._make_candidate("google", brand, category, search_result)
+
+    async def _search_image(
+        self,
+        brand: str,
+        category: str,
+        image_path: str,
+        extracted_texts: Optional[List[Dict[str, Any]]]
+    ) -> Optional[Dict[str, Any]]:
+        """네이버 이미지 검색 소스"""
+        search_result = await self.search_service.search_product_by_image(
+            image_path, brand, category, extracted_texts=extracted_texts
+        )
+        if not search_result.get("success"):
+            return None
+
+        product_info = search_result["product_info"]
+        # 모의 이미지 검색 결과는 OCR 텍스트만으로 만든 것이므로 _score에서 점수를 제한
+        is_mock = search_result.get("search_method", "").endswith("_mock")
+        product_details = {
+            "brand": product_info["brand"],
+            "category": product_info["category"] if product_info["category"] != "기타" else category,
+            "title": f"{product_info['brand']} {product_info['model']}",
+            "model": product_info["model"],
+            "confidence": product_info["confidence"],
+            "search_method": "image_based_search_mock" if is_mock else "image_based_search",
+            "similarity": product_info["confidence"]
+        }
+        return {
+            "source": "naver_image",
+            "score": self._score(product_details, brand),
+            "product_details": product_details
+        }
+
+    def _make_candidate(self, source: str, brand: str, category: str, search_result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """텍스트 검색 결과를 후보로 변환"""
+        product_details = self.search_service.build_product_details(brand, category, search_result)
+        if product_details is None:
+            return None
+        return {
+            "source": source,
+            "score": self._score(product_details, brand),
+            "product_details": product_details
+        }
+
+    @staticmethod
+    def _score(product_details: Dict[str, Any], brand: str) -> float:
+        """결과 품질 점수 (모델명 확인 여부, 브랜드 일치, 모의 결과 여부)"""
+
+        score = 0.4
+        if product_details.get("model", "") not in MODEL_PLACEHOLDERS:
+            score += 0.4
+        if brand and brand.lower() in str(product_details.get("brand", "")).lower():
+            score += 0.2
+
+        # 모의 결과는 품질 기준을 넘지 못하도록 제한
+        if str(product_details.get("search_method", "")).endswith("_mock"):
+            score = min(score, 0.3)
+
+        return score
+
+
+# 전역 오케스트레이터 인스턴스
+search_orchestrator = SearchOrchestrator()
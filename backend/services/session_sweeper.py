@@ -0,0 +1,145 @@
+"""
+만료 세션 정리 작업 - 만료된 세션과 임시 업로드 파일을 백그라운드에서 삭제
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from config.database import SessionStore, session_store
+from config.settings import settings
+from utils.logger import logger
+from .chat_history_store import chat_history_store
+
+
+class SessionSweeper:
+    """만료 세션 정리 작업
+
+    세션 저장소의 만료 시각 순서(메모리: 최소 힙, SQLite: expires_at 인덱스)로
+    만료된 세션을 배치 단위로 꺼내고, 각 세션의 temp_files를 스레드에서 삭제합니다.
+    다음 만료 시각까지(최대 interval_seconds) 잠들었다가 깨어나므로
+    만료 직후 바로 정리하면서도 전체 세션을 주기적으로 훑지 않습니다.
+    """
+
+    def __init__(self, store: SessionStore, interval_seconds: float = 60.0, batch_size: int = 100):
+        self.store = store
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+        self.stats = {
+            "sweeps": 0,
+            "reclaimed_sessions": 0,
+            "reclaimed_files": 0,
+            "reclaimed_bytes": 0,
+            "failed_files": 0,
+            "last_sweep_at": None
+        }
+
+    @staticmethod
+    def _delete_files(file_paths: List[str]) -> Dict[str, int]:
+        """임시 파일 삭제 (스레드에서 실행)"""
+        result = {"files": 0, "bytes": 0, "failed": 0}
+        for file_path in file_paths:
+            try:
+                size = os.path.getsize(file_path)
+                os.remove(file_path)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.warning(f"만료 세션 파일 삭제 실패: {file_path} ({e})")
+                result["failed"] += 1
+                continue
+            result["files"] += 1
+            result["bytes"] += size
+        return result
+
+    async def sweep_once(self) -> Dict[str, int]:
+        """만료된 세션을 모두 정리하고 이번에 회수한 세션/파일/바이트 수 반환"""
+        reclaimed = {"sessions": 0, "files": 0, "bytes": 0, "failed": 0}
+
+        while True:
+            expired = await asyncio.to_thread(self.store.pop_expired, self.batch_size)
+            if not expired:
+                break
+
+            for session in expired:
+                chat_history_store.drop(session["session_id"])
+            file_paths = [path for session in expired for path in session.get("temp_files") or []]
+            deleted = await asyncio.to_thread(self._delete_files, file_paths)
+
+            reclaimed["sessions"] += len(expired)
+            reclaimed["files"] += deleted["files"]
+            reclaimed["bytes"] += deleted["bytes"]
+            reclaimed["failed"] += deleted["failed"]
+
+            if len(expired) < self.batch_size:
+                break
+
+        self.stats["sweeps"] += 1
+        self.stats["reclaimed_sessions"] += reclaimed["sessions"]
+        self.stats["reclaimed_files"] += reclaimed["files"]
+        self.stats["reclaimed_bytes"] += reclaimed["bytes"]
+        self.stats["failed_files"] += reclaimed["failed"]
+        self.stats["last_sweep_at"] = datetime.now().isoformat()
+
+        if reclaimed["sessions"]:
+            logger.info(
+                f"만료 세션 정리: 세션 {reclaimed['sessions']}개, "
+                f"파일 {reclaimed['files']}개 ({reclaimed['bytes']:,} bytes)"
+            )
+        return reclaimed
+
+    def _next_delay(self) -> float:
+        """다음 만료 시각까지 대기 시간 (최대 interval_seconds)"""
+        next_expiry = self.store.next_expiry()
+        if next_expiry is None:
+            return self.interval_seconds
+        return min(self.interval_seconds, max(0.5, next_expiry - time.time()))
+
+    async def _run(self):
+        while True:
+            try:
+                await self.sweep_once()
+                delay = await asyncio.to_thread(self._next_delay)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"만료 세션 정리 오류: {e}")
+                delay = self.interval_seconds
+
+            await asyncio.sleep(delay)
+
+    def start(self):
+        """백그라운드 정리 작업 시작"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info("만료 세션 정리 작업 시작")
+
+    async def stop(self):
+        """백그라운드 정리 작업 중지"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """정리 작업 통계"""
+        return {
+            **self.stats,
+            "running": self._task is not None and not self._task.done()
+        }
+
+
+# 전역 만료 세션 정리 작업 인스턴스
+session_sweeper = SessionSweeper(
+    session_store,
+    interval_seconds=settings.session_sweep_interval_seconds,
+    batch_size=settings.session_sweep_batch_size
+)
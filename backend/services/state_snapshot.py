@@ -0,0 +1,104 @@
+"""
+상태 스냅샷 서비스 - 종료 시 세션과 채팅 로그를 저장하고 시작 시 지연 복원
+"""
+
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from config.database import MemoryDatabase, SessionStore, session_store
+from config.settings import settings
+from utils.logger import logger
+from utils.session_snapshot import MSGPACK_AVAILABLE, open_snapshot, pack_value, write_snapshot
+from .chat_history_store import ChatHistoryStore, chat_history_store
+
+
+class StateSnapshot:
+    """세션/채팅 로그 스냅샷 관리
+
+    - sessions.snap: 메모리 세션 저장소의 세션 (SQLite 저장소는 이미 디스크에 있으므로 제외)
+    - chat_history.snap: 세션별 채팅 로그 (메모리에 있는 최근 메시지와 파일로 내보낸 메시지 위치,
+      SQLite 채팅 로그 저장소는 제외)
+
+    시작할 때는 파일을 메모리 맵으로 연결만 하고, 각 세션은 처음 조회될 때 복원됩니다.
+    아직 복원되지 않은 항목은 다음 저장 때 디코딩 없이 그대로 옮겨 씁니다.
+    에이전트의 LangGraph 체크포인트는 분석 1회용 스레드뿐이고 대화 맥락은
+    세션의 product_info/usage_guide와 채팅 로그에 있으므로 저장하지 않습니다.
+    """
+
+    def __init__(self, root: str, store: SessionStore, chat_store: Any):
+        self.root = Path(root)
+        self.store = store
+        self.chat_store = chat_store
+
+    @property
+    def _sessions_path(self) -> Path:
+        return self.root / "sessions.snap"
+
+    @property
+    def _chat_path(self) -> Path:
+        return self.root / "chat_history.snap"
+
+    def restore(self) -> Dict[str, int]:
+        """스냅샷 연결 (복원 대상 수만 확인)"""
+        restored = {"sessions": 0, "chat_logs": 0}
+        if not MSGPACK_AVAILABLE:
+            logger.warning("msgpack이 설치되지 않아 상태 스냅샷을 사용하지 않습니다.")
+            return restored
+
+        started = time.perf_counter()
+        if isinstance(self.store, MemoryDatabase):
+            reader = open_snapshot(str(self._sessions_path))
+            if reader is not None:
+                restored["sessions"] = self.store.attach_snapshot(reader)
+
+        if isinstance(self.chat_store, ChatHistoryStore):
+            reader = open_snapshot(str(self._chat_path))
+            if reader is not None:
+                restored["chat_logs"] = self.chat_store.attach_snapshot(reader)
+
+        if restored["sessions"] or restored["chat_logs"]:
+            logger.info(
+                f"상태 스냅샷 연결: 세션 {restored['sessions']}개, 채팅 로그 {restored['chat_logs']}개 "
+                f"({(time.perf_counter() - started) * 1000:.1f}ms)"
+            )
+        return restored
+
+    def _session_records(self):
+        for session in self.store.iter_sessions():
+            session_id = session["session_id"]
+            yield session_id, session["expires_at"].timestamp(), pack_value([session_id, session])
+        if self.store.snapshot is not None:
+            yield from self.store.snapshot.iter_raw()
+
+    def _chat_records(self):
+        for session_id, state in self.chat_store.iter_states():
+            yield session_id, None, pack_value([session_id, state])
+        if self.chat_store.snapshot is not None:
+            yield from self.chat_store.snapshot.iter_raw()
+
+    def save(self) -> Dict[str, Any]:
+        """현재 세션과 채팅 로그를 스냅샷으로 저장"""
+        saved = {"sessions": 0, "chat_logs": 0}
+        if not MSGPACK_AVAILABLE:
+            return saved
+
+        started = time.perf_counter()
+        try:
+            if isinstance(self.store, MemoryDatabase):
+                saved["sessions"] = write_snapshot(str(self._sessions_path), self._session_records())
+            if isinstance(self.chat_store, ChatHistoryStore):
+                saved["chat_logs"] = write_snapshot(str(self._chat_path), self._chat_records())
+        except Exception as e:
+            logger.error(f"상태 스냅샷 저장 실패: {e}")
+            return saved
+
+        logger.info(
+            f"상태 스냅샷 저장: 세션 {saved['sessions']}개, 채팅 로그 {saved['chat_logs']}개 "
+            f"({(time.perf_counter() - started) * 1000:.1f}ms)"
+        )
+        return saved
+
+
+# 전역 상태 스냅샷 인스턴스
+state_snapshot = StateSnapshot(settings.snapshot_dir, session_store, chat_history_store)
@@ -0,0 +1,286 @@
+"""
+외부 API 서킷 브레이커 - 업스트림별 장애 차단 및 할당량 추적
+"""
+
+import itertools
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, Mapping, Optional
+
+from config.settings import settings
+from utils.logger import logger
+
+
+class CircuitState(str, Enum):
+    """서킷 상태"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class BreakerPermit:
+    """allow_request()가 허용한 호출 (시험 호출이면 probe_id로 그 시험 호출을 식별)"""
+    probe_id: Optional[int] = None
+
+    @property
+    def is_probe(self) -> bool:
+        return self.probe_id is not None
+
+
+class CircuitBreaker:
+    """업스트림 API 서킷 브레이커
+
+    - closed: 정상 호출, 최근 호출의 실패율이 임계값을 넘으면 open
+    - open: 호출 차단, 쿨다운이 지나면 half_open
+    - half_open: 시험 호출 1회 허용, 성공하면 closed / 실패하면 다시 open
+
+    시험 호출이 결과 없이 끝나면(취소 등) 그 호출의 허가로 release_probe(permit)를 불러 자리를 돌려주며,
+    그마저 없이 쿨다운 시간이 지나면 다음 호출을 새 시험 호출로 허용합니다.
+    인증 실패(401/403)와 할당량 초과(429)는 실패율과 관계없이 즉시 open 됩니다.
+    상태가 바뀔 때만 로그를 한 줄 남깁니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        minimum_calls: int = 5,
+        window_size: int = 20,
+        cooldown_seconds: float = 60.0,
+        daily_quota: Optional[int] = None
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.cooldown_seconds = cooldown_seconds
+        self.daily_quota = daily_quota
+
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._window: deque = deque(maxlen=window_size)  # True = 실패
+        self._opened_until = 0.0
+        self._half_open_probe = False
+        self._probe_started_at = 0.0
+        self._probe_id = 0  # 현재 시험 호출 번호 (release_probe에서 허가와 비교)
+        self._probe_ids = itertools.count(1)
+        self._last_reason = ""
+        self._last_state_change: Optional[str] = None
+
+        # 할당량 추적
+        self._quota_day = date.today()
+        self._calls_today = 0
+        self._quota: Dict[str, Any] = {}
+
+        self.stats = {"allowed": 0, "rejected": 0, "successes": 0, "failures": 0}
+
+    def _transition(self, new_state: CircuitState, reason: str):
+        """상태 변경 (호출자가 self._lock을 보유해야 함)"""
+        if new_state == self._state:
+            return
+        old_state = self._state
+        self._state = new_state
+        self._last_reason = reason
+        self._last_state_change = datetime.now().isoformat()
+        if new_state == CircuitState.CLOSED:
+            self._window.clear()
+        logger.warning(f"서킷 브레이커 [{self.name}] {old_state.value} → {new_state.value}: {reason}")
+
+    def _open(self, reason: str, cooldown_seconds: Optional[float] = None):
+        """서킷 열기 (호출자가 self._lock을 보유해야 함)"""
+        cooldown = self.cooldown_seconds if cooldown_seconds is None else cooldown_seconds
+        self._opened_until = time.time() + cooldown
+        self._half_open_probe = False
+        self._transition(CircuitState.OPEN, reason)
+
+    def _roll_quota_day(self):
+        """날짜가 바뀌면 일일 호출 수 초기화 (호출자가 self._lock을 보유해야 함)"""
+        today = date.today()
+        if today != self._quota_day:
+            self._quota_day = today
+            self._calls_today = 0
+
+    def allow_request(self) -> Optional[BreakerPermit]:
+        """요청 허용 여부 확인 (허용하면 허가, 차단하면 None)
+
+        half_open에서 허용한 시험 호출의 허가에는 probe_id가 있으며,
+        결과 없이 끝난 시험 호출은 이 허가로 release_probe()를 호출해야 합니다.
+        """
+        with self._lock:
+            self._roll_quota_day()
+
+            if self.daily_quota is not None and self._calls_today >= self.daily_quota:
+                self.stats["rejected"] += 1
+                return None
+
+            if self._state == CircuitState.OPEN:
+                if time.time() < self._opened_until:
+                    self.stats["rejected"] += 1
+                    return None
+                self._transition(CircuitState.HALF_OPEN, "쿨다운 종료, 시험 호출 허용")
+
+            permit = BreakerPermit()
+            if self._state == CircuitState.HALF_OPEN:
+                if self._half_open_probe and time.time() - self._probe_started_at < self.cooldown_seconds:
+                    self.stats["rejected"] += 1
+                    return None
+                self._half_open_probe = True
+                self._probe_started_at = time.time()
+                self._probe_id = next(self._probe_ids)
+                permit = BreakerPermit(probe_id=self._probe_id)
+
+            self._calls_today += 1
+            self.stats["allowed"] += 1
+            return permit
+
+    def record_success(self, headers: Optional[Mapping[str, str]] = None):
+        """성공 기록"""
+        with self._lock:
+            self.stats["successes"] += 1
+            self._update_quota(headers)
+            self._window.append(False)
+
+            if self._state == CircuitState.HALF_OPEN:
+                self._half_open_probe = False
+                self._transition(CircuitState.CLOSED, "시험 호출 성공")
+
+    def record_failure(
+        self,
+        status_code: Optional[int] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        reason: str = ""
+    ):
+        """실패 기록 (401/403/429는 즉시 차단)"""
+        with self._lock:
+            self.stats["failures"] += 1
+            self._update_quota(headers)
+            self._window.append(True)
+            reason = reason or (f"HTTP {status_code}" if status_code else "요청 실패")
+
+            if status_code in (401, 403):
+                self._open(reason)
+                return
+
+            if status_code == 429:
+                self._open(reason, self._retry_after(headers))
+                return
+
+            if self._state == CircuitState.HALF_OPEN:
+                self._open(f"시험 호출 실패 ({reason})")
+                return
+
+            failures = sum(self._window)
+            if len(self._window) >= self.minimum_calls and failures / len(self._window) >= self.failure_rate_threshold:
+                self._open(f"실패율 {failures}/{len(self._window)} ({reason})")
+
+    def release_probe(self, permit: Optional[BreakerPermit]):
+        """결과를 기록하지 못하고 끝난 호출(취소 등)의 시험 호출 자리 반환
+
+        permit이 현재 시험 호출의 허가일 때만 반환하므로, 시험 호출이 아니었거나
+        허가를 받지 못한 호출이 다른 호출의 시험 호출 자리를 풀지 않습니다.
+        """
+        if permit is None or not permit.is_probe:
+            return
+        with self._lock:
+            if (
+                self._state == CircuitState.HALF_OPEN
+                and self._half_open_probe
+                and self._probe_id == permit.probe_id
+            ):
+                self._half_open_probe = False
+
+    def _retry_after(self, headers: Optional[Mapping[str, str]]) -> Optional[float]:
+        """Retry-After 헤더에서 대기 시간 추출"""
+        if not headers:
+            return None
+        try:
+            return float(headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            return None
+
+    def _update_quota(self, headers: Optional[Mapping[str, str]]):
+        """응답 헤더에서 할당량 정보 갱신 (호출자가 self._lock을 보유해야 함)"""
+        if not headers:
+            return
+
+        quota = {}
+        for key, header in (
+            ("limit", "X-RateLimit-Limit"),
+            ("remaining", "X-RateLimit-Remaining"),
+            ("reset", "X-RateLimit-Reset")
+        ):
+            value = headers.get(header)
+            if value is not None:
+                try:
+                    quota[key] = int(float(value))
+                except ValueError:
+                    continue
+
+        if quota:
+            quota["updated_at"] = datetime.now().isoformat()
+            self._quota = quota
+            if quota.get("remaining") == 0:
+                self._open("할당량 소진 (X-RateLimit-Remaining: 0)")
+
+    def reset(self):
+        """서킷 초기화 (API 키 변경 시 등)"""
+        with self._lock:
+            self._half_open_probe = False
+            self._opened_until = 0.0
+            self._transition(CircuitState.CLOSED, "수동 초기화")
+
+    @property
+    def state(self) -> CircuitState:
+        """현재 상태"""
+        return self._state
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 상태 요약"""
+        with self._lock:
+            self._roll_quota_day()
+            failures = sum(self._window)
+            return {
+                "name": self.name,
+                "state": self._state.value,
+                "failure_rate": failures / len(self._window) if self._window else 0.0,
+                "window_calls": len(self._window),
+                "open_remaining_seconds": max(0.0, self._opened_until - time.time()) if self._state == CircuitState.OPEN else 0.0,
+                "last_reason": self._last_reason,
+                "last_state_change": self._last_state_change,
+                "calls_today": self._calls_today,
+                "daily_quota": self.daily_quota,
+                "quota_headers": dict(self._quota),
+                **self.stats
+            }
+
+
+# 업스트림별 서킷 브레이커
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str, daily_quota: Optional[int] = None) -> CircuitBreaker:
+    """업스트림 이름으로 서킷 브레이커 반환 (없으면 생성)"""
+    with _registry_lock:
+        breaker = _circuit_breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name,
+                failure_rate_threshold=settings.circuit_failure_rate_threshold,
+                minimum_calls=settings.circuit_minimum_calls,
+                window_size=settings.circuit_window_size,
+                cooldown_seconds=settings.circuit_cooldown_seconds,
+                daily_quota=daily_quota
+            )
+            _circuit_breakers[name] = breaker
+        return breaker
+
+
+def get_all_circuit_breakers() -> Dict[str, CircuitBreaker]:
+    """등록된 모든 서킷 브레이커 반환"""
+    with _registry_lock:
+        return dict(_circuit_breakers)
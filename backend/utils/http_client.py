@@ -0,0 +1,50 @@
+"""
+공유 HTTP 클라이언트 - 연결 풀을 재사용하는 aiohttp 세션
+"""
+
+import asyncio
+from typing import Optional
+
+import aiohttp
+
+from config.settings import settings
+from utils.logger import logger
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """공유 aiohttp 세션 반환 (이벤트 루프별로 지연 생성)"""
+    global _session, _session_loop
+
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        connector = aiohttp.TCPConnector(
+            limit=settings.http_pool_limit,
+            limit_per_host=settings.http_pool_limit_per_host,
+            ttl_dns_cache=300
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            headers=DEFAULT_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=settings.http_timeout_seconds)
+        )
+        _session_loop = loop
+    return _session
+
+
+async def close_http_session():
+    """공유 aiohttp 세션 종료"""
+    global _session, _session_loop
+
+    if _session is not None and not _session.closed:
+        await _session.close()
+        logger.info("공유 HTTP 세션 종료 완료")
+    _session = None
+    _session_loop = None
@@ -0,0 +1,122 @@
+"""
+이미지 특징 캐시 - 다운로드한 후보 이미지와 특징값을 내용 해시로 디스크에 저장
+"""
+
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from config.settings import settings
+from utils.logger import logger
+
+
+class ImageFeatureCache:
+    """내용 주소 기반 이미지/특징 캐시
+
+    - blobs/<해시 앞 2자리>/<sha256>.img : 다운로드한 이미지 원본
+    - blobs/<해시 앞 2자리>/<sha256>.npz : 추출한 특징값
+    - urls/<sha256(url)> : URL → 내용 해시 (TTL이 지나면 다시 다운로드)
+
+    같은 이미지가 여러 URL로 제공되어도 특징 추출은 한 번만 수행합니다.
+    """
+
+    def __init__(self, root: str, url_ttl_seconds: int = 604800):
+        self.root = Path(root)
+        self.url_ttl_seconds = url_ttl_seconds
+        self.stats = {"url_hits": 0, "feature_hits": 0, "stores": 0}
+
+    def _blob_path(self, digest: str, suffix: str) -> Path:
+        return self.root / "blobs" / digest[:2] / f"{digest}{suffix}"
+
+    def _url_path(self, url: str) -> Path:
+        return self.root / "urls" / hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes):
+        """임시 파일에 쓴 뒤 이름 변경 (동시 쓰기 시 깨진 파일 방지)"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    def lookup_url(self, url: str) -> Optional[str]:
+        """URL에 해당하는 내용 해시 조회 (만료되었거나 원본이 없으면 None)"""
+        path = self._url_path(url)
+        try:
+            if time.time() - path.stat().st_mtime > self.url_ttl_seconds:
+                return None
+            digest = path.read_text().strip()
+        except OSError:
+            return None
+
+        if not self._blob_path(digest, ".img").exists():
+            return None
+        self.stats["url_hits"] += 1
+        return digest
+
+    def store_image(self, url: str, content: bytes) -> str:
+        """다운로드한 이미지 저장 후 내용 해시 반환"""
+        digest = hashlib.sha256(content).hexdigest()
+        try:
+            blob_path = self._blob_path(digest, ".img")
+            if not blob_path.exists():
+                self._write_atomic(blob_path, content)
+            self._write_atomic(self._url_path(url), digest.encode("ascii"))
+            self.stats["stores"] += 1
+        except OSError as e:
+            logger.warning(f"이미지 캐시 저장 실패: {e}")
+        return digest
+
+    def load_image(self, digest: str) -> Optional[bytes]:
+        """저장된 이미지 원본 조회"""
+        try:
+            return self._blob_path(digest, ".img").read_bytes()
+        except OSError:
+            return None
+
+    def load_features(self, digest: str) -> Optional[Dict[str, Any]]:
+        """저장된 특징값 조회"""
+        path = self._blob_path(digest, ".npz")
+        if not path.exists():
+            return None
+        try:
+            with np.load(path) as data:
+                features = {
+                    "color_hist": data["color_hist"].astype(np.float32),
+                    "edge_density": float(data["edge_density"]),
+                    "texture_features": data["texture_features"].tolist()
+                }
+        except Exception as e:
+            logger.warning(f"특징 캐시 로드 실패 ({digest[:12]}): {e}")
+            return None
+        self.stats["feature_hits"] += 1
+        return features
+
+    def store_features(self, digest: str, features: Dict[str, Any]):
+        """특징값 저장"""
+        if not features:
+            return
+        path = self._blob_path(digest, ".npz")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp.npz")
+            np.savez(
+                tmp_path,
+                color_hist=np.asarray(features["color_hist"], dtype=np.float32),
+                edge_density=np.float64(features["edge_density"]),
+                texture_features=np.asarray(features["texture_features"], dtype=np.float64)
+            )
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"특징 캐시 저장 실패: {e}")
+
+
+# 전역 이미지 특징 캐시 인스턴스
+image_feature_cache = ImageFeatureCache(
+    root=settings.image_cache_dir,
+    url_ttl_seconds=settings.image_cache_url_ttl_seconds
+)
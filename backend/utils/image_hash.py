@@ -0,0 +1,164 @@
+"""
+이미지 지각 해시 - 거의 같은 사진(재촬영) 검출
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from PIL import Image
+
+from config.settings import settings
+from utils.logger import logger
+
+
+HASH_BITS = 64
+
+
+def compute_dhash(image_path: str, hash_size: int = 8) -> int:
+    """차이 해시(dHash) 계산
+
+    흑백 (hash_size+1) x hash_size 썸네일에서 이웃 픽셀 밝기 비교 결과를 비트로 만듭니다.
+    조명·크기·압축이 조금 달라도 같은 장면이면 해시가 거의 같습니다.
+    """
+    with Image.open(image_path) as img:
+        thumbnail = img.convert("L").resize((hash_size + 1, hash_size), Image.LANCZOS)
+        pixels = list(thumbnail.getdata())
+
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """두 해시의 해밍 거리"""
+    return bin(a ^ b).count("1")
+
+
+class NearDuplicateIndex:
+    """최근 분석한 이미지 해시 인덱스
+
+    64비트 해시를 (max_distance + 1)개 구간으로 나누어 구간별 역색인을 둡니다.
+    해밍 거리가 max_distance 이하인 두 해시는 적어도 한 구간이 완전히 같으므로
+    (비둘기집 원리), 후보만 확인하여 전체 항목을 훑지 않고 찾을 수 있습니다.
+    항목에는 인식 결과와 사용법 가이드를 저장해 재촬영 사진에 재사용합니다.
+    """
+
+    def __init__(self, max_distance: int = 6, ttl_seconds: int = 3600, max_entries: int = 1000):
+        self.max_distance = max_distance
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        band_count = max_distance + 1
+        band_width = -(-HASH_BITS // band_count)
+        self._bands: List[Tuple[int, int]] = [
+            (start, min(band_width, HASH_BITS - start))
+            for start in range(0, HASH_BITS, band_width)
+        ]
+
+        self._lock = threading.Lock()
+        # 해시 -> 항목 (삽입/갱신 순서 유지)
+        self._entries: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        # (구간 번호, 구간 값) -> 해시 집합
+        self._band_index: Dict[Tuple[int, int], Set[int]] = {}
+
+        self.stats = {"lookups": 0, "hits": 0, "stores": 0, "evictions": 0}
+
+    def _band_keys(self, image_hash: int) -> List[Tuple[int, int]]:
+        return [
+            (band, (image_hash >> start) & ((1 << width) - 1))
+            for band, (start, width) in enumerate(self._bands)
+        ]
+
+    def _remove(self, image_hash: int):
+        """항목 삭제 (호출자가 self._lock을 보유해야 함)"""
+        self._entries.pop(image_hash, None)
+        for key in self._band_keys(image_hash):
+            hashes = self._band_index.get(key)
+            if hashes is not None:
+                hashes.discard(image_hash)
+                if not hashes:
+                    del self._band_index[key]
+
+    def find(self, image_hash: int, max_distance: Optional[int] = None) -> Optional[Tuple[Dict[str, Any], int]]:
+        """가장 가까운 최근 항목과 해밍 거리 반환 (없으면 None)"""
+        limit = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        now = time.time()
+
+        with self._lock:
+            self.stats["lookups"] += 1
+
+            candidates: Set[int] = set()
+            for key in self._band_keys(image_hash):
+                candidates.update(self._band_index.get(key, ()))
+
+            best: Optional[Tuple[int, int]] = None
+            for candidate in candidates:
+                entry = self._entries[candidate]
+                if entry["expires_at"] <= now:
+                    self._remove(candidate)
+                    continue
+                distance = hamming_distance(image_hash, candidate)
+                if distance <= limit and (best is None or distance < best[0]):
+                    best = (distance, candidate)
+
+            if best is None:
+                return None
+
+            self.stats["hits"] += 1
+            return dict(self._entries[best[1]]), best[0]
+
+    def remember(self, image_hash: int, **results: Any):
+        """이미지 해시에 분석 결과 기록 (같은 해시가 있으면 병합)"""
+        with self._lock:
+            entry = self._entries.get(image_hash)
+            if entry is None:
+                entry = {"image_hash": image_hash}
+                self._entries[image_hash] = entry
+                for key in self._band_keys(image_hash):
+                    self._band_index.setdefault(key, set()).add(image_hash)
+
+            entry.update(results)
+            entry["expires_at"] = time.time() + self.ttl_seconds
+            self._entries.move_to_end(image_hash)
+            self.stats["stores"] += 1
+
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.stats["evictions"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """인덱스 통계"""
+        with self._lock:
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "max_distance": self.max_distance
+            }
+
+
+def format_hash(image_hash: int) -> str:
+    """해시를 16진수 문자열로 표시"""
+    return f"{image_hash:016x}"
+
+
+def parse_hash(value: str) -> Optional[int]:
+    """16진수 해시 문자열을 정수로 변환"""
+    try:
+        return int(value, 16)
+    except (TypeError, ValueError):
+        logger.warning(f"잘못된 이미지 해시: {value}")
+        return None
+
+
+# 전역 재촬영 이미지 인덱스 인스턴스
+near_duplicate_index = NearDuplicateIndex(
+    max_distance=settings.image_dedup_max_distance,
+    ttl_seconds=settings.image_dedup_ttl_seconds,
+    max_entries=settings.image_dedup_max_entries
+)
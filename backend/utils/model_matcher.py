@@ -0,0 +1,282 @@
+"""
+제품 모델명 매처 - 모델명 문법 추출 및 OCR 오인식 허용 유사도 검색
+"""
+
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+# 모델명 문법 (우선순위 순서의 단일 정규식)
+# AP-1512H, AP1512H, AP-512H, AP512H, 1512AP, AP-12H
+MODEL_GRAMMAR = re.compile(
+    r"[A-Z]{2,3}-?\d{3,4}[A-Z]?"
+    r"|\d{4}[A-Z]{2,3}"
+    r"|[A-Z]{2,3}-\d{2}[A-Z]?"
+)
+
+# OCR 보정 대상 토큰 (영문/숫자 혼합, 하이픈 1개 허용)
+_LOOSE_TOKEN = re.compile(r"(?<![A-Z0-9|])[A-Z0-9|]{2,3}-?[A-Z0-9|]{2,5}(?![A-Z0-9|])")
+_NON_ALNUM = re.compile(r"[^0-9A-Z]")
+
+# OCR에서 자주 혼동되는 문자
+_TO_DIGIT = str.maketrans({"O": "0", "Q": "0", "D": "0", "I": "1", "L": "1", "|": "1",
+                           "S": "5", "B": "8", "Z": "2", "G": "6"})
+_TO_LETTER = str.maketrans({"0": "O", "1": "I", "|": "I", "5": "S", "8": "B", "2": "Z", "6": "G"})
+
+# 비교용 접기 (혼동 문자를 같은 문자로 취급)
+_FOLD = str.maketrans({"O": "0", "Q": "0", "D": "0", "I": "1", "L": "1",
+                       "S": "5", "B": "8", "Z": "2", "G": "6"})
+
+
+def normalize_model(text: str) -> str:
+    """모델명 정규화 (대문자, 영숫자만 유지: 'AP-1512H' → 'AP1512H')"""
+    return _NON_ALNUM.sub("", text.upper())
+
+
+def fold_model(text: str) -> str:
+    """OCR 혼동 문자를 접은 비교용 키 ('AP-I5l2H' → 'AP1512H'와 같은 키)"""
+    return normalize_model(text).translate(_FOLD)
+
+
+def levenshtein(a: str, b: str) -> int:
+    """편집 거리"""
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb)
+            ))
+        previous = current
+    return previous[-1]
+
+
+def _single_deletions(key: str) -> Set[str]:
+    """키와 키에서 한 글자를 지운 문자열들 (편집 거리 1 이내 후보 색인용)"""
+    return {key, *(key[:i] + key[i + 1:] for i in range(len(key)))}
+
+
+def _repair_token(token: str, require_change: bool = False) -> Optional[str]:
+    """OCR 오인식 토큰을 모델명 문법에 맞게 보정 (예: 'AP-l5I2H' → 'AP-1512H')
+
+    require_change이면 숫자 자리의 글자를 숫자로 하나 이상 바꾼 보정만 반환합니다
+    (문법에 맞는 토큰의 다른 해석, 예: 'APL512H' → 'AP1512H').
+    """
+    has_hyphen = "-" in token
+    compact = token.replace("-", "")
+
+    # 하이픈이 있으면 하이픈 앞부분이 영문 접두어
+    prefix_lengths = (token.index("-"),) if has_hyphen else (2, 3)
+
+    best: Optional[Tuple[int, str]] = None
+    for prefix_len in prefix_lengths:
+        for digit_len in (4, 3):
+            rest = compact[prefix_len + digit_len:]
+            if len(rest) > 1 or len(compact) < prefix_len + digit_len:
+                continue
+
+            raw_prefix = compact[:prefix_len]
+            raw_digits = compact[prefix_len:prefix_len + digit_len]
+            prefix = raw_prefix.translate(_TO_LETTER)
+            digits = raw_digits.translate(_TO_DIGIT)
+            suffix = rest.translate(_TO_LETTER)
+
+            if not (prefix.isalpha() and digits.isdigit() and (not suffix or suffix.isalpha())):
+                continue
+
+            # 숫자 부분의 절반 이상은 원래 숫자여야 함 (일반 단어 오탐 방지)
+            real_digits = sum(ch.isdigit() for ch in raw_digits)
+            substitutions = (
+                sum(a != b for a, b in zip(raw_prefix, prefix))
+                + sum(a != b for a, b in zip(raw_digits, digits))
+                + sum(a != b for a, b in zip(rest, suffix))
+            )
+            if real_digits * 2 < digit_len or substitutions > 2:
+                continue
+            if require_change and (raw_digits == digits or raw_prefix != prefix or rest != suffix):
+                continue
+
+            candidate = f"{prefix}-{digits}{suffix}" if has_hyphen else f"{prefix}{digits}{suffix}"
+            if best is None or substitutions < best[0]:
+                best = (substitutions, candidate)
+
+    return best[1] if best else None
+
+
+def _looks_misread(original: str, repaired: str) -> bool:
+    """보정에서 바꾼 글자가 모두 대문자 토큰 속 소문자인지 (예: 'APl512H'의 l)"""
+    changed = [ch for ch, fixed in zip(original, repaired) if ch.upper() != fixed]
+    return (
+        bool(changed)
+        and any(ch.isupper() for ch in original)
+        and all(ch.islower() for ch in changed)
+    )
+
+
+class _BKNode:
+    """BK-트리 노드"""
+    __slots__ = ("key", "children")
+
+    def __init__(self, key: str):
+        self.key = key
+        self.children: Dict[int, "_BKNode"] = {}
+
+
+class ModelMatcher:
+    """모델명 추출기 및 알려진 모델명 유사도 인덱스
+
+    - 추출: 단일 컴파일 정규식으로 모델명을 찾고, 실패하면 OCR 혼동 문자(O/0, l/1, S/5 등)를
+      보정한 뒤 다시 시도합니다.
+    - 유사도 검색: 알려진 모델명을 혼동 문자를 접은 키로 저장하고 편집 거리 기준 상위 k개 후보를
+      반환합니다. 편집 거리 1 이내(OCR 보정에서 주로 쓰는 경우)는 한 글자 삭제 색인으로 후보를
+      바로 찾고, 그보다 큰 거리는 길이 차이가 max_distance 이내인 길이별 BK-트리만 탐색합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 키 길이 -> BK-트리 루트
+        self._roots: Dict[int, _BKNode] = {}
+        # 한 글자 삭제 문자열 -> 접은 키 집합 (두 키의 편집 거리가 1 이내면 공통 원소가 있음)
+        self._deletions: Dict[str, Set[str]] = {}
+        # 접은 키 -> 원래 모델명 목록
+        self._models: Dict[str, List[str]] = {}
+
+    def add_known(self, model: str):
+        """알려진 모델명 등록"""
+        key = fold_model(model)
+        if not key:
+            return
+
+        with self._lock:
+            models = self._models.setdefault(key, [])
+            if model in models:
+                return
+            models.append(model)
+            if len(models) > 1:
+                return
+
+            for deletion in _single_deletions(key):
+                self._deletions.setdefault(deletion, set()).add(key)
+
+            node = self._roots.get(len(key))
+            if node is None:
+                self._roots[len(key)] = _BKNode(key)
+                return
+
+            while True:
+                distance = levenshtein(key, node.key)
+                if distance == 0:
+                    return
+                child = node.children.get(distance)
+                if child is None:
+                    node.children[distance] = _BKNode(key)
+                    return
+                node = child
+
+    def add_known_many(self, models: Iterable[str]):
+        """알려진 모델명 일괄 등록"""
+        for model in models:
+            self.add_known(model)
+
+    def match(self, text: str, k: int = 5, max_distance: int = 2) -> List[Tuple[str, int, float]]:
+        """알려진 모델명 중 유사한 상위 k개 (모델명, 편집 거리, 점수) 반환"""
+        key = fold_model(text)
+        if not key:
+            return []
+
+        results: List[Tuple[int, str]] = []
+        with self._lock:
+            if max_distance <= 1:
+                candidates: Set[str] = set()
+                for deletion in _single_deletions(key) if max_distance == 1 else (key,):
+                    candidates.update(self._deletions.get(deletion, ()))
+                for folded in candidates:
+                    distance = levenshtein(key, folded)
+                    if distance <= max_distance:
+                        results.append((distance, folded))
+            else:
+                stack = [
+                    self._roots[length]
+                    for length in range(len(key) - max_distance, len(key) + max_distance + 1)
+                    if length in self._roots
+                ]
+                while stack:
+                    node = stack.pop()
+                    distance = levenshtein(key, node.key)
+                    if distance <= max_distance:
+                        results.append((distance, node.key))
+                    low, high = distance - max_distance, distance + max_distance
+                    for child_distance, child in node.children.items():
+                        if low <= child_distance <= high:
+                            stack.append(child)
+
+            results.sort()
+            matches = []
+            for distance, folded in results[:k]:
+                score = 1.0 - distance / max(len(key), len(folded))
+                for model in self._models[folded]:
+                    matches.append((model, distance, round(score, 3)))
+            return matches[:k]
+
+    def extract_models(self, text: str) -> List[str]:
+        """텍스트에서 모델명 후보 추출 (OCR 보정 후보 포함, 텍스트 순서)
+
+        문법에 맞는 토큰도 혼동 문자가 섞여 있으면 보정한 후보를 함께 반환합니다
+        ('APl512H' → 'AP1512H', 'APL512H'). 대문자 사이에 소문자로 읽힌 글자만 바꾼 보정은
+        OCR 오인식일 가능성이 높으므로 원래 토큰보다 앞에 둡니다.
+        """
+        upper = text.upper()
+        # (위치, 같은 위치에서의 순서, 모델명)
+        found: List[Tuple[int, int, str]] = []
+        repaired_spans: List[Tuple[int, int]] = []
+
+        for match in _LOOSE_TOKEN.finditer(upper):
+            token = match.group()
+            if not MODEL_GRAMMAR.fullmatch(token):
+                # 문법에 맞지 않는 토큰은 보정 후 문법에 맞으면 토큰 전체를 모델명으로 사용
+                repaired = _repair_token(token)
+                if repaired:
+                    found.append((match.start(), 0, repaired))
+                    repaired_spans.append(match.span())
+                continue
+
+            repaired = _repair_token(token, require_change=True)
+            if repaired:
+                original = text[match.start():match.end()] if len(text) == len(upper) else token
+                found.append((match.start(), 0 if _looks_misread(original, repaired) else 2, repaired))
+
+        for match in MODEL_GRAMMAR.finditer(upper):
+            if any(start <= match.start() < end for start, end in repaired_spans):
+                continue
+            found.append((match.start(), 1, match.group()))
+
+        unique: List[str] = []
+        for _, _, model in sorted(found):
+            if model not in unique:
+                unique.append(model)
+        return unique
+
+    def extract_model(self, text: str, max_distance: int = 0) -> Optional[str]:
+        """텍스트에서 가장 가능성 높은 모델명 하나 추출 (알려진 모델명이면 정식 표기로 반환)"""
+        candidates = self.extract_models(text)
+        for candidate in candidates:
+            matches = self.match(candidate, k=1, max_distance=max_distance)
+            if matches:
+                return matches[0][0]
+        return candidates[0] if candidates else None
+
+    def get_stats(self) -> Dict[str, int]:
+        """인덱스 통계"""
+        with self._lock:
+            return {"known_keys": len(self._models)}
+
+
+# 전역 모델명 매처 인스턴스
+model_matcher = ModelMatcher()
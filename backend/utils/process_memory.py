@@ -0,0 +1,41 @@
+"""
+프로세스 메모리 사용량 조회 (/proc/<pid>/smaps_rollup)
+"""
+
+from typing import Dict, Optional, Union
+
+
+# smaps_rollup 항목 -> 결과 키
+_ROLLUP_FIELDS = {
+    "Rss": "rss_kb",
+    "Pss": "pss_kb",
+    "Shared_Clean": "shared_clean_kb",
+    "Shared_Dirty": "shared_dirty_kb",
+    "Private_Clean": "private_clean_kb",
+    "Private_Dirty": "private_dirty_kb"
+}
+
+
+def read_memory_usage(pid: Union[int, str] = "self") -> Optional[Dict[str, int]]:
+    """프로세스의 RSS/PSS/공유/전용 메모리 (KB)
+
+    프리포크 워커들이 마스터에서 물려받은 페이지는 shared_kb로 잡히며,
+    PSS는 공유 페이지를 공유 프로세스 수로 나눠 더한 실제 부담입니다.
+    Linux가 아니거나 읽을 수 없으면 None을 반환합니다.
+    """
+    usage: Dict[str, int] = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", encoding="ascii") as f:
+            for line in f:
+                name, _, rest = line.partition(":")
+                key = _ROLLUP_FIELDS.get(name)
+                if key:
+                    usage[key] = int(rest.split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+
+    if not usage:
+        return None
+    usage["shared_kb"] = usage.get("shared_clean_kb", 0) + usage.get("shared_dirty_kb", 0)
+    usage["private_kb"] = usage.get("private_clean_kb", 0) + usage.get("private_dirty_kb", 0)
+    return usage
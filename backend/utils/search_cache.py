@@ -0,0 +1,244 @@
+"""
+검색 결과 캐시 - 메모리 LRU + SQLite 2단계 캐시
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from config.settings import settings
+from utils.logger import logger
+
+
+def is_negative_result(result: Dict[str, Any]) -> bool:
+    """실패했거나 결과가 비어 있는(또는 모의) 응답인지 확인"""
+    if not result.get("success") or not result.get("results"):
+        return True
+    return str(result.get("search_method", "")).endswith("_mock")
+
+
+class SearchCache:
+    """검색 결과 2단계 캐시 (메모리 LRU + SQLite 파일)
+
+    - 키는 정규화된 검색어와 파라미터로 구성됩니다.
+    - 실패/빈 응답은 짧은 TTL로 캐시합니다 (네거티브 캐시).
+    - 동일한 키의 동시 요청은 하나의 업스트림 요청을 공유합니다.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_entries: int = 1024,
+        ttl_seconds: int = 86400,
+        negative_ttl_seconds: int = 300,
+        enabled: bool = True
+    ):
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.enabled = enabled
+
+        # 1단계: 메모리 LRU (key -> (만료 시각, JSON 문자열))
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 2단계: SQLite (프로세스별 연결, 포크 이후 재연결)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._writes_since_purge = 0
+
+        # 진행 중인 업스트림 요청 (key -> Task)
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "negative_stores": 0
+        }
+
+    @staticmethod
+    def make_key(namespace: str, query: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """정규화된 검색어와 파라미터로 캐시 키 생성"""
+        normalized_query = " ".join(query.lower().split())
+        payload = json.dumps(
+            {"ns": namespace, "q": normalized_query, "p": params or {}},
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _get_connection(self) -> Optional[sqlite3.Connection]:
+        """SQLite 연결 반환 (호출자가 self._lock을 보유해야 함)"""
+        if self._conn is not None and self._conn_pid == os.getpid():
+            return self._conn
+
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS search_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_search_cache_expires ON search_cache(expires_at)")
+            conn.commit()
+            self._conn = conn
+            self._conn_pid = os.getpid()
+        except Exception as e:
+            logger.warning(f"검색 캐시 DB 연결 실패, 메모리 캐시만 사용: {e}")
+            self._conn = None
+
+        return self._conn
+
+    def _remember(self, key: str, expires_at: float, value: str):
+        """메모리 LRU에 저장 (호출자가 self._lock을 보유해야 함)"""
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """캐시 조회 (메모리 → SQLite 순서)"""
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return json.loads(entry[1])
+                del self._memory[key]
+
+            conn = self._get_connection()
+            if conn is not None:
+                try:
+                    row = conn.execute(
+                        "SELECT value, expires_at FROM search_cache WHERE key = ?", (key,)
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    logger.warning(f"검색 캐시 조회 실패: {e}")
+                    row = None
+
+                if row is not None and row[1] > now:
+                    self._remember(key, row[1], row[0])
+                    self.stats["disk_hits"] += 1
+                    return json.loads(row[0])
+
+            self.stats["misses"] += 1
+            return None
+
+    def set(self, key: str, value: Dict[str, Any], ttl_seconds: Optional[int] = None):
+        """캐시 저장"""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl <= 0:
+            return
+
+        expires_at = time.time() + ttl
+        serialized = json.dumps(value, ensure_ascii=False)
+
+        with self._lock:
+            self._remember(key, expires_at, serialized)
+
+            conn = self._get_connection()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO search_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, serialized, expires_at)
+                )
+                self._writes_since_purge += 1
+                if self._writes_since_purge >= 256:
+                    conn.execute("DELETE FROM search_cache WHERE expires_at <= ?", (time.time(),))
+                    self._writes_since_purge = 0
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"검색 캐시 저장 실패: {e}")
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetcher: Callable[[], Awaitable[Dict[str, Any]]],
+        is_negative: Callable[[Dict[str, Any]], bool] = is_negative_result
+    ) -> Dict[str, Any]:
+        """캐시 조회 후 없으면 업스트림 요청 (동일 키 요청은 합침)"""
+        if not self.enabled:
+            return await fetcher()
+
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+        else:
+            task = asyncio.ensure_future(self._fetch_and_store(key, fetcher, is_negative))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # 한 요청자가 취소되어도 공유 요청은 계속 진행되도록 shield 사용
+        return await asyncio.shield(task)
+
+    async def _fetch_and_store(
+        self,
+        key: str,
+        fetcher: Callable[[], Awaitable[Dict[str, Any]]],
+        is_negative: Callable[[Dict[str, Any]], bool]
+    ) -> Dict[str, Any]:
+        """업스트림 요청 수행 및 결과 캐시"""
+        result = await fetcher()
+
+        if is_negative(result):
+            self.stats["negative_stores"] += 1
+            self.set(key, result, self.negative_ttl_seconds)
+        else:
+            self.set(key, result, self.ttl_seconds)
+
+        return result
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        with self._lock:
+            self._memory.clear()
+            conn = self._get_connection()
+            if conn is not None:
+                try:
+                    conn.execute("DELETE FROM search_cache")
+                    conn.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"검색 캐시 삭제 실패: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계 반환"""
+        with self._lock:
+            return {
+                **self.stats,
+                "enabled": self.enabled,
+                "memory_entries": len(self._memory),
+                "inflight": len(self._inflight),
+                "ttl_seconds": self.ttl_seconds,
+                "negative_ttl_seconds": self.negative_ttl_seconds
+            }
+
+
+# 전역 검색 캐시 인스턴스
+search_cache = SearchCache(
+    db_path=settings.search_cache_path,
+    max_entries=settings.search_cache_max_entries,
+    ttl_seconds=settings.search_cache_ttl_seconds,
+    negative_ttl_seconds=settings.search_cache_negative_ttl_seconds,
+    enabled=settings.search_cache_enabled
+)
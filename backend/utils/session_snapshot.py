@@ -0,0 +1,244 @@
+"""
+세션 스냅샷 - 재시작 전후로 세션/채팅 상태를 보존하는 바이너리 파일
+
+파일 구조 (리틀 엔디언):
+    헤더    magic(8) | 항목 수(u64) | 인덱스 위치(u64) | 만료 목록 위치(u64)
+    데이터  항목별 msgpack [key, value]
+    인덱스  (key 해시 16바이트, 데이터 위치 u64, 길이 u32) - 해시 순 정렬
+    만료    (만료 timestamp f64, 인덱스 번호 u32) - 만료 시각 순 정렬
+
+시작 시에는 파일을 메모리 맵으로 열기만 하고, 항목은 처음 조회될 때
+인덱스를 이진 탐색하여 하나씩 디코딩합니다. 따라서 복원 시간이 세션 수와 무관합니다.
+"""
+
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+from utils.logger import logger
+
+
+MAGIC = b"SESSNAP1"
+HEADER = struct.Struct("<8sQQQ")
+INDEX_ENTRY = struct.Struct("<16sQI")
+EXPIRY_ENTRY = struct.Struct("<dI")
+
+# msgpack 확장 타입
+_EXT_DATETIME = 1
+_EXT_PICKLE = 2
+
+
+def _key_hash(key: str) -> bytes:
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+
+
+def _encode_default(value: Any):
+    """msgpack이 직접 지원하지 않는 값 변환 (datetime, numpy 배열 등)"""
+    if isinstance(value, datetime):
+        return msgpack.ExtType(_EXT_DATETIME, value.isoformat().encode("ascii"))
+    if isinstance(value, (tuple, set, frozenset)):
+        return list(value)
+    return msgpack.ExtType(_EXT_PICKLE, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+
+
+def _decode_ext(code: int, data: bytes):
+    if code == _EXT_DATETIME:
+        return datetime.fromisoformat(data.decode("ascii"))
+    if code == _EXT_PICKLE:
+        return pickle.loads(data)
+    return msgpack.ExtType(code, data)
+
+
+def pack_value(value: Any) -> bytes:
+    """값을 msgpack 바이트로 변환"""
+    return msgpack.packb(value, default=_encode_default, use_bin_type=True)
+
+
+def unpack_value(data: bytes) -> Any:
+    """msgpack 바이트를 값으로 변환"""
+    return msgpack.unpackb(data, ext_hook=_decode_ext, raw=False, strict_map_key=False)
+
+
+def write_snapshot(path: str, records: Iterable[Tuple[str, Optional[float], bytes]]) -> int:
+    """스냅샷 파일 작성 후 항목 수 반환
+
+    records: (key, 만료 timestamp 또는 None, pack_value([key, value]) 결과)
+    기존 SnapshotReader.iter_raw()의 항목은 디코딩 없이 그대로 다시 쓸 수 있습니다.
+    """
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+
+    index: List[Tuple[bytes, int, int]] = []
+    expiries: List[Tuple[float, bytes]] = []
+    seen: Set[str] = set()
+
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, 0, 0, 0))
+        offset = HEADER.size
+        for key, expires_at, raw in records:
+            if key in seen:
+                continue
+            seen.add(key)
+            digest = _key_hash(key)
+            f.write(raw)
+            index.append((digest, offset, len(raw)))
+            if expires_at is not None:
+                expiries.append((expires_at, digest))
+            offset += len(raw)
+
+        index.sort()
+        position = {digest: row for row, (digest, _, _) in enumerate(index)}
+        index_offset = offset
+        for entry in index:
+            f.write(INDEX_ENTRY.pack(*entry))
+
+        expiries.sort()
+        expiry_offset = index_offset + len(index) * INDEX_ENTRY.size
+        for expires_at, digest in expiries:
+            f.write(EXPIRY_ENTRY.pack(expires_at, position[digest]))
+
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, len(index), index_offset, expiry_offset))
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, target)
+    return len(index)
+
+
+class SnapshotReader:
+    """메모리 맵 기반 스냅샷 조회
+
+    복원되었거나 삭제된 항목은 consume()으로 표시하여 다시 반환하지 않습니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._consumed: Set[str] = set()
+        self._expiry_cursor = 0
+
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self._index_offset, self._expiry_offset = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"스냅샷 형식이 아닙니다: {path}")
+        self._expiry_count = (len(self._mm) - self._expiry_offset) // EXPIRY_ENTRY.size
+
+    def _entry(self, row: int) -> Tuple[bytes, int, int]:
+        return INDEX_ENTRY.unpack_from(self._mm, self._index_offset + row * INDEX_ENTRY.size)
+
+    def _read(self, row: int) -> Tuple[str, Any]:
+        _, offset, length = self._entry(row)
+        key, value = unpack_value(self._mm[offset:offset + length])
+        return key, value
+
+    def _find(self, key: str) -> Optional[int]:
+        """key 해시 이진 탐색"""
+        digest = _key_hash(key)
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._entry(middle)[0] < digest:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self._entry(low)[0] == digest:
+            return low
+        return None
+
+    def contains(self, key: str) -> bool:
+        """아직 복원되지 않은 항목이 있는지"""
+        return key not in self._consumed and self._find(key) is not None
+
+    def get(self, key: str) -> Optional[Any]:
+        """아직 복원되지 않은 항목 값 (없으면 None)"""
+        if key in self._consumed:
+            return None
+        row = self._find(key)
+        if row is None:
+            return None
+        stored_key, value = self._read(row)
+        return value if stored_key == key else None
+
+    def consume(self, key: str):
+        """항목을 복원/삭제 완료로 표시"""
+        with self._lock:
+            self._consumed.add(key)
+
+    def pop_expired(self, now: float, limit: Optional[int] = None) -> List[Tuple[str, Any]]:
+        """만료 시각이 지난 미복원 항목을 만료 순으로 꺼냄"""
+        expired: List[Tuple[str, Any]] = []
+        with self._lock:
+            while self._expiry_cursor < self._expiry_count and (limit is None or len(expired) < limit):
+                expires_at, row = EXPIRY_ENTRY.unpack_from(
+                    self._mm, self._expiry_offset + self._expiry_cursor * EXPIRY_ENTRY.size
+                )
+                if expires_at > now:
+                    break
+                self._expiry_cursor += 1
+                key, value = self._read(row)
+                if key not in self._consumed:
+                    self._consumed.add(key)
+                    expired.append((key, value))
+        return expired
+
+    def next_expiry(self) -> Optional[float]:
+        """다음 만료 시각"""
+        if self._expiry_cursor >= self._expiry_count:
+            return None
+        return EXPIRY_ENTRY.unpack_from(
+            self._mm, self._expiry_offset + self._expiry_cursor * EXPIRY_ENTRY.size
+        )[0]
+
+    def iter_raw(self) -> Iterator[Tuple[str, Optional[float], bytes]]:
+        """미복원 항목을 디코딩 없이 반환 (다음 스냅샷 작성용)"""
+        expiries = {}
+        for position in range(self._expiry_cursor, self._expiry_count):
+            expires_at, row = EXPIRY_ENTRY.unpack_from(
+                self._mm, self._expiry_offset + position * EXPIRY_ENTRY.size
+            )
+            expiries[row] = expires_at
+
+        for row in range(self.count):
+            _, offset, length = self._entry(row)
+            raw = self._mm[offset:offset + length]
+            # [key, value] 중 key만 읽음
+            unpacker = msgpack.Unpacker(raw=False)
+            unpacker.feed(raw)
+            unpacker.read_array_header()
+            key = unpacker.unpack()
+            if key not in self._consumed:
+                yield key, expiries.get(row), raw
+
+    @property
+    def remaining(self) -> int:
+        return self.count - len(self._consumed)
+
+    def close(self):
+        self._mm.close()
+
+
+def open_snapshot(path: str) -> Optional[SnapshotReader]:
+    """스냅샷 파일이 있으면 열기"""
+    if not MSGPACK_AVAILABLE or not Path(path).exists():
+        return None
+    try:
+        return SnapshotReader(path)
+    except (OSError, ValueError, struct.error) as e:
+        logger.warning(f"스냅샷 열기 실패: {path} ({e})")
+        return None
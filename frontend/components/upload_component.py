@@ -121,8 +121,9 @@ class ImageUploadComponent:
                     # 세션 ID 저장 (StateManager 사용)
                     StateManager.set_session_id(session_id)
                     
-                    # 제품 인식 결과 확인
-                    product_recognition = data["data"].get("product_recognition", {})
+                    # 제품 인식 결과 확인 (인식은 업로드 후 백그라운드에서 진행되므로
+                    # 재촬영 사진으로 이전 결과를 재사용한 경우에만 바로 있고, 그 외에는 분석 페이지에서 안내)
+                    product_recognition = data["data"].get("product_recognition") or {}
                     
                     # 가전제품이 아닌 경우 즉시 알림
                     if product_recognition.get("category") == "가전제품_아님":
@@ -212,6 +213,15 @@ class ImageUploadComponent:
                 with col3:
                     st.metric("업로드 시간", status_data.get("uploaded_at", "").split("T")[0])
         
+            # 제품 인식 상태 표시
+            recognition_status = status_data.get("recognition_status")
+            if recognition_status in ("queued", "running"):
+                st.info("🔍 제품을 인식하고 있습니다...")
+            elif recognition_status == "done":
+                recognition = status_data.get("product_recognition") or {}
+                if recognition.get("category"):
+                    st.caption(f"인식 결과: {recognition.get('brand', '')} {recognition['category']}")
+        
         elif status_data["status"] == "no_image":
             st.warning("⚠️ 업로드된 이미지가 없습니다.")
             
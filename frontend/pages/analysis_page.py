@@ -3,6 +3,7 @@
 """
 
 import streamlit as st
+import requests
 import time
 from typing import Dict, Any, Optional
 
@@ -53,9 +54,13 @@ class AnalysisProgressPage:
         if current_status == "completed":
             # 분석 완료 - 결과 페이지로 이동
             self._handle_analysis_completion(session_id)
-        elif current_status == "analyzing":
-            # 분석 진행 중
+        elif current_status in ("queued", "analyzing"):
+            # 분석 대기 또는 진행 중
             self._render_analysis_progress(session_id)
+        elif current_status == "failed":
+            # 분석 작업 실패
+            show_error_message(status_data.get("message", "제품 분석에 실패했습니다."))
+            self._render_error_actions()
         elif current_status == "waiting":
             # 이미지 업로드 대기 중
             show_error_message("업로드된 이미지가 없습니다.")
@@ -66,106 +71,36 @@ class AnalysisProgressPage:
             self._render_error_actions()
     
     def _render_analysis_progress(self, session_id: str):
-        """분석 진행 상태 표시"""
-        
-        # 진행률 바와 상태 메시지
-        progress_container = st.container()
-        status_container = st.container()
+        """분석 진행 상태 표시 (백엔드 진행 이벤트를 받는 대로 갱신)"""
         
-        with progress_container:
-            # 애니메이션 효과를 위한 진행률 바
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            
-            # 단계별 진행 상태 표시
-            steps = [
-                {"text": "이미지 업로드 완료", "progress": 20},
-                {"text": "AI 모델 로딩 중...", "progress": 40},
-                {"text": "제품 인식 중...", "progress": 60},
-                {"text": "브랜드 및 모델 분석 중...", "progress": 80},
-                {"text": "사용법 정보 수집 중...", "progress": 95},
-                {"text": "분석 완료!", "progress": 100}
-            ]
-            
-            # 진행 상태 애니메이션
-            for step in steps:
-                progress_bar.progress(step["progress"])
-                status_text.text(step["text"])
-                time.sleep(0.8)  # 각 단계마다 0.8초 대기
+        progress_bar = st.progress(0)
+        status_text = st.empty()
+        st.info("📋 분석이 완료되면 자동으로 결과 페이지로 이동합니다.")
         
-        with status_container:
-            st.info("📋 분석이 완료되면 자동으로 결과 페이지로 이동합니다.")
-            
-            # 예상 시간 안내
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("예상 소요 시간", "30-60초")
-            with col2:
-                st.metric("현재 단계", "AI 분석")
-            with col3:
-                st.metric("진행률", "분석 중...")
-        
-        # 실제 분석 완료 확인 (백그라운드)
-        self._wait_for_completion(session_id)
-    
-    def _wait_for_completion(self, session_id: str):
-        """분석 완료 대기"""
-        
-        # 자동 새로고침을 위한 placeholder
-        auto_refresh = st.empty()
-        
-        with auto_refresh:
-            # 3초 후 자동 새로고침
-            time.sleep(3)
-            
-            # 분석 결과 확인
-            result = self.api_client.get_analysis_result(session_id)
-            
-            # 분석 결과 확인
-            if result["success"]:
-                # 데이터 구조 처리
-                data = result.get("data", {})
-                product_info = data.get("product_info", {})
-                is_appliance = data.get("is_appliance", True)
-                
-                # 가전제품이 아닌 경우 즉시 알림
-                if not is_appliance or product_info.get("category") == "가전제품_아님":
-                    # JavaScript alert 표시
-                    st.markdown("""
-                    <script>
-                    alert("⚠️ 가전제품이 아닙니다!\\n\\n업로드하신 이미지는 가전제품이 아닙니다.\\n가전제품 사진을 촬영하여 다시 업로드해 주세요.");
-                    </script>
-                    """, unsafe_allow_html=True)
-                    
-                    st.error("⚠️ 가전제품이 아닙니다")
-                    st.markdown("업로드하신 이미지는 가전제품이 아닙니다. 가전제품 사진을 촬영하여 다시 업로드해 주세요.")
-                    
-                    # 메인 페이지로 이동 버튼
-                    if st.button("🏠 메인 페이지로 이동", use_container_width=True):
-                        StateManager.clear_state()
-                        StateManager.set_page("main")
-                        st.rerun()
-                    return
+        try:
+            for event in self.api_client.stream_analysis_events(session_id):
+                progress_bar.progress(event.get("progress", 0))
+                status_text.text(event.get("message", ""))
                 
-                # 가전제품인 경우 정상 처리
-                show_success_message("✅ 제품 분석이 완료되었습니다!")
-                time.sleep(1)
-                StateManager.set_page("result")
-                st.rerun()
-            elif not result["success"] and "error" in result:
-                # 분석 실패 또는 가전제품이 아닌 경우
-                error_msg = result.get("error", "분석 중 오류가 발생했습니다.")
-                st.error(f"⚠️ {error_msg}")
-                
-                # 메인 페이지로 이동 버튼
-                if st.button("🏠 메인 페이지로 이동", use_container_width=True):
-                    StateManager.clear_state()
-                    StateManager.set_page("main")
+                if event.get("stage") == "completed":
+                    if event.get("is_appliance", True):
+                        # 결과가 준비되는 즉시 결과 페이지로 이동
+                        StateManager.set_page("result")
+                    # 가전제품이 아니면 완료 처리 화면에서 안내
                     st.rerun()
-                return
-            else:
-                # 아직 진행 중이면 페이지 새로고침
+                elif event.get("stage") == "failed":
+                    show_error_message(f"⚠️ {event.get('message', '제품 분석에 실패했습니다.')}")
+                    self._render_error_actions()
+                    return
+        
+        except requests.exceptions.RequestException:
+            show_error_message("분석 진행 상황을 받을 수 없습니다. 잠시 후 상태를 다시 확인해 주세요.")
+            if st.button("🔄 상태 다시 확인", use_container_width=True):
                 st.rerun()
+            return
+        
+        # 완료 이벤트 없이 연결이 끝난 경우 상태를 다시 확인
+        st.rerun()
     
     def _handle_analysis_completion(self, session_id: str):
         """분석 완료 처리"""
@@ -9,6 +9,7 @@ import time
 from utils.ui_utils import show_header, show_error_message, show_success_message
 from services.api_client import get_api_client, handle_api_error
 from services.state_manager import StateManager
+from utils.constants import UI_CONFIG
 
 
 class ChatInterfacePage:
@@ -36,14 +37,21 @@ class ChatInterfacePage:
             self._send_message(session_id, suggested_question)
             StateManager.clear_suggested_question()
         
+        # 화면에 필요한 데이터를 한 번에 조회
+        view = self._load_session_view(session_id)
+        if view is None:
+            show_error_message("채팅 정보를 불러올 수 없습니다.")
+            self._render_navigation_buttons()
+            return
+        
         # 제품 정보 표시
-        self._render_product_info_header(session_id)
+        self._render_product_info_header(view)
         
         # 채팅 히스토리 표시
-        self._render_chat_history(session_id)
+        self._render_chat_history(view["messages"])
         
         # 추천 질문 표시
-        self._render_suggested_questions(session_id)
+        self._render_suggested_questions(session_id, view)
         
         # 메시지 입력 영역
         self._render_message_input(session_id)
@@ -83,38 +91,54 @@ class ChatInterfacePage:
         
         return True
     
-    def _render_product_info_header(self, session_id: str):
+    def _load_session_view(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """제품 정보, 새 채팅 메시지, 추천 질문을 한 번에 조회하고 채팅 히스토리 캐시 갱신"""
+        
+        cache = st.session_state.get("chat_history_cache")
+        if cache is None or cache["session_id"] != session_id:
+            cache = {"session_id": session_id, "messages": [], "next_after": None}
+        
+        result = self.api_client.get_session_view(
+            session_id, include=["product", "history", "suggestions"], since=cache["next_after"]
+        )
+        if not result["success"]:
+            return None
+        
+        view = result["data"]["data"]
+        history = view["history"]
+        if cache["next_after"] is not None and history.get("total_count", 0) < cache["next_after"]:
+            # 히스토리가 초기화된 경우 처음부터 다시 조회
+            st.session_state.chat_history_cache = None
+            return self._load_session_view(session_id)
+        
+        # 이미 받은 메시지 이후만 추가
+        new_messages = [
+            message for message in history.get("messages", [])
+            if cache["next_after"] is None or message["id"] > cache["next_after"]
+        ]
+        cache["messages"] = (cache["messages"] + new_messages)[-UI_CONFIG["chat_max_messages"]:]
+        cache["next_after"] = history.get("next_after", cache["next_after"])
+        st.session_state.chat_history_cache = cache
+        
+        return {**view, "messages": cache["messages"]}
+    
+    def _render_product_info_header(self, view: Dict[str, Any]):
         """제품 정보 헤더"""
         
-        # 분석 결과에서 제품 정보 가져오기
-        result = self.api_client.get_analysis_result(session_id)
+        product_info = (view.get("product") or {}).get("product_info", {})
         
-        if result["success"]:
-            data = result["data"]["data"]
-            product_info = data.get("product_info", {})
+        if product_info:
+            brand = product_info.get("brand", "알 수 없음")
+            category = product_info.get("category", "가전제품")
+            model = product_info.get("model", "모델 미상")
             
-            if product_info:
-                brand = product_info.get("brand", "알 수 없음")
-                category = product_info.get("category", "가전제품")
-                model = product_info.get("model", "모델 미상")
-                
-                st.info(f"📱 현재 상담 제품: **{brand} {category} {model}**")
-            else:
-                st.warning("제품 정보를 불러올 수 없습니다.")
+            st.info(f"📱 현재 상담 제품: **{brand} {category} {model}**")
+        else:
+            st.warning("제품 정보를 불러올 수 없습니다.")
     
-    def _render_chat_history(self, session_id: str):
+    def _render_chat_history(self, messages: List[Dict[str, Any]]):
         """채팅 히스토리 표시"""
         
-        # 채팅 히스토리 조회
-        result = self.api_client.get_chat_history(session_id, limit=50)
-        
-        if not result["success"]:
-            st.error("채팅 히스토리를 불러올 수 없습니다.")
-            return
-        
-        chat_data = result["data"]["data"]
-        messages = chat_data.get("messages", [])
-        
         if not messages:
             # 첫 대화인 경우 환영 메시지
             st.chat_message("assistant").write(
@@ -131,31 +155,22 @@ class ChatInterfacePage:
                 with st.chat_message(role):
                     st.write(content)
     
-    def _render_suggested_questions(self, session_id: str):
+    def _render_suggested_questions(self, session_id: str, view: Dict[str, Any]):
         """추천 질문 표시"""
         
         # 채팅 히스토리가 없는 경우에만 추천 질문 표시
-        history_result = self.api_client.get_chat_history(session_id, limit=1)
-        
-        if history_result["success"]:
-            messages = history_result["data"]["data"].get("messages", [])
+        if view["history"].get("total_count", 0) == 0:
+            st.markdown("### 💡 추천 질문")
             
-            if len(messages) == 0:  # 첫 대화인 경우
-                st.markdown("### 💡 추천 질문")
-                
-                # 추천 질문 조회
-                suggestions_result = self.api_client.get_suggested_questions(session_id)
-                
-                if suggestions_result["success"]:
-                    suggestions = suggestions_result["data"]["data"]["suggestions"]
-                    
-                    # 추천 질문을 버튼으로 표시 (2열로)
-                    cols = st.columns(2)
-                    for i, question in enumerate(suggestions[:6]):
-                        with cols[i % 2]:
-                            if st.button(f"❓ {question}", key=f"suggestion_{i}", use_container_width=True):
-                                self._send_message(session_id, question)
-                                st.rerun()
+            suggestions = view["suggestions"]["suggestions"]
+            
+            # 추천 질문을 버튼으로 표시 (2열로)
+            cols = st.columns(2)
+            for i, question in enumerate(suggestions[:6]):
+                with cols[i % 2]:
+                    if st.button(f"❓ {question}", key=f"suggestion_{i}", use_container_width=True):
+                        self._send_message(session_id, question)
+                        st.rerun()
     
     def _render_message_input(self, session_id: str):
         """메시지 입력 영역"""
@@ -190,7 +205,7 @@ class ChatInterfacePage:
                     
                     # 상태 업데이트
                     st.session_state.last_message_time = time.time()
-                    
+                
                 else:
                     error_msg = handle_api_error(result, "메시지 전송에 실패했습니다.")
                     st.error(error_msg)
@@ -233,6 +248,7 @@ class ChatInterfacePage:
                 result = self.api_client.clear_chat_history(session_id)
                 
                 if result["success"]:
+                    st.session_state.chat_history_cache = None
                     st.success("✅ 채팅 히스토리가 초기화되었습니다.")
                     time.sleep(1)
                     st.rerun()
@@ -35,7 +35,7 @@ class ProductResultPage:
         """분석 결과 로드 및 표시"""
         
         with st.spinner("분석 결과를 불러오는 중..."):
-            result = self.api_client.get_analysis_result(session_id)
+            result = self.api_client.get_session_view(session_id, include=["product"])
 
         if not result["success"]:
             error_msg = handle_api_error(result, "분석 결과를 불러올 수 없습니다.")
@@ -43,8 +43,8 @@ class ProductResultPage:
             self._render_navigation_buttons()
             return
 
-        # 백엔드 응답 구조에 맞춰 데이터 추출
-        data = result.get("data", {}).get("data", {})
+        # 백엔드 응답 구조에 맞춰 데이터 추출 (분석 전이면 product가 None)
+        data = result.get("data", {}).get("data", {}).get("product") or {}
         product_info = data.get("product_info", {})
         usage_guide = data.get("usage_guide", "")
 
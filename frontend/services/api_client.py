@@ -3,8 +3,12 @@
 """
 
 import requests
+import json
+import threading
 import time
-from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Iterator, Tuple
+from urllib.parse import urlencode
 from utils.constants import API_ENDPOINTS
 import streamlit as st
 
@@ -16,32 +20,75 @@ class APIClient:
         self.base_url = "http://localhost:8000"
         self.timeout = 30
         self.max_retries = 3
+        
+        # 조건부 GET 검증자 캐시: 요청 키 -> (ETag, 마지막 응답)
+        self.validator_cache_size = 256
+        self._validators: "OrderedDict[str, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+        self._validators_lock = threading.Lock()
+    
+    def _get_validator(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        with self._validators_lock:
+            cached = self._validators.get(key)
+            if cached is not None:
+                self._validators.move_to_end(key)
+            return cached
+    
+    def _store_validator(self, key: str, etag: str, result: Dict[str, Any]):
+        with self._validators_lock:
+            self._validators[key] = (etag, result)
+            self._validators.move_to_end(key)
+            while len(self._validators) > self.validator_cache_size:
+                self._validators.popitem(last=False)
     
     def _make_request(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
-        """HTTP 요청 수행 (재시도 로직 포함)"""
+        """HTTP 요청 수행 (재시도 로직 포함)
+        
+        conditional=True이면 이전 응답의 ETag로 If-None-Match를 보내고,
+        304 응답이면 저장해 둔 이전 응답을 그대로 반환합니다.
+        """
+        
+        timeout = kwargs.pop("timeout", self.timeout)
+        cache_key = None
+        cached = None
+        if kwargs.pop("conditional", False):
+            cache_key = f"{url}?{urlencode(sorted((kwargs.get('params') or {}).items()))}"
+            cached = self._get_validator(cache_key)
+            if cached is not None:
+                kwargs["headers"] = {**kwargs.get("headers", {}), "If-None-Match": cached[0]}
         
         for attempt in range(self.max_retries):
             try:
                 response = requests.request(
                     method=method,
                     url=url,
-                    timeout=self.timeout,
+                    timeout=timeout,
                     **kwargs
                 )
                 
+                if response.status_code == 304 and cached is not None:
+                    return cached[1]
+                
                 if response.status_code == 200:
-                    return {
+                    result = {
                         "success": True,
                         "data": response.json(),
                         "status_code": response.status_code
                     }
+                    etag = response.headers.get("ETag")
+                    if cache_key is not None and etag:
+                        self._store_validator(cache_key, etag, result)
+                    return result
                 else:
-                    return {
+                    result = {
                         "success": False,
                         "error": f"HTTP {response.status_code}: {response.text}",
                         "status_code": response.status_code
                     }
-                    
+                    if response.headers.get("Retry-After"):
+                        # 서버 혼잡(503)/요청 빈도 초과(429) 시 다시 시도할 때까지의 시간
+                        result["retry_after"] = response.headers["Retry-After"]
+                    return result
+            
             except requests.exceptions.Timeout:
                 if attempt == self.max_retries - 1:
                     return {
@@ -50,7 +97,7 @@ class APIClient:
                         "status_code": 408
                     }
                 time.sleep(1)  # 재시도 전 대기
-                
+            
             except requests.exceptions.ConnectionError:
                 if attempt == self.max_retries - 1:
                     return {
@@ -59,7 +106,7 @@ class APIClient:
                         "status_code": 503
                     }
                 time.sleep(2)  # 재시도 전 대기
-                
+            
             except Exception as e:
                 return {
                     "success": False,
@@ -84,7 +131,19 @@ class APIClient:
     
     def get_session(self, session_id: str) -> Dict[str, Any]:
         """세션 정보 조회"""
-        return self._make_request("GET", f"{self.base_url}/api/session/{session_id}")
+        return self._make_request("GET", f"{self.base_url}/api/session/{session_id}", conditional=True)
+    
+    def get_session_view(self, session_id: str, include: Optional[List[str]] = None,
+                         history_limit: int = 50, since: Optional[int] = None) -> Dict[str, Any]:
+        """화면에 필요한 세션 데이터 한 번에 조회 (include: status, product, history, suggestions)"""
+        params = {"history_limit": history_limit}
+        if include:
+            params["include"] = ",".join(include)
+        if since is not None:
+            params["since"] = since
+        return self._make_request(
+            "GET", f"{self.base_url}/api/session/{session_id}/view", params=params, conditional=True
+        )
     
     def delete_session(self, session_id: str) -> Dict[str, Any]:
         """세션 삭제"""
@@ -108,9 +167,12 @@ class APIClient:
         """제품 분석 시작"""
         return self._make_request("POST", f"{self.base_url}/api/product/analyze/{session_id}")
     
-    def get_analysis_result(self, session_id: str) -> Dict[str, Any]:
-        """제품 분석 결과 조회"""
-        return self._make_request("GET", f"{self.base_url}/api/product/analyze/{session_id}/result")
+    def get_analysis_result(self, session_id: str, wait: Optional[float] = None) -> Dict[str, Any]:
+        """제품 분석 결과 조회 (wait: 분석이 끝날 때까지 서버에서 최대 대기할 시간(초))"""
+        url = f"{self.base_url}/api/product/analyze/{session_id}/result"
+        if wait:
+            return self._make_request("GET", url, params={"wait": wait}, timeout=self.timeout + wait)
+        return self._make_request("GET", url, conditional=True)
     
     def reanalyze_product(self, session_id: str) -> Dict[str, Any]:
         """제품 재분석"""
@@ -124,6 +186,41 @@ class APIClient:
         """제품 분석 상태 확인"""
         return self._make_request("GET", f"{self.base_url}/api/product/status/{session_id}")
     
+    def stream_analysis_events(self, session_id: str, max_wait_time: int = 180) -> Iterator[Dict[str, Any]]:
+        """제품 분석 진행 이벤트 수신 (Server-Sent Events)
+        
+        completed 또는 failed 이벤트를 받으면 끝납니다.
+        연결할 수 없으면 requests 예외가 그대로 전달됩니다.
+        """
+        url = f"{self.base_url}/api/product/analyze/{session_id}/events"
+        deadline = time.time() + max_wait_time
+        
+        with requests.get(url, stream=True, timeout=(5, 30),
+                          headers={"Accept": "text/event-stream"}) as response:
+            response.raise_for_status()
+            response.encoding = "utf-8"
+            data_lines = []
+            for line in response.iter_lines(decode_unicode=True):
+                if time.time() > deadline:
+                    raise requests.exceptions.Timeout("분석 이벤트 대기 시간이 초과되었습니다.")
+                if line:
+                    if line.startswith("data:"):
+                        data_lines.append(line[5:].strip())
+                    continue
+                
+                # 빈 줄이 이벤트의 끝
+                if not data_lines:
+                    continue
+                event = json.loads("\n".join(data_lines))
+                data_lines = []
+                yield event
+                if event.get("stage") in ("completed", "failed"):
+                    return
+    
+    def get_job_status(self, job_id: str) -> Dict[str, Any]:
+        """분석 작업 상태 조회"""
+        return self._make_request("GET", f"{self.base_url}/api/product/jobs/{job_id}")
+    
     # 채팅
     def send_chat_message(self, session_id: str, message: str) -> Dict[str, Any]:
         """채팅 메시지 전송"""
@@ -133,10 +230,17 @@ class APIClient:
         }
         return self._make_request("POST", f"{self.base_url}/api/chat/{session_id}", json=data)
     
-    def get_chat_history(self, session_id: str, limit: int = 50) -> Dict[str, Any]:
-        """채팅 히스토리 조회"""
+    def get_chat_history(self, session_id: str, limit: int = 50, after: Optional[int] = None,
+                         since: Optional[int] = None) -> Dict[str, Any]:
+        """채팅 히스토리 조회 (after/since: 이 메시지 ID 이후만 조회)"""
         params = {"limit": limit}
-        return self._make_request("GET", f"{self.base_url}/api/chat/{session_id}/history", params=params)
+        if after is not None:
+            params["after"] = after
+        if since is not None:
+            params["since"] = since
+        return self._make_request(
+            "GET", f"{self.base_url}/api/chat/{session_id}/history", params=params, conditional=True
+        )
     
     def clear_chat_history(self, session_id: str) -> Dict[str, Any]:
         """채팅 히스토리 초기화"""
@@ -202,7 +306,11 @@ def handle_api_error(result: Dict[str, Any], default_message: str = "오류가 
     error = result.get("error", default_message)
     status_code = result.get("status_code", 500)
     
-    if status_code == 503:
+    if status_code == 429:
+        return f"⏳ 요청이 너무 잦습니다. {result.get('retry_after', '잠시')}초 후 다시 시도해 주세요."
+    elif status_code == 503 and result.get("retry_after"):
+        return f"⏳ 서버가 혼잡합니다. {result['retry_after']}초 후 다시 시도해 주세요."
+    elif status_code == 503:
         return "🔌 백엔드 서버에 연결할 수 없습니다. 서버가 실행 중인지 확인해 주세요."
     elif status_code == 408:
         return "⏱️ 요청 시간이 초과되었습니다. 다시 시도해 주세요."
@@ -215,31 +323,60 @@ def handle_api_error(result: Dict[str, Any], default_message: str = "오류가 
 
 
 def wait_for_analysis_completion(session_id: str, max_wait_time: int = 120) -> Dict[str, Any]:
-    """제품 분석 완료까지 대기 (폴링)"""
+    """제품 분석 완료까지 대기 (진행 이벤트 스트림 사용)"""
     
     client = get_api_client()
-    start_time = time.time()
+    started_at = time.time()
     
-    while time.time() - start_time < max_wait_time:
-        result = client.get_analysis_result(session_id)
+    try:
+        for event in client.stream_analysis_events(session_id, max_wait_time=max_wait_time):
+            if event.get("stage") == "failed":
+                return {
+                    "success": False,
+                    "error": event.get("message", "제품 분석에 실패했습니다."),
+                    "status_code": 500
+                }
+    except requests.exceptions.Timeout:
+        return {
+            "success": False,
+            "error": "분석 시간이 초과되었습니다. 다시 시도해 주세요.",
+            "status_code": 408
+        }
+    except requests.exceptions.RequestException:
+        # 이벤트 스트림을 쓸 수 없으면 결과 조회를 long-poll로 대기
+        return _long_poll_analysis_result(client, session_id, max_wait_time)
+    
+    # 완료 이벤트를 받은 뒤 결과 조회 (아직 진행 중으로 보이면 남은 시간 동안 long-poll)
+    result = client.get_analysis_result(session_id)
+    if result["success"] and result["data"].get("data", {}).get("status") == "analyzing":
+        remaining = max_wait_time - (time.time() - started_at)
+        return _long_poll_analysis_result(client, session_id, max(remaining, 1))
+    return result
+
+
+def _long_poll_analysis_result(client: APIClient, session_id: str, max_wait_time: int) -> Dict[str, Any]:
+    """분석 결과 long-poll 대기 (서버가 완료 시 바로 응답)"""
+    
+    deadline = time.time() + max_wait_time
+    while True:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return {
+                "success": False,
+                "error": "분석 시간이 초과되었습니다. 다시 시도해 주세요.",
+                "status_code": 408
+            }
         
-        if result["success"]:
-            data = result["data"]
-            if isinstance(data, dict) and "data" in data:
-                # 분석 완료된 경우
-                if "product_info" in data["data"]:
-                    return result
-                # 아직 분석 중인 경우
-                elif data["data"].get("status") == "analyzing":
-                    time.sleep(3)  # 3초 대기 후 다시 확인
-                    continue
+        result = client.get_analysis_result(session_id, wait=min(remaining, 60))
+        if not result["success"]:
+            return result
         
-        # 오류가 발생한 경우
-        return result
-    
-    # 시간 초과
-    return {
-        "success": False,
-        "error": "분석 시간이 초과되었습니다. 다시 시도해 주세요.",
-        "status_code": 408
-    } 
\ No newline at end of file
+        status = result["data"].get("data", {}).get("status")
+        if status == "failed":
+            return {
+                "success": False,
+                "error": result["data"]["data"].get("message", "제품 분석에 실패했습니다."),
+                "status_code": 500
+            }
+        if status != "analyzing":
+            return result
@@ -12,15 +12,20 @@ from pathlib import Path
 # 인코딩 설정
 os.environ['PYTHONIOENCODING'] = 'utf-8'
 
-def run_backend():
-    """백엔드 서버 실행"""
+def run_backend(prod: bool = False):
+    """백엔드 서버 실행 (prod: 프리포크 멀티 워커 운영 모드)"""
     backend_dir = Path(__file__).parent / "backend"
     os.chdir(backend_dir)
     
-    print("🚀 백엔드 서버를 시작합니다...")
     env = os.environ.copy()
     env['PYTHONIOENCODING'] = 'utf-8'
     
+    if prod:
+        print("🚀 백엔드 서버를 운영 모드로 시작합니다...")
+        subprocess.run([sys.executable, "prod_server.py", *sys.argv[3:]], env=env)
+        return
+    
+    print("🚀 백엔드 서버를 시작합니다...")
     subprocess.run([
         sys.executable, "-m", "uvicorn", 
         "main:app", 
@@ -47,13 +52,13 @@ def run_frontend():
 def main():
     """메인 실행 함수"""
     if len(sys.argv) < 2:
-        print("사용법: python run.py [backend|frontend|both]")
+        print("사용법: python run.py [backend|frontend|both] [--prod]")
         sys.exit(1)
     
     command = sys.argv[1].lower()
     
     if command == "backend":
-        run_backend()
+        run_backend(prod="--prod" in sys.argv[2:3])
     elif command == "frontend":
         run_frontend()
     elif command == "both":